@@ -4,10 +4,21 @@ import sys
 
 # Vercel runs from the project root, but we need to make sure
 # all our module imports resolve correctly
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
 
 # On Vercel, use /tmp for SQLite since the filesystem is read-only elsewhere
 if os.environ.get("VERCEL"):
     os.environ.setdefault("DATABASE_URL", "sqlite:////tmp/mastersales.db")
+    os.environ.setdefault("DB_PROFILE", "ephemeral")
+    # One function instance serves one request at a time; no need for 40 connections
+    os.environ.setdefault("DB_POOL_SIZE", "5")
+    # Templates load from the bytecode cache built by `python -m templating`
+    # (vercel.json's buildCommand) and aren't re-checked on disk per render
+    os.environ.setdefault("DEBUG", "false")
+    os.environ.setdefault("SERVERLESS", "true")
+    # Seeded database built by `python -m database.image build` (vercel.json's
+    # buildCommand); copied to /tmp on cold start instead of migrating and seeding
+    os.environ.setdefault("DB_IMAGE", os.path.join(ROOT, "build", "mastersales.db"))
 
 from app import app  # noqa: E402, F401
@@ -1,24 +1,39 @@
 import csv
+import hmac
 import io
 import logging
+import os
+import time
+import zlib
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 
+from anyio import to_thread
 from fastapi import FastAPI, Request, Depends, Form, Query, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func, or_, select
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from config import settings
-from database.db import init_db, get_db, SessionLocal
+from database.db import init_db, get_db, get_async_db, SessionLocal, engine, async_engine
 from database.models import (
-    Company, Contact, Meeting, Proposal, NurtureSequence, NurtureEnrollment, User,
+    Company, Contact, Meeting, Proposal, NurtureSequence, NurtureEnrollment, User, SEARCH_COLUMNS,
 )
-from database.seed import seed_demo_data
+from database import ingest, loading, profiling, search
+from database.pagination import keyset_page
+from database.cache import query_cache
+from database.facets import get_lead_facets
+import metrics
+from http_cache import make_etag, not_modified, validator_headers
+from templating import page_env, proposal_env
+from pipeline.deal_tracker import get_dashboard_summary, get_stage_totals
 from auth import (
-    hash_password, verify_password, require_auth, get_current_user,
+    hash_password_async, verify_password_async, needs_rehash, HashingBusy,
+    require_auth, get_current_user, CurrentUser,
     create_reset_token, verify_reset_token,
     set_session_cookie, clear_session_cookie, _AuthRedirect,
 )
@@ -26,13 +41,23 @@ from auth import (
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    init_db()
-    db = SessionLocal()
-    try:
-        seed_demo_data(db)
-    finally:
-        db.close()
+    # Sync routes run on anyio's threadpool; keep it in step with the DB pool
+    to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    schema_changed = init_db()
+    # Serverless instances cold-start constantly: once the schema marker is
+    # current the database has been seeded, so skip the demo-data check
+    if schema_changed or not settings.serverless:
+        from database.seed import seed_demo_data
+        db = SessionLocal()
+        try:
+            seed_demo_data(db)
+        finally:
+            db.close()
     yield
+    # Close the scrapers' browser (a no-op if none was started); it waits on
+    # the engine's thread, so keep it off the event loop
+    from scraper import async_engine
+    await to_thread.run_sync(async_engine.shutdown)
 
 
 # ── Logging ────────────────────────────────────────────────────────────────────
@@ -45,7 +70,7 @@ logger = logging.getLogger("mastersales")
 
 app = FastAPI(title=settings.app_name, lifespan=lifespan)
 app.mount("/static", StaticFiles(directory="static"), name="static")
-templates = Jinja2Templates(directory="templates")
+templates = Jinja2Templates(env=page_env)
 
 # ── Source badge CSS helper ────────────────────────────────────────────────────
 
@@ -82,22 +107,71 @@ async def auth_middleware(request: Request, call_next):
     # Allow static files and auth pages through
     if path.startswith("/static") or path in PUBLIC_PATHS:
         return await call_next(request)
+    # Prometheus scrapes without a session, with METRICS_TOKEN
+    if path == "/metrics" and _metrics_scraper(request):
+        return await call_next(request)
     # Check session cookie
-    from auth import read_session_cookie, SESSION_COOKIE
+    from auth import read_session_cookie, resolve_user, SESSION_COOKIE
     token = request.cookies.get(SESSION_COOKIE)
     user_id = read_session_cookie(token) if token else None
-    if not user_id:
+    # Resolve the user once per request (usually from the user cache); a
+    # deleted or deactivated account is logged out
+    user = await resolve_user(user_id) if user_id else None
+    if user is None:
         return RedirectResponse("/login", status_code=303)
-    # Store user_id on request state so templates can access it
     request.state.user_id = user_id
+    request.state.user = user
     return await call_next(request)
 
 
+# Registered after auth_middleware so it wraps it, and counts the user lookup
+if settings.sql_profiling:
+    profiling.install(engine, async_engine, slow_query_ms=settings.slow_query_ms)
+
+    @app.middleware("http")
+    async def sql_profiling_middleware(request: Request, call_next):
+        started = time.perf_counter()
+        with profiling.profile_request(request.url.path, settings.sql_profile_top) as profile:
+            response = await call_next(request)
+        response.headers["Server-Timing"] = profile.server_timing((time.perf_counter() - started) * 1000)
+        return response
+
+
+metrics.instrument_engine(engine, "sync")
+metrics.instrument_engine(async_engine, "async")
+
+
+# Outermost middleware, so latency covers auth and profiling too
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # The route template, not the raw path, keeps label cardinality bounded
+        route = request.scope.get("route")
+        label = route.path if route else ("/static" if request.url.path.startswith("/static") else "unmatched")
+        metrics.HTTP_LATENCY.labels(request.method, label).observe(time.perf_counter() - started)
+        metrics.HTTP_REQUESTS.labels(request.method, label, str(status)).inc()
+
+
 @app.exception_handler(_AuthRedirect)
 async def auth_redirect_handler(request: Request, exc: _AuthRedirect):
     return RedirectResponse("/login", status_code=303)
 
 
+@app.exception_handler(HashingBusy)
+async def hashing_busy_handler(request: Request, exc: HashingBusy):
+    # Shed load fast rather than queue more CPU-bound bcrypt work
+    return HTMLResponse(
+        "Too many sign-in attempts right now. Please try again in a moment.",
+        status_code=429, headers={"Retry-After": "1"},
+    )
+
+
 # ── Auth routes ───────────────────────────────────────────────────────────────
 
 @app.get("/login", response_class=HTMLResponse)
@@ -109,14 +183,14 @@ def login_page(request: Request, reset: str = ""):
 
 
 @app.post("/login", response_class=HTMLResponse)
-def login_submit(
+async def login_submit(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     email: str = Form(...),
     password: str = Form(...),
 ):
-    user = db.query(User).filter(User.email == email.lower().strip()).first()
-    if not user or not verify_password(password, user.password_hash):
+    user = await db.scalar(select(User).where(User.email == email.lower().strip()))
+    if not user or not await verify_password_async(password, user.password_hash):
         return templates.TemplateResponse("auth/login.html", {
             "request": request,
             "error": "Invalid email or password.",
@@ -128,6 +202,10 @@ def login_submit(
             "error": "This account has been deactivated.",
             "email": email,
         })
+    # Upgrade the stored hash while we have the plaintext, if the cost changed
+    if needs_rehash(user.password_hash):
+        user.password_hash = await hash_password_async(password)
+        await db.commit()
     response = RedirectResponse("/", status_code=303)
     return set_session_cookie(response, user.id)
 
@@ -138,9 +216,9 @@ def signup_page(request: Request):
 
 
 @app.post("/signup", response_class=HTMLResponse)
-def signup_submit(
+async def signup_submit(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     full_name: str = Form(...),
     email: str = Form(...),
     password: str = Form(...),
@@ -155,17 +233,17 @@ def signup_submit(
     if password != password_confirm:
         return templates.TemplateResponse("auth/signup.html", {
             **ctx, "error": "Passwords do not match."})
-    if db.query(User).filter(User.email == email_clean).first():
+    if await db.scalar(select(User.id).where(User.email == email_clean)):
         return templates.TemplateResponse("auth/signup.html", {
             **ctx, "error": "An account with this email already exists."})
 
     user = User(
         email=email_clean,
         full_name=full_name.strip(),
-        password_hash=hash_password(password),
+        password_hash=await hash_password_async(password),
     )
     db.add(user)
-    db.commit()
+    await db.commit()
 
     response = RedirectResponse("/", status_code=303)
     return set_session_cookie(response, user.id)
@@ -204,9 +282,9 @@ def reset_password_page(request: Request, token: str = ""):
 
 
 @app.post("/reset-password", response_class=HTMLResponse)
-def reset_password_submit(
+async def reset_password_submit(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Form(...),
     password: str = Form(...),
     password_confirm: str = Form(...),
@@ -225,10 +303,10 @@ def reset_password_submit(
             "request": request, "token": token,
             "error": "Passwords do not match."})
 
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     if user:
-        user.password_hash = hash_password(password)
-        db.commit()
+        user.password_hash = await hash_password_async(password)
+        await db.commit()
 
     return RedirectResponse("/login?reset=success", status_code=303)
 
@@ -241,11 +319,9 @@ def logout():
 
 # ── Helper: get current user for templates ────────────────────────────────────
 
-def _get_user(request: Request, db: Session) -> User | None:
-    user_id = getattr(request.state, "user_id", None)
-    if user_id:
-        return db.query(User).get(user_id)
-    return None
+def _get_user(request: Request) -> CurrentUser | None:
+    """The user the auth middleware put on the request (no database access)."""
+    return getattr(request.state, "user", None)
 
 
 # ── Helper: active contacts query (excludes soft-deleted) ─────────────────────
@@ -259,7 +335,7 @@ def _active_contacts(db: Session):
 
 @app.get("/users", response_class=HTMLResponse)
 def users_list(request: Request, db: Session = Depends(get_db)):
-    user = _get_user(request, db)
+    user = _get_user(request)
     all_users = db.query(User).order_by(User.created_at.desc()).all()
     return templates.TemplateResponse("users.html", {
         "request": request, "settings": settings, "user": user,
@@ -269,64 +345,67 @@ def users_list(request: Request, db: Session = Depends(get_db)):
 
 # ── Dashboard ──────────────────────────────────────────────────────────────────
 
-@app.get("/", response_class=HTMLResponse)
-def dashboard(request: Request, db: Session = Depends(get_db)):
-    total_leads = _active_contacts(db).count()
-    active_deals = _active_contacts(db).filter(
-        Contact.lead_status.in_(["Qualified", "Proposal", "Negotiation"])
-    ).count()
-    proposals_sent = db.query(Proposal).filter(Proposal.status != "Draft").count()
-    meetings_count = db.query(Meeting).count()
-
-    recent_leads = _active_contacts(db).order_by(Contact.created_at.desc()).limit(5).all()
-
-    pipeline_counts = {}
-    for status in ["New", "Contacted", "Qualified", "Proposal", "Negotiation", "Won", "Lost"]:
-        pipeline_counts[status] = _active_contacts(db).filter(Contact.lead_status == status).count()
-
-    total_pipeline_value = sum(
-        c.deal_value or 0
-        for c in _active_contacts(db).filter(Contact.deal_value.isnot(None)).all()
+def _dashboard_context(db: Session, request: Request) -> dict:
+    summary = query_cache.get_or_compute(
+        "dashboard", ("contacts", "proposals", "meetings"),
+        lambda: get_dashboard_summary(db),
     )
+    recent_leads = loading.contact_cards(
+        _active_contacts(db).order_by(Contact.created_at.desc()).limit(5)
+    ).all()
+    return {
+        "user": _get_user(request),
+        **summary,
+        "recent_leads": recent_leads,
+    }
 
+
+@app.get("/", response_class=HTMLResponse)
+async def dashboard(request: Request, db: AsyncSession = Depends(get_async_db)):
+    ctx = await db.run_sync(_dashboard_context, request)
     return templates.TemplateResponse("dashboard.html", {
         "request": request,
         "settings": settings,
-        "user": _get_user(request, db),
-        "total_leads": total_leads,
-        "active_deals": active_deals,
-        "proposals_sent": proposals_sent,
-        "meetings_count": meetings_count,
-        "recent_leads": recent_leads,
-        "pipeline_counts": pipeline_counts,
-        "total_pipeline_value": total_pipeline_value,
+        **ctx,
     })
 
 
 # ── Leads ──────────────────────────────────────────────────────────────────────
 
-@app.get("/leads", response_class=HTMLResponse)
-def leads_list(
-    request: Request,
-    db: Session = Depends(get_db),
-    q: str = "",
-    status: str = "",
-    state: str = "",
-    source: str = "",
-    country: str = "",
-    sort: str = "created_at",
-    order: str = "desc",
-):
+# Sortable columns for /leads. Nullable ones are coalesced so keyset
+# comparisons never meet a NULL.
+LEAD_SORT_KEYS = {
+    "created_at": Contact.created_at,
+    "updated_at": Contact.updated_at,
+    "first_name": Contact.first_name,
+    "last_name": func.coalesce(Contact.last_name, ""),
+    "job_title": func.coalesce(Contact.job_title, ""),
+    "lead_status": Contact.lead_status,
+    "lead_score": func.coalesce(Contact.lead_score, -1),
+    "deal_value": func.coalesce(Contact.deal_value, 0),
+    "lead_source": func.coalesce(Contact.lead_source, ""),
+    "location_state": func.coalesce(Contact.location_state, ""),
+}
+
+
+def _filtered_leads(db: Session, q: str = "", status: str = "", state: str = "",
+                    source: str = "", country: str = ""):
+    """Active contacts matching the /leads filters.
+
+    Returns (query, rank) where rank is the FTS relevance expression when the
+    search went through the full-text index, else None.
+    """
     query = _active_contacts(db).join(Company, isouter=True)
+    rank = None
 
-    if q:
+    if q and search.fts_enabled(db.get_bind()) and search.build_match(q):
+        query = search.match_contacts(query, q)
+        rank = search.rank()
+    elif q:
+        # Served by trigram indexes on Postgres
         query = query.filter(
             or_(
-                Contact.first_name.ilike(f"%{q}%"),
-                Contact.last_name.ilike(f"%{q}%"),
-                Contact.job_title.ilike(f"%{q}%"),
-                Contact.email_work.ilike(f"%{q}%"),
-                Contact.lead_source.ilike(f"%{q}%"),
+                *(getattr(Contact, column).ilike(f"%{q}%") for column in SEARCH_COLUMNS),
                 Company.company_name.ilike(f"%{q}%"),
             )
         )
@@ -338,36 +417,72 @@ def leads_list(
         query = query.filter(Contact.lead_source.ilike(f"%{source}%"))
     if country:
         query = query.filter(Contact.location_country == country)
+    return query, rank
 
-    sort_col = getattr(Contact, sort, Contact.created_at)
-    if order == "asc":
-        query = query.order_by(sort_col.asc())
-    else:
-        query = query.order_by(sort_col.desc())
 
-    contacts = query.all()
+def _next_page_url(request: Request, cursor: str | None) -> str | None:
+    if not cursor:
+        return None
+    url = request.url.include_query_params(cursor=cursor)
+    return f"{url.path}?{url.query}"
 
-    all_contacts = _active_contacts(db).all()
-    statuses = ["New", "Contacted", "Qualified", "Proposal", "Negotiation", "Won", "Lost"]
-    states = sorted(set(c.location_state for c in all_contacts if c.location_state))
-    sources = sorted(set(c.lead_source for c in all_contacts if c.lead_source))
-    countries = sorted(set(c.location_country for c in all_contacts if c.location_country))
 
-    if request.headers.get("HX-Request"):
-        return templates.TemplateResponse("partials/leads_table_body.html", {
-            "request": request,
-            "contacts": contacts,
-        })
+def _leads_context(db: Session, request: Request, filters: dict, sort: str, order: str,
+                   cursor: str, rows_only: bool) -> dict:
+    """Template context for /leads; ``rows_only`` skips what only the full page needs."""
+    query, rank = _filtered_leads(db, **filters)
+
+    descending = order != "asc"
+    keys = [(rank, False)] if rank is not None else []  # relevance first when searching
+    keys += [(LEAD_SORT_KEYS.get(sort, Contact.created_at), descending), (Contact.id, descending)]
+    contacts, next_cursor = keyset_page(loading.lead_rows(query), keys, cursor, settings.leads_page_size)
+
+    ctx = {
+        "contacts": contacts,
+        "next_url": _next_page_url(request, next_cursor),
+        # Only the first page reports the total; scroll pages just append rows
+        "total": None if cursor else query.order_by(None).count(),
+    }
+    if rows_only:
+        return ctx
+
+    facets = get_lead_facets(db)
+    return {
+        **ctx,
+        "user": _get_user(request),
+        "states": facets["states"],
+        "sources": facets["sources"],
+        "countries": facets["countries"],
+    }
+
+
+@app.get("/leads", response_class=HTMLResponse)
+async def leads_list(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    q: str = "",
+    status: str = "",
+    state: str = "",
+    source: str = "",
+    country: str = "",
+    sort: str = "created_at",
+    order: str = "desc",
+    cursor: str = "",
+):
+    filters = dict(q=q, status=status, state=state, source=source, country=country)
+    # Keystroke and scroll requests only swap table rows: no dropdowns to fill
+    rows_only = bool(request.headers.get("HX-Request"))
+    ctx = await db.run_sync(_leads_context, request, filters, sort, order, cursor, rows_only)
+    if rows_only:
+        return templates.TemplateResponse("partials/leads_table_body.html", {"request": request, **ctx})
+
+    statuses = ["New", "Contacted", "Qualified", "Proposal", "Negotiation", "Won", "Lost"]
 
     return templates.TemplateResponse("leads.html", {
         "request": request,
+        **ctx,
         "settings": settings,
-        "user": _get_user(request, db),
-        "contacts": contacts,
         "statuses": statuses,
-        "states": states,
-        "sources": sources,
-        "countries": countries,
         "q": q,
         "current_status": status,
         "current_state": state,
@@ -377,7 +492,6 @@ def leads_list(
         "order": order,
     })
 
-
 CSV_COLUMNS = [
     "First Name", "Last Name", "Email (Work)", "Email (Personal)",
     "Phone (Mobile)", "Phone (Work)", "Job Title", "Seniority",
@@ -403,38 +517,118 @@ def _contact_to_csv_row(c):
     ]
 
 
-def _export_contacts_csv(contacts):
-    output = io.StringIO()
-    writer = csv.writer(output)
+# Explicit ID lists are queried in slices so IN (...) stays well under
+# SQLite's bound-parameter limit
+EXPORT_ID_CHUNK = 500
+
+
+def _csv_chunks(queries, chunk_rows: int):
+    """Yield the CSV export as bytes, flushing every ``chunk_rows`` rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
     writer.writerow(CSV_COLUMNS)
-    for c in contacts:
-        writer.writerow(_contact_to_csv_row(c))
-    output.seek(0)
+    written = 0
+    for query in queries:
+        for c in query.yield_per(chunk_rows):
+            writer.writerow(_contact_to_csv_row(c))
+            written += 1
+            if written % chunk_rows == 0:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def _gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)  # gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _export_contacts_csv(db: Session, build_queries, gzip: bool = False):
+    """Stream contacts as CSV, optionally gzipped.
+
+    ``build_queries(session)`` returns the contact queries to export in order.
+    The body runs after the route returns (and its request session closes), so
+    it reads through a session of its own on the same engine.
+    """
+    bind = db.get_bind()
+
+    def body():
+        with Session(bind=bind) as session:
+            queries = (loading.lead_rows(q) for q in build_queries(session))
+            yield from _csv_chunks(queries, settings.export_chunk_rows)
+
+    chunks = _gzip_chunks(body()) if gzip else body()
     filename = f"leads-export-{datetime.utcnow().strftime('%Y%m%d')}.csv"
+    if gzip:
+        filename += ".gz"
     return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
+        chunks,
+        media_type="application/gzip" if gzip else "text/csv",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
 @app.get("/leads/export")
-def leads_export(db: Session = Depends(get_db)):
-    contacts = _active_contacts(db).join(Company, isouter=True).order_by(Contact.created_at.desc()).all()
-    return _export_contacts_csv(contacts)
+def leads_export(db: Session = Depends(get_db), gzip: bool = False):
+    return _export_contacts_csv(db, lambda session: [
+        _active_contacts(session).join(Company, isouter=True)
+        .order_by(Contact.created_at.desc(), Contact.id.desc())
+    ], gzip)
+
+
+def _selected_ids(db: Session, ids: list[int], all_matching: bool, filters: dict):
+    """IDs for a bulk action: the ticked rows, or every lead matching the filters."""
+    if all_matching:
+        query, _ = _filtered_leads(db, **filters)
+        return query.with_entities(Contact.id).scalar_subquery()
+    return ids
 
 
 @app.post("/leads/export-selected")
-def leads_export_selected(db: Session = Depends(get_db), ids: list[int] = Form(...)):
-    contacts = db.query(Contact).join(Company, isouter=True).filter(Contact.id.in_(ids)).all()
-    return _export_contacts_csv(contacts)
+def leads_export_selected(
+    db: Session = Depends(get_db),
+    ids: list[int] = Form([]),
+    all_matching: bool = Form(False),
+    q: str = Form(""),
+    status: str = Form(""),
+    state: str = Form(""),
+    source: str = Form(""),
+    country: str = Form(""),
+    gzip: bool = Form(False),
+):
+    selected = _selected_ids(db, ids, all_matching, dict(q=q, status=status, state=state, source=source, country=country))
+    if all_matching:
+        id_filters = [Contact.id.in_(selected)]
+    else:
+        ids = sorted(set(ids))
+        id_filters = [Contact.id.in_(ids[i:i + EXPORT_ID_CHUNK]) for i in range(0, len(ids), EXPORT_ID_CHUNK)]
+
+    return _export_contacts_csv(db, lambda session: [
+        session.query(Contact).join(Company, isouter=True).filter(f).order_by(Contact.id)
+        for f in id_filters
+    ], gzip)
 
 
 @app.post("/leads/delete-selected")
-def leads_delete_selected(db: Session = Depends(get_db), ids: list[int] = Form(...)):
+def leads_delete_selected(
+    db: Session = Depends(get_db),
+    ids: list[int] = Form([]),
+    all_matching: bool = Form(False),
+    q: str = Form(""),
+    status: str = Form(""),
+    state: str = Form(""),
+    source: str = Form(""),
+    country: str = Form(""),
+):
+    selected = _selected_ids(db, ids, all_matching, dict(q=q, status=status, state=state, source=source, country=country))
     # Soft delete: set deleted_at timestamp
     now = datetime.utcnow()
-    db.query(Contact).filter(Contact.id.in_(ids), Contact.deleted_at.is_(None)).update(
+    db.query(Contact).filter(Contact.id.in_(selected), Contact.deleted_at.is_(None)).update(
         {"deleted_at": now}, synchronize_session=False)
     db.commit()
     return RedirectResponse("/leads", status_code=303)
@@ -452,25 +646,40 @@ def lead_delete(contact_id: int, db: Session = Depends(get_db)):
 
 # ── Trash (soft-deleted leads) ────────────────────────────────────────────────
 
+def _trashed_contacts(db: Session):
+    return db.query(Contact).join(Company, isouter=True).filter(Contact.deleted_at.isnot(None))
+
+
 @app.get("/leads/trash", response_class=HTMLResponse)
-def leads_trash(request: Request, db: Session = Depends(get_db)):
-    trashed = (
-        db.query(Contact).join(Company, isouter=True)
-        .filter(Contact.deleted_at.isnot(None))
-        .order_by(Contact.deleted_at.desc())
-        .all()
-    )
-    return templates.TemplateResponse("leads_trash.html", {
+def leads_trash(request: Request, db: Session = Depends(get_db), cursor: str = ""):
+    query = _trashed_contacts(db)
+    keys = [(Contact.deleted_at, True), (Contact.id, True)]
+    contacts, next_cursor = keyset_page(loading.lead_rows(query), keys, cursor, settings.leads_page_size)
+
+    page_ctx = {
         "request": request,
+        "contacts": contacts,
+        "next_url": _next_page_url(request, next_cursor),
+        "total": None if cursor else query.count(),
+    }
+    if request.headers.get("HX-Request"):
+        return templates.TemplateResponse("partials/trash_table_body.html", page_ctx)
+
+    return templates.TemplateResponse("leads_trash.html", {
+        **page_ctx,
         "settings": settings,
-        "user": _get_user(request, db),
-        "contacts": trashed,
+        "user": _get_user(request),
     })
 
 
 @app.post("/leads/trash/restore-selected")
-def leads_restore_selected(db: Session = Depends(get_db), ids: list[int] = Form(...)):
-    db.query(Contact).filter(Contact.id.in_(ids)).update(
+def leads_restore_selected(
+    db: Session = Depends(get_db),
+    ids: list[int] = Form([]),
+    all_matching: bool = Form(False),
+):
+    selected = _trashed_contacts(db).with_entities(Contact.id).scalar_subquery() if all_matching else ids
+    db.query(Contact).filter(Contact.id.in_(selected)).update(
         {"deleted_at": None}, synchronize_session=False)
     db.commit()
     return RedirectResponse("/leads/trash", status_code=303)
@@ -487,12 +696,17 @@ def lead_restore(contact_id: int, db: Session = Depends(get_db)):
 
 
 @app.post("/leads/trash/force-delete-selected")
-def leads_force_delete_selected(db: Session = Depends(get_db), ids: list[int] = Form(...)):
+def leads_force_delete_selected(
+    db: Session = Depends(get_db),
+    ids: list[int] = Form([]),
+    all_matching: bool = Form(False),
+):
+    selected = _trashed_contacts(db).with_entities(Contact.id).scalar_subquery() if all_matching else ids
     # Permanent delete: remove related records then contacts
-    db.query(Meeting).filter(Meeting.contact_id.in_(ids)).delete(synchronize_session=False)
-    db.query(NurtureEnrollment).filter(NurtureEnrollment.contact_id.in_(ids)).delete(synchronize_session=False)
-    db.query(Proposal).filter(Proposal.contact_id.in_(ids)).delete(synchronize_session=False)
-    db.query(Contact).filter(Contact.id.in_(ids)).delete(synchronize_session=False)
+    db.query(Meeting).filter(Meeting.contact_id.in_(selected)).delete(synchronize_session=False)
+    db.query(NurtureEnrollment).filter(NurtureEnrollment.contact_id.in_(selected)).delete(synchronize_session=False)
+    db.query(Proposal).filter(Proposal.contact_id.in_(selected)).delete(synchronize_session=False)
+    db.query(Contact).filter(Contact.id.in_(selected)).delete(synchronize_session=False)
     db.commit()
     return RedirectResponse("/leads/trash", status_code=303)
 
@@ -510,12 +724,39 @@ def lead_force_delete(contact_id: int, db: Session = Depends(get_db)):
     return RedirectResponse("/leads/trash", status_code=303)
 
 
+def _lead_version(db: Session, contact_id: int) -> tuple | None:
+    """Everything /leads/{id} renders, reduced to stamps and counts in one query.
+
+    Counts catch deletions, which leave no stamp behind. None if the contact
+    doesn't exist.
+    """
+    def latest(model, stamp):
+        return (select(func.count(), func.max(stamp))
+                .where(model.contact_id == contact_id).subquery())
+
+    meetings = latest(Meeting, Meeting.updated_at)
+    proposals = latest(Proposal, Proposal.updated_at)
+    enrollments = latest(NurtureEnrollment, NurtureEnrollment.updated_at)
+    sequences = select(func.count(), func.max(NurtureSequence.created_at)).subquery()
+    row = db.execute(
+        select(Contact.updated_at, Company.updated_at, meetings, proposals, enrollments, sequences)
+        .outerjoin(Company, Company.id == Contact.company_id)
+        .where(Contact.id == contact_id)
+    ).first()
+    return tuple(row) if row else None
+
+
 @app.get("/leads/{contact_id}", response_class=HTMLResponse)
 def lead_detail(request: Request, contact_id: int, db: Session = Depends(get_db)):
-    contact = db.query(Contact).get(contact_id)
-    if not contact:
+    version = _lead_version(db, contact_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Contact not found")
+    etag = make_etag("lead", contact_id, request.state.user_id, version)
+    last_modified = max((stamp for stamp in version if isinstance(stamp, datetime)), default=None)
+    if cached := not_modified(request, etag, last_modified):
+        return cached
 
+    contact = db.query(Contact).get(contact_id)
     meetings = db.query(Meeting).filter(Meeting.contact_id == contact_id).order_by(Meeting.meeting_time.desc()).all()
     proposals = db.query(Proposal).filter(Proposal.contact_id == contact_id).order_by(Proposal.created_at.desc()).all()
     enrollments = db.query(NurtureEnrollment).filter(NurtureEnrollment.contact_id == contact_id).all()
@@ -524,13 +765,13 @@ def lead_detail(request: Request, contact_id: int, db: Session = Depends(get_db)
     return templates.TemplateResponse("lead_detail.html", {
         "request": request,
         "settings": settings,
-        "user": _get_user(request, db),
+        "user": _get_user(request),
         "contact": contact,
         "meetings": meetings,
         "proposals": proposals,
         "enrollments": enrollments,
         "sequences": sequences,
-    })
+    }, headers=validator_headers(etag, last_modified))
 
 
 @app.post("/leads/{contact_id}/update", response_class=HTMLResponse)
@@ -575,13 +816,12 @@ def lead_update(
 PIPELINE_STAGES = ["New", "Contacted", "Qualified", "Proposal", "Negotiation", "Won", "Lost"]
 
 
-@app.get("/pipeline", response_class=HTMLResponse)
-def pipeline(request: Request, db: Session = Depends(get_db)):
+def _pipeline_context(db: Session, request: Request) -> dict:
     pipeline_data = {}
     pipeline_stats = {}
     for stage in PIPELINE_STAGES:
         contacts = (
-            _active_contacts(db)
+            loading.contact_cards(_active_contacts(db))
             .filter(Contact.lead_status == stage)
             .order_by(Contact.updated_at.desc())
             .all()
@@ -591,13 +831,20 @@ def pipeline(request: Request, db: Session = Depends(get_db)):
             "count": len(contacts),
             "total_value": sum(c.deal_value or 0 for c in contacts),
         }
+    return {
+        "user": _get_user(request),
+        "pipeline_data": pipeline_data,
+        "pipeline_stats": pipeline_stats,
+    }
 
+
+@app.get("/pipeline", response_class=HTMLResponse)
+async def pipeline(request: Request, db: AsyncSession = Depends(get_async_db)):
+    ctx = await db.run_sync(_pipeline_context, request)
     return templates.TemplateResponse("pipeline.html", {
         "request": request,
         "settings": settings,
-        "user": _get_user(request, db),
-        "pipeline_data": pipeline_data,
-        "pipeline_stats": pipeline_stats,
+        **ctx,
         "stages": PIPELINE_STAGES,
     })
 
@@ -614,17 +861,9 @@ def pipeline_move(
         contact.lead_status = new_status
         db.commit()
 
-    pipeline_stats = {}
-    for stage in PIPELINE_STAGES:
-        contacts = _active_contacts(db).filter(Contact.lead_status == stage).all()
-        pipeline_stats[stage] = {
-            "count": len(contacts),
-            "total_value": sum(c.deal_value or 0 for c in contacts),
-        }
-
     return templates.TemplateResponse("partials/pipeline_stats.html", {
         "request": request,
-        "pipeline_stats": pipeline_stats,
+        "pipeline_stats": get_stage_totals(db),
         "stages": PIPELINE_STAGES,
     })
 
@@ -636,6 +875,7 @@ import threading as _threading
 scraper_results: list[dict] = []
 scraper_status: dict = {"running": False, "sources": {}, "total_found": 0, "message": "Idle"}
 _scraper_lock = _threading.Lock()
+metrics.SCRAPER_RESULTS_HELD.set_function(lambda: len(scraper_results))
 
 
 @app.get("/scraper", response_class=HTMLResponse)
@@ -643,7 +883,7 @@ def scraper_page(request: Request, db: Session = Depends(get_db)):
     return templates.TemplateResponse("scraper.html", {
         "request": request,
         "settings": settings,
-        "user": _get_user(request, db),
+        "user": _get_user(request),
         "scraper_status": scraper_status,
         "results": scraper_results,
         "get_source_badge_css": get_source_badge_css,
@@ -774,51 +1014,7 @@ def _add_scraper_result_to_db(index: int, db: Session) -> tuple[dict | None, str
         return None, "error"
 
     result = scraper_results[index]
-
-    # Check for duplicate by linkedin_url OR by first+last name
-    existing = None
-    if result.get("linkedin_url"):
-        existing = db.query(Contact).filter(Contact.linkedin_url == result["linkedin_url"]).first()
-    if not existing and result.get("first_name") and result.get("last_name") and result.get("company_name"):
-        existing = db.query(Contact).filter(
-            Contact.first_name == result["first_name"],
-            Contact.last_name == result["last_name"],
-            Contact.company.has(Company.company_name == result["company_name"]),
-        ).first()
-
-    if existing:
-        return result, "duplicate"
-
-    # Find or create company
-    company = None
-    if result.get("company_name"):
-        company = db.query(Company).filter(Company.company_name == result["company_name"]).first()
-        if not company:
-            company = Company(
-                company_name=result.get("company_name", ""),
-                company_domain=result.get("company_domain"),
-                company_industry=result.get("company_industry", ""),
-                company_location=result.get("company_location", ""),
-            )
-            db.add(company)
-            db.flush()
-
-    contact = Contact(
-        first_name=result.get("first_name", ""),
-        last_name=result.get("last_name", ""),
-        job_title=result.get("job_title", ""),
-        linkedin_url=result.get("linkedin_url"),
-        location_city=result.get("location_city", ""),
-        location_state=result.get("location_state", ""),
-        location_country=result.get("location_country", "AU"),
-        lead_status="New",
-        lead_source=result.get("source_name", "Unknown"),
-        source_url=result.get("source_url"),
-        company_id=company.id if company else None,
-    )
-    db.add(contact)
-
-    return result, "added"
+    return result, ingest.add_scraped_contacts(db, [result])[0]
 
 
 @app.post("/scraper/add/{index}", response_class=HTMLResponse)
@@ -848,15 +1044,12 @@ def scraper_add_lead(request: Request, index: int, db: Session = Depends(get_db)
 
 @app.post("/scraper/add-bulk", response_class=HTMLResponse)
 def scraper_add_bulk(request: Request, indices: list[int] = Form(...), db: Session = Depends(get_db)):
-    added = 0
-    duplicates = 0
-    for idx in indices:
-        result, status = _add_scraper_result_to_db(idx, db)
-        if status == "added":
-            added += 1
-        elif status == "duplicate":
-            duplicates += 1
+    indices = [i for i in dict.fromkeys(indices) if 0 <= i < len(scraper_results)]
+    statuses = ingest.add_scraped_contacts(db, [scraper_results[i] for i in indices])
     db.commit()
+    row_statuses = dict(zip(indices, statuses))
+    added = statuses.count("added")
+    duplicates = statuses.count("duplicate")
 
     msg = f"Added {added} leads to your CRM."
     if duplicates:
@@ -868,16 +1061,16 @@ def scraper_add_bulk(request: Request, indices: list[int] = Form(...), db: Sessi
         "scraper_status": {"running": False, "total_found": scraper_status.get("total_found", 0), "message": msg},
         "results": scraper_results,
         "added_indices": indices,
+        "row_statuses": row_statuses,
         "get_source_badge_css": get_source_badge_css,
     })
 
 
 # ── Scheduler ──────────────────────────────────────────────────────────────────
 
-@app.get("/scheduler", response_class=HTMLResponse)
-def scheduler_page(request: Request, db: Session = Depends(get_db)):
+def _scheduler_context(db: Session, request: Request) -> dict:
     upcoming = (
-        db.query(Meeting)
+        loading.meeting_rows(db.query(Meeting))
         .filter(Meeting.meeting_time >= datetime.utcnow())
         .filter(Meeting.status == "Scheduled")
         .order_by(Meeting.meeting_time.asc())
@@ -885,13 +1078,13 @@ def scheduler_page(request: Request, db: Session = Depends(get_db)):
         .all()
     )
     past = (
-        db.query(Meeting)
+        loading.meeting_rows(db.query(Meeting))
         .filter(Meeting.meeting_time < datetime.utcnow())
         .order_by(Meeting.meeting_time.desc())
         .limit(10)
         .all()
     )
-    contacts = _active_contacts(db).order_by(Contact.first_name).all()
+    contacts = loading.contact_cards(_active_contacts(db)).order_by(Contact.first_name).all()
 
     today = datetime.utcnow().date()
     week_start = today - timedelta(days=today.weekday())
@@ -904,15 +1097,23 @@ def scheduler_page(request: Request, db: Session = Depends(get_db)):
         .all()
     )
 
-    return templates.TemplateResponse("scheduler.html", {
-        "request": request,
-        "settings": settings,
-        "user": _get_user(request, db),
+    return {
+        "user": _get_user(request),
         "upcoming": upcoming,
         "past": past,
         "contacts": contacts,
         "week_dates": week_dates,
         "week_meetings": week_meetings,
+    }
+
+
+@app.get("/scheduler", response_class=HTMLResponse)
+async def scheduler_page(request: Request, db: AsyncSession = Depends(get_async_db)):
+    ctx = await db.run_sync(_scheduler_context, request)
+    return templates.TemplateResponse("scheduler.html", {
+        "request": request,
+        "settings": settings,
+        **ctx,
     })
 
 
@@ -965,13 +1166,13 @@ def scheduler_cancel(meeting_id: int, db: Session = Depends(get_db)):
 @app.get("/nurture", response_class=HTMLResponse)
 def nurture_page(request: Request, db: Session = Depends(get_db)):
     sequences = db.query(NurtureSequence).all()
-    enrollments = db.query(NurtureEnrollment).all()
-    contacts = _active_contacts(db).order_by(Contact.first_name).all()
+    enrollments = loading.enrollment_rows(db.query(NurtureEnrollment)).all()
+    contacts = loading.contact_cards(_active_contacts(db)).order_by(Contact.first_name).all()
 
     return templates.TemplateResponse("nurture.html", {
         "request": request,
         "settings": settings,
-        "user": _get_user(request, db),
+        "user": _get_user(request),
         "sequences": sequences,
         "enrollments": enrollments,
         "contacts": contacts,
@@ -1059,13 +1260,13 @@ def nurture_advance(request: Request, enrollment_id: int, db: Session = Depends(
 
 @app.get("/proposals", response_class=HTMLResponse)
 def proposals_page(request: Request, db: Session = Depends(get_db)):
-    proposals = db.query(Proposal).order_by(Proposal.created_at.desc()).all()
-    contacts = _active_contacts(db).order_by(Contact.first_name).all()
+    proposals = loading.proposal_rows(db.query(Proposal)).order_by(Proposal.created_at.desc()).all()
+    contacts = loading.contact_cards(_active_contacts(db)).order_by(Contact.first_name).all()
 
     return templates.TemplateResponse("proposals.html", {
         "request": request,
         "settings": settings,
-        "user": _get_user(request, db),
+        "user": _get_user(request),
         "proposals": proposals,
         "contacts": contacts,
         "products": settings.products,
@@ -1145,24 +1346,34 @@ def proposals_create(
 
 
 @app.get("/proposals/{proposal_id}/pdf")
-def proposals_download_pdf(proposal_id: int, db: Session = Depends(get_db)):
+def proposals_download_pdf(request: Request, proposal_id: int, db: Session = Depends(get_db)):
     proposal = db.query(Proposal).get(proposal_id)
-    if not proposal or not proposal.pdf_path:
+    if not proposal or not proposal.pdf_path or not os.path.exists(proposal.pdf_path):
         raise HTTPException(status_code=404)
-    return FileResponse(proposal.pdf_path, media_type="application/pdf", filename=f"proposal-{proposal_id}.pdf")
+    stat = os.stat(proposal.pdf_path)
+    etag = make_etag("pdf", proposal_id, proposal.pdf_path, stat.st_mtime_ns, stat.st_size)
+    last_modified = datetime.utcfromtimestamp(stat.st_mtime)
+    if cached := not_modified(request, etag, last_modified):
+        return cached
+    return FileResponse(proposal.pdf_path, media_type="application/pdf", filename=f"proposal-{proposal_id}.pdf",
+                        headers=validator_headers(etag, last_modified))
 
 
 @app.get("/proposals/{proposal_id}/preview", response_class=HTMLResponse)
 def proposals_preview(request: Request, proposal_id: int, db: Session = Depends(get_db)):
     """Render the proposal as HTML in the browser (same content as the PDF)."""
-    proposal = db.query(Proposal).get(proposal_id)
+    proposal = loading.proposal_rows(db.query(Proposal)).filter(Proposal.id == proposal_id).first()
     if not proposal:
         raise HTTPException(status_code=404)
 
     contact = proposal.contact
     company = contact.company if contact else None
+    stamps = (proposal.updated_at, contact.updated_at, company.updated_at if company else None)
+    last_modified = max((stamp for stamp in stamps if stamp), default=None)
+    etag = make_etag("proposal-preview", proposal_id, *stamps)
+    if cached := not_modified(request, etag, last_modified):
+        return cached
 
-    from proposals.pdf_generator import proposal_env
     template = proposal_env.get_template("proposal.html")
     html_content = template.render(
         company=settings.company_name,
@@ -1176,15 +1387,23 @@ def proposals_preview(request: Request, proposal_id: int, db: Session = Depends(
         date=proposal.created_at.strftime("%d %B %Y"),
         differentiators=settings.key_differentiators,
     )
-    return HTMLResponse(html_content)
+    return HTMLResponse(html_content, headers=validator_headers(etag, last_modified))
 
 
 @app.get("/proposals/{proposal_id}/email-preview", response_class=HTMLResponse)
 def proposals_email_preview(request: Request, proposal_id: int, db: Session = Depends(get_db)):
-    proposal = db.query(Proposal).get(proposal_id)
-    if not proposal or not proposal.email_html:
+    # Check the stamp before loading the (large) stored HTML
+    row = db.execute(
+        select(Proposal.updated_at).where(Proposal.id == proposal_id, Proposal.email_html.is_not(None))
+    ).first()
+    if row is None:
         raise HTTPException(status_code=404)
-    return HTMLResponse(proposal.email_html)
+    updated_at = row.updated_at
+    etag = make_etag("proposal-email", proposal_id, updated_at)
+    if cached := not_modified(request, etag, updated_at):
+        return cached
+    email_html = db.scalar(select(Proposal.email_html).where(Proposal.id == proposal_id))
+    return HTMLResponse(email_html, headers=validator_headers(etag, updated_at))
 
 
 @app.post("/proposals/{proposal_id}/send")
@@ -1197,6 +1416,23 @@ def proposals_mark_sent(proposal_id: int, db: Session = Depends(get_db)):
     return RedirectResponse("/proposals", status_code=303)
 
 
+# ── Metrics ────────────────────────────────────────────────────────────────────
+
+def _metrics_scraper(request: Request) -> bool:
+    """A bearer token matching METRICS_TOKEN, or localhost if METRICS_ALLOW_LOCALHOST."""
+    # Off by default: behind nginx every request arrives from 127.0.0.1
+    if settings.metrics_allow_localhost and request.client and request.client.host in ("127.0.0.1", "::1"):
+        return True
+    expected = f"Bearer {settings.metrics_token}"
+    return bool(settings.metrics_token) and hmac.compare_digest(
+        request.headers.get("authorization", "").encode(), expected.encode())
+
+
+@app.get("/metrics")
+def metrics_endpoint():
+    return Response(generate_latest(metrics.REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+
 # ── Run ────────────────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
@@ -1,25 +1,70 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
 import bcrypt
 
 from fastapi import Request, Depends
 from fastapi.responses import RedirectResponse
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from config import settings
-from database.db import get_db
+from database.db import AsyncSessionLocal, get_db
 from database.models import User
 
 # ── Password hashing (bcrypt) ────────────────────────────────────────────────
+# Hashing is CPU-bound on purpose. Routes hash on a small dedicated executor
+# rather than the request threadpool, so a burst of logins can't starve page
+# requests. Once every worker is busy and the queue is full, callers get
+# HashingBusy (served as a 429) instead of waiting.
 
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=settings.bcrypt_rounds)).decode()
 
 
 def verify_password(plain: str, hashed: str) -> bool:
     return bcrypt.checkpw(plain.encode(), hashed.encode())
 
 
+def needs_rehash(hashed: str) -> bool:
+    """True if ``hashed`` was made with a different cost than bcrypt_rounds."""
+    try:
+        return int(hashed.split("$")[2]) != settings.bcrypt_rounds
+    except (IndexError, ValueError):
+        return True
+
+
+class HashingBusy(Exception):
+    """Every hashing worker is busy and the wait queue is full."""
+
+
+_hash_executor = ThreadPoolExecutor(max_workers=settings.hash_workers, thread_name_prefix="bcrypt")
+_hash_slots = threading.BoundedSemaphore(settings.hash_workers + settings.hash_queue_size)
+
+
+async def _run_hashing(fn, *args):
+    if not _hash_slots.acquire(blocking=False):
+        raise HashingBusy()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, fn, *args)
+    finally:
+        _hash_slots.release()
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await _run_hashing(verify_password, plain, hashed)
+
+
 # ── Session cookie (signed, tamper-proof) ─────────────────────────────────────
 
 SESSION_COOKIE = "mastersales_session"
@@ -58,12 +103,108 @@ def verify_reset_token(token: str) -> str | None:
         return None
 
 
+# ── Active-user cache ────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """The logged-in user as handlers and templates see it.
+
+    A plain snapshot rather than the ORM row, so it can be cached across
+    requests and sessions.
+    """
+    id: int
+    email: str
+    full_name: str
+
+    @classmethod
+    def from_model(cls, user: User) -> "CurrentUser":
+        return cls(id=user.id, email=user.email, full_name=user.full_name)
+
+
+class UserCache:
+    """Per-process LRU of active users by id; entries expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[int, tuple[float, CurrentUser]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> CurrentUser | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, user: CurrentUser) -> None:
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(maxsize=settings.user_cache_size, ttl=settings.user_cache_ttl)
+
+
+async def resolve_user(user_id: int) -> CurrentUser | None:
+    """The active user with this id, from the cache or one primary-key lookup."""
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, user_id)
+    if user is None or not user.is_active:
+        return None
+    current = CurrentUser.from_model(user)
+    user_cache.put(current)
+    return current
+
+
+# Any ORM change to a user (password reset, deactivation, rename) evicts it
+# once the transaction commits.
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _note_changed_user(mapper, connection, user):
+    Session.object_session(user).info.setdefault("changed_user_ids", set()).add(user.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session):
+    session.info.pop("changed_user_ids", None)
+
+
 # ── Auth dependency ───────────────────────────────────────────────────────────
 
 PUBLIC_PATHS = {"/login", "/signup", "/forgot-password", "/reset-password"}
 
 
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> User | None:
+def get_current_user(request: Request, db: Session = Depends(get_db)) -> CurrentUser | User | None:
+    """The user the auth middleware resolved, else a lookup from the cookie."""
+    if getattr(request.state, "user", None) is not None:
+        return request.state.user
     token = request.cookies.get(SESSION_COOKIE)
     if not token:
         return None
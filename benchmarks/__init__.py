@@ -0,0 +1,4 @@
+"""Performance benchmarks, run as modules from the project root (``python -m benchmarks.<name>``)."""
+
+# Dataset sizes, in contacts (see benchmarks.dataset)
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
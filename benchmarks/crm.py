@@ -0,0 +1,276 @@
+"""Repeatable timings of the main CRM pages against a synthetic dataset.
+
+    python -m benchmarks.crm --scale 100k
+    python -m benchmarks.crm --scale 1m --repeat 5 --ops leads_list,csv_export --output 1m.json
+
+The first run at a scale generates ``build/bench-<scale>.db`` with
+``benchmarks.dataset``; later runs reuse it. Every run works on a fresh copy,
+so the writes made by ``pipeline_move`` and ``scraper_bulk_add`` never carry
+over and runs stay comparable. Requests go through the whole app (auth
+middleware, routing, templates) in process, logged in as a benchmark user.
+The aggregate caches are off unless ``--cached`` is given, so the timings are
+of the queries rather than of cache hits.
+
+Each operation gets one untimed warm-up, then ``--repeat`` timed requests.
+Results (median, p95, min, max and mean in ms) are printed as JSON together
+with the row counts and environment, ready to diff against another run.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks import SCALES
+
+ROOT = Path(__file__).resolve().parent.parent
+
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "benchmark-password"
+SEARCH_TERMS = ["Anderson", "Perth", "Corrosion Engineer", "Steel", "mitchell", "Kalgoorlie Mining"]
+# Scraper results per bulk add; half of them are already in the CRM
+BULK_ADD_SIZE = 50
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def _summarise(timings: list[float]) -> dict:
+    return {
+        "median": round(statistics.median(timings), 2),
+        "p95": round(percentile(timings, 95), 2),
+        "min": round(min(timings), 2),
+        "max": round(max(timings), 2),
+        "mean": round(statistics.fmean(timings), 2),
+    }
+
+
+# ── Dataset ───────────────────────────────────────────────────────────────────
+
+def prepare(scale: str, contacts: int, seed: int) -> tuple[Path, dict]:
+    """Path of a pristine generated database for ``scale`` (built if needed) and its row counts."""
+    from benchmarks import dataset
+    from database import migrations
+    from database.db import Base, build_engine
+
+    pristine = ROOT / "build" / f"bench-{scale}.db"
+    meta = pristine.with_suffix(".json")
+    wanted = {"contacts": contacts, "seed": seed}
+    if pristine.exists() and meta.exists() and json.loads(meta.read_text()).get("params") == wanted:
+        return pristine, json.loads(meta.read_text())["rows"]
+
+    print(f"Generating {contacts} contacts into {pristine} ...", file=sys.stderr)
+    pristine.parent.mkdir(parents=True, exist_ok=True)
+    for stale in pristine.parent.glob(pristine.name + "*"):
+        stale.unlink()
+    engine = build_engine(f"sqlite:///{pristine}")
+    try:
+        Base.metadata.create_all(engine)
+        migrations.upgrade(engine)
+        rows = dataset.generate(engine, contacts, seed=seed)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            # One self-contained file, so a plain copy is a complete snapshot
+            conn.exec_driver_sql("PRAGMA journal_mode=DELETE")
+            conn.exec_driver_sql("ANALYZE")
+    finally:
+        engine.dispose()
+    meta.write_text(json.dumps({"params": wanted, "rows": rows}))
+    return pristine, rows
+
+
+# ── Operations ────────────────────────────────────────────────────────────────
+
+class _Ops:
+    """The timed operations; each method makes one request and checks its status."""
+
+    def __init__(self, client, app_module, contacts: int, seed: int):
+        self.client = client
+        self.app_module = app_module
+        self.contacts = contacts
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.duplicates = self._existing_leads(BULK_ADD_SIZE // 2)
+
+    def _existing_leads(self, n: int) -> list[dict]:
+        from sqlalchemy import select
+
+        from database.db import SessionLocal
+        from database.models import Company, Contact
+
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(Contact.first_name, Contact.last_name, Company.company_name)
+                .join(Company).where(Contact.contact_key.is_not(None)).limit(n)
+            ).all()
+        return [self._result(first, last, company) for first, last, company in rows]
+
+    @staticmethod
+    def _result(first, last, company, n=None):
+        return {
+            "first_name": first, "last_name": last, "job_title": "Corrosion Engineer",
+            "company_name": company, "company_domain": None,
+            "linkedin_url": f"https://linkedin.com/in/bench-new-{n}" if n is not None else None,
+            "location_city": "Perth", "location_state": "WA", "location_country": "AU",
+            "source_url": None, "source_name": "Benchmark",
+        }
+
+    def _get(self, url: str, **kwargs):
+        response = self.client.get(url, **kwargs)
+        assert response.status_code == 200, f"GET {url}: {response.status_code}"
+        return response
+
+    def _post(self, url: str, data: dict):
+        response = self.client.post(url, data=data)
+        assert response.status_code == 200, f"POST {url}: {response.status_code}"
+        return response
+
+    def leads_list(self):
+        self._get("/leads")
+
+    def leads_search(self):
+        # What the search box sends on each keystroke: table rows only
+        term = SEARCH_TERMS[self.calls % len(SEARCH_TERMS)]
+        self._get("/leads", params={"q": term}, headers={"HX-Request": "true"})
+
+    def dashboard(self):
+        self._get("/")
+
+    def pipeline(self):
+        self._get("/pipeline")
+
+    def pipeline_move(self):
+        self._post("/pipeline/move", {
+            "contact_id": self.rng.randint(1, self.contacts),
+            "new_status": self.rng.choice(self.app_module.PIPELINE_STAGES),
+        })
+
+    def csv_export(self):
+        with self.client.stream("GET", "/leads/export") as response:
+            assert response.status_code == 200, f"GET /leads/export: {response.status_code}"
+            for _ in response.iter_bytes():
+                pass
+
+    def scraper_bulk_add(self):
+        fresh = [self._result("Bench", f"Lead{self.calls}x{i}", f"Benchmark Imports {self.calls}", f"{self.calls}-{i}")
+                 for i in range(BULK_ADD_SIZE - len(self.duplicates))]
+        self.app_module.scraper_results[:] = fresh + self.duplicates
+        self._post("/scraper/add-bulk", {"indices": [str(i) for i in range(BULK_ADD_SIZE)]})
+
+
+OPERATIONS = ["leads_list", "leads_search", "dashboard", "pipeline", "pipeline_move",
+              "csv_export", "scraper_bulk_add"]
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+def run(scale: str, contacts: int, ops: list[str], repeat: int = 20, seed: int = 0, cached: bool = False) -> dict:
+    working = ROOT / "build" / f"bench-{scale}.run.db"
+    # Before anything imports the settings
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{working}",
+        "DEBUG": "false",
+        "SQL_PROFILING": "false",
+        "BCRYPT_ROUNDS": "4",
+    })
+    if not cached:
+        os.environ.update({"QUERY_CACHE_TTL": "0", "FACET_CACHE_TTL": "0"})
+
+    pristine, rows = prepare(scale, contacts, seed)
+    for leftover in working.parent.glob(working.name + "*"):
+        leftover.unlink()
+    shutil.copyfile(pristine, working)
+
+    from fastapi.testclient import TestClient
+
+    import app as app_module
+    from auth import hash_password
+    from database.db import SessionLocal
+    from database.models import User
+
+    results = {}
+    try:
+        with TestClient(app_module.app) as client:
+            with SessionLocal() as db:
+                db.add(User(email=BENCH_EMAIL, full_name="Benchmark", password_hash=hash_password(BENCH_PASSWORD)))
+                db.commit()
+            login = client.post("/login", data={"email": BENCH_EMAIL, "password": BENCH_PASSWORD},
+                                follow_redirects=False)
+            assert login.status_code == 303, "benchmark login failed"
+
+            bench = _Ops(client, app_module, contacts, seed)
+            for name in ops:
+                op = getattr(bench, name)
+                op()  # warm-up
+                timings = []
+                for _ in range(repeat):
+                    bench.calls += 1
+                    started = time.perf_counter()
+                    op()
+                    timings.append((time.perf_counter() - started) * 1000)
+                results[name] = _summarise(timings)
+                print(f"{name}: median {results[name]['median']} ms", file=sys.stderr)
+    finally:
+        app_module.engine.dispose()
+        for leftover in working.parent.glob(working.name + "*"):
+            leftover.unlink()
+
+    return {
+        "benchmark": "crm",
+        "scale": scale,
+        "rows": rows,
+        "seed": seed,
+        "repeat": repeat,
+        "cached": cached,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "operations": results,
+    }
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.crm", description=__doc__.split("\n")[0])
+    parser.add_argument("--scale", choices=SCALES, default="10k", help="dataset size in contacts")
+    parser.add_argument("--repeat", type=int, default=20, help="timed requests per operation")
+    parser.add_argument("--ops", default=",".join(OPERATIONS),
+                        help=f"comma-separated subset of: {', '.join(OPERATIONS)}")
+    parser.add_argument("--seed", type=int, default=0, help="dataset and workload seed")
+    parser.add_argument("--cached", action="store_true", help="leave the aggregate caches on")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    ops = [op.strip() for op in args.ops.split(",") if op.strip()]
+    unknown = set(ops) - set(OPERATIONS)
+    if unknown:
+        parser.error(f"unknown operations: {', '.join(sorted(unknown))}")
+
+    results = run(args.scale, SCALES[args.scale], ops, args.repeat, args.seed, args.cached)
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
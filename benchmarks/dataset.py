@@ -0,0 +1,338 @@
+"""Synthetic CRM dataset generator for the benchmarks.
+
+Fills an empty, migrated database with companies, contacts, meetings,
+proposals and nurture enrollments in realistic proportions::
+
+    python -m benchmarks.dataset --scale 100k --database sqlite:///build/bench-100k.db
+    python -m benchmarks.dataset --contacts 25000 --seed 7 --database postgresql://...
+
+A scale names the number of contacts (``10k``, ``100k``, ``1m``); the other
+tables are sized from it. Values are drawn a whole batch at a time from a
+seeded ``random.Random`` and written with one multi-row ``INSERT`` per table
+per batch, bypassing the ORM, so the same seed always gives the same rows.
+Dedup keys are computed here the way ``database.ingest`` does, and the FTS
+index is kept current by its triggers.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Engine
+
+from benchmarks import SCALES
+from config import settings
+from database import dedup, migrations
+from database.db import Base, build_engine
+from database.models import Company, Contact, Meeting, NurtureEnrollment, NurtureSequence, Proposal
+from scraper.search_engine import DEMO_COMPANIES, DEMO_FIRST_NAMES, DEMO_JOB_TITLES, DEMO_LAST_NAMES
+
+# Rows per contact in each dependent table
+COMPANIES_PER_CONTACT = 0.1
+MEETINGS_PER_CONTACT = 0.25
+PROPOSALS_PER_CONTACT = 0.1
+ENROLLMENTS_PER_CONTACT = 0.2
+
+# ── Vocabularies ──────────────────────────────────────────────────────────────
+
+_PLACES = sorted({city for _, city, _, _ in DEMO_COMPANIES}) + [
+    "Pilbara", "Goldfields", "Kimberley", "Gippsland", "Hunter", "Tasman", "Otago", "Southland",
+]
+_TRADES = ["Steel", "Coatings", "Engineering", "Fabrication", "Marine", "Mining", "Structural",
+           "Industrial", "Metal", "Protective", "Blast & Paint", "Machinery"]
+_KINDS = ["Works", "Services", "Solutions", "Group", "Contractors", "Systems", "Industries", "Partners"]
+_INDUSTRIES = ["Steel Fabrication", "Mining Services", "Shipbuilding & Marine", "Heavy Machinery",
+               "Engineering & Fabrication", "Steel Construction", "Oil & Gas", "Infrastructure"]
+_SIZES = ["1-10", "10-20", "20-50", "50-200", "200-500", "500+"]
+# (city, state, country), weighted towards the priority states like the real pipeline
+_LOCATIONS = sorted({(city, state, country) for _, city, state, country in DEMO_COMPANIES})
+_LOCATION_WEIGHTS = [3 if state in settings.priority_states else 1 for _, state, _ in _LOCATIONS]
+_SENIORITY = ["Manager", "Director", "C-Suite", "Owner", "Senior", "Entry"]
+_SOURCES = ["LinkedIn", "ACA", "AMPP", "Trade Shows", "AusTender", "GETS NZ", "Manual"]
+_SOURCE_WEIGHTS = [50, 10, 8, 10, 8, 4, 10]
+_STATUSES = ["New", "Contacted", "Qualified", "Proposal", "Negotiation", "Won", "Lost"]
+_STATUS_WEIGHTS = [40, 20, 12, 8, 5, 7, 8]
+_MEETING_STATUSES = ["Scheduled", "Completed", "Cancelled"]
+_MEETING_WEIGHTS = [40, 50, 10]
+_MEETING_TITLES = ["Intro call", "Site visit", "Product demo", "Trial application review", "Proposal walkthrough"]
+_PROPOSAL_STATUSES = ["Draft", "Sent", "Accepted", "Rejected"]
+_PROPOSAL_WEIGHTS = [40, 35, 15, 10]
+_ENROLLMENT_STATUSES = ["Active", "Completed", "Paused"]
+_ENROLLMENT_WEIGHTS = [60, 30, 10]
+
+_SEQUENCES = [
+    {"name": f"Benchmark sequence {n}", "description": "Generated by benchmarks.dataset",
+     "steps": [{"day_offset": d, "subject": f"Step {i + 1}", "body_template": "Hi {first_name},\n\n..."}
+               for i, d in enumerate((0, 3, 7, 14))]}
+    for n in (1, 2, 3)
+]
+
+
+def _company_name(i: int) -> str:
+    """A distinct name (and so a distinct dedup key) for every ``i``."""
+    place = _PLACES[i % len(_PLACES)]
+    trade = _TRADES[i // len(_PLACES) % len(_TRADES)]
+    kind = _KINDS[i // (len(_PLACES) * len(_TRADES)) % len(_KINDS)]
+    round_ = i // (len(_PLACES) * len(_TRADES) * len(_KINDS))
+    return f"{place} {trade} {kind}" + (f" {round_ + 1}" if round_ else "")
+
+
+def _domain(name: str) -> str:
+    return dedup.normalize_text(name).replace(" ", "") + ".com.au"
+
+
+# ── Row batches ───────────────────────────────────────────────────────────────
+
+def _batches(total: int, size: int):
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+
+def _days_ago(rng: random.Random, now: datetime, n: int, max_days: int) -> list[datetime]:
+    return [now - timedelta(days=d, minutes=m)
+            for d, m in zip(rng.choices(range(max_days), k=n), rng.choices(range(1440), k=n))]
+
+
+def _company_rows(rng, now, start, n):
+    names = [_company_name(i) for i in range(start, start + n)]
+    industries = rng.choices(_INDUSTRIES, k=n)
+    sizes = rng.choices(_SIZES, k=n)
+    locations = rng.choices(_LOCATIONS, weights=_LOCATION_WEIGHTS, k=n)
+    created = _days_ago(rng, now, n, 1095)
+    return [
+        {
+            "id": start + i + 1,
+            "company_name": name,
+            "company_website": _domain(name),
+            "company_domain": _domain(name),
+            "company_industry": industries[i],
+            "company_size": sizes[i],
+            "company_location": f"{locations[i][0]}, {locations[i][1]}",
+            "company_keywords": "steel,corrosion,coating",
+            "company_key": dedup.company_key(name),
+            "created_at": created[i],
+            "updated_at": created[i],
+        }
+        for i, name in enumerate(names)
+    ]
+
+
+def _contact_rows(rng, now, start, n, company_names, seen_keys):
+    firsts = rng.choices(DEMO_FIRST_NAMES, k=n)
+    lasts = rng.choices(DEMO_LAST_NAMES, k=n)
+    company_ids = rng.choices(range(1, len(company_names) + 1), k=n)
+    titles = rng.choices(DEMO_JOB_TITLES, k=n)
+    seniority = rng.choices(_SENIORITY, k=n)
+    locations = rng.choices(_LOCATIONS, weights=_LOCATION_WEIGHTS, k=n)
+    sources = rng.choices(_SOURCES, weights=_SOURCE_WEIGHTS, k=n)
+    statuses = rng.choices(_STATUSES, weights=_STATUS_WEIGHTS, k=n)
+    scores = rng.choices(range(101), k=n)
+    values = rng.choices(range(settings.deal_size_min, settings.deal_size_max + 1, 250), k=n)
+    created = _days_ago(rng, now, n, 730)
+    touched = rng.choices(range(60), k=n)
+    deleted = rng.choices((False, True), weights=(98, 2), k=n)
+    rows = []
+    for i in range(n):
+        contact_id = start + i + 1
+        first, last, company_id = firsts[i], lasts[i], company_ids[i]
+        company_name = company_names[company_id - 1]
+        # One contact per name + company, as the unique index requires; a
+        # repeat keeps no key, like rows backfilled before the index existed
+        key = dedup.contact_key(first, last, company_name)
+        if key in seen_keys:
+            key = None
+        else:
+            seen_keys.add(key)
+        status = statuses[i]
+        linkedin_url = f"https://linkedin.com/in/{dedup.normalize_text(f'{first} {last}').replace(' ', '-')}-{contact_id}"
+        updated = min(created[i] + timedelta(days=touched[i]), now)
+        rows.append({
+            "id": contact_id,
+            "first_name": first,
+            "last_name": last,
+            "job_title": titles[i],
+            "seniority_level": seniority[i],
+            "email_work": f"{first.lower()}.{contact_id}@{_domain(company_name)}",
+            "phone_work": f"+61 8 {9000 + contact_id % 1000:04d} {contact_id % 10000:04d}",
+            "linkedin_url": linkedin_url,
+            "location_city": locations[i][0],
+            "location_state": locations[i][1],
+            "location_country": locations[i][2],
+            "lead_status": status,
+            "lead_score": scores[i],
+            "lead_source": sources[i],
+            "deal_value": values[i] if status not in ("New", "Lost") else None,
+            "last_contacted": updated if status != "New" else None,
+            "created_at": created[i],
+            "updated_at": updated,
+            "deleted_at": updated if deleted[i] else None,
+            "contact_key": key,
+            "linkedin_key": dedup.linkedin_key(linkedin_url),
+            "company_id": company_id,
+        })
+    return rows
+
+
+def _meeting_rows(rng, now, start, n, contacts):
+    contact_ids = rng.choices(range(1, contacts + 1), k=n)
+    statuses = rng.choices(_MEETING_STATUSES, weights=_MEETING_WEIGHTS, k=n)
+    titles = rng.choices(_MEETING_TITLES, k=n)
+    offsets = rng.choices(range(-365, 60), k=n)
+    hours = rng.choices(range(8, 17), k=n)
+    durations = rng.choices((15, 30, 45, 60), k=n)
+    rows = []
+    for i in range(n):
+        when = now + timedelta(days=offsets[i], hours=hours[i])
+        status = statuses[i] if when < now else "Scheduled"
+        rows.append({
+            "id": start + i + 1,
+            "contact_id": contact_ids[i],
+            "title": titles[i],
+            "meeting_time": when,
+            "duration_minutes": durations[i],
+            "status": status,
+            "created_at": min(when, now) - timedelta(days=7),
+            "updated_at": min(when, now),
+        })
+    return rows
+
+
+def _proposal_rows(rng, now, start, n, contacts):
+    contact_ids = rng.choices(range(1, contacts + 1), k=n)
+    statuses = rng.choices(_PROPOSAL_STATUSES, weights=_PROPOSAL_WEIGHTS, k=n)
+    picks = [rng.sample(settings.products, rng.randint(1, 3)) for _ in range(n)]
+    created = _days_ago(rng, now, n, 365)
+    rows = []
+    for i in range(n):
+        products = [
+            {"name": p["name"], "description": p["description"], "quantity": qty,
+             "unit_price": p["price_per_litre"], "total": p["price_per_litre"] * qty}
+            for p, qty in zip(picks[i], rng.choices(range(1, 41), k=len(picks[i])))
+        ]
+        sent = created[i] + timedelta(days=1) if statuses[i] != "Draft" else None
+        rows.append({
+            "id": start + i + 1,
+            "contact_id": contact_ids[i],
+            "products": products,
+            "pricing": sum(p["total"] for p in products),
+            "status": statuses[i],
+            "created_at": created[i],
+            "sent_at": sent,
+            "updated_at": sent or created[i],
+        })
+    return rows
+
+
+def _enrollment_rows(rng, now, start, n, contacts, sequence_ids):
+    contact_ids = rng.choices(range(1, contacts + 1), k=n)
+    sequences = rng.choices(sequence_ids, k=n)
+    steps = rng.choices(range(4), k=n)
+    statuses = rng.choices(_ENROLLMENT_STATUSES, weights=_ENROLLMENT_WEIGHTS, k=n)
+    enrolled = _days_ago(rng, now, n, 180)
+    return [
+        {
+            "id": start + i + 1,
+            "contact_id": contact_ids[i],
+            "sequence_id": sequences[i],
+            "current_step": steps[i],
+            "status": statuses[i],
+            "enrolled_at": enrolled[i],
+            "updated_at": enrolled[i] + timedelta(days=steps[i] * 3),
+        }
+        for i in range(n)
+    ]
+
+
+# ── Generation ────────────────────────────────────────────────────────────────
+
+def row_counts(contacts: int) -> dict[str, int]:
+    """Rows per table for a dataset of ``contacts`` contacts."""
+    return {
+        "companies": max(1, round(contacts * COMPANIES_PER_CONTACT)),
+        "contacts": contacts,
+        "meetings": round(contacts * MEETINGS_PER_CONTACT),
+        "proposals": round(contacts * PROPOSALS_PER_CONTACT),
+        "nurture_enrollments": round(contacts * ENROLLMENTS_PER_CONTACT),
+        "nurture_sequences": len(_SEQUENCES),
+    }
+
+
+def generate(engine: Engine, contacts: int, seed: int = 0, batch_size: int = 5000) -> dict[str, int]:
+    """Fill the empty, migrated database behind ``engine``; returns rows per table.
+
+    Raises ValueError if it already holds contacts or companies.
+    """
+    counts = row_counts(contacts)
+    rng = random.Random(seed)
+    # Whole days, so two runs on the same day produce identical rows
+    now = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    with engine.begin() as conn:
+        if conn.scalar(select(func.count(Contact.id))) or conn.scalar(select(func.count(Company.id))):
+            raise ValueError("database already has contacts or companies; generate into an empty one")
+
+        sequence_ids = [
+            conn.execute(insert(NurtureSequence).values(**seq, created_at=now)).inserted_primary_key[0]
+            for seq in _SEQUENCES
+        ]
+
+        company_names = []
+        for start, n in _batches(counts["companies"], batch_size):
+            rows = _company_rows(rng, now, start, n)
+            conn.execute(insert(Company), rows)
+            company_names.extend(r["company_name"] for r in rows)
+
+        seen_keys: set[str] = set()
+        for start, n in _batches(contacts, batch_size):
+            conn.execute(insert(Contact), _contact_rows(rng, now, start, n, company_names, seen_keys))
+        for start, n in _batches(counts["meetings"], batch_size):
+            conn.execute(insert(Meeting), _meeting_rows(rng, now, start, n, contacts))
+        for start, n in _batches(counts["proposals"], batch_size):
+            conn.execute(insert(Proposal), _proposal_rows(rng, now, start, n, contacts))
+        for start, n in _batches(counts["nurture_enrollments"], batch_size):
+            conn.execute(insert(NurtureEnrollment), _enrollment_rows(rng, now, start, n, contacts, sequence_ids))
+
+        if conn.dialect.name == "postgresql":
+            from database.copy_to_postgres import reset_sequences
+            reset_sequences(conn)
+    return counts
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.dataset", description=__doc__.split("\n")[0])
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--scale", choices=SCALES, default="10k", help="number of contacts (default: 10k)")
+    size.add_argument("--contacts", type=int, help="exact number of contacts")
+    parser.add_argument("--database", default=None,
+                        help="SQLAlchemy URL (default: sqlite:///build/bench-<scale>.db)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per INSERT")
+    args = parser.parse_args(argv)
+
+    contacts = args.contacts or SCALES[args.scale]
+    url = args.database or f"sqlite:///build/bench-{args.contacts or args.scale}.db"
+    if url.startswith("sqlite:///"):
+        Path(url.removeprefix("sqlite:///")).parent.mkdir(parents=True, exist_ok=True)
+
+    engine = build_engine(url)
+    try:
+        Base.metadata.create_all(engine)
+        migrations.upgrade(engine)
+        started = time.perf_counter()
+        counts = generate(engine, contacts, seed=args.seed, batch_size=args.batch_size)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    finally:
+        engine.dispose()
+    print(json.dumps({"database": engine.url.render_as_string(hide_password=True), "seed": args.seed,
+                      "seconds": round(time.perf_counter() - started, 1), "rows": counts}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
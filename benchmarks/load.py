@@ -0,0 +1,366 @@
+"""HTTP load test: concurrent logged-in users replaying a weighted mix of actions.
+
+    python -m benchmarks.load --scale 100k --workers 2 --users 20 --duration 60
+    python -m benchmarks.load --profile browsing --output load.json
+    python -m benchmarks.load --url https://staging.example.com --profile browsing --email me@example.com --password ...
+
+By default it starts uvicorn on localhost with ``--workers`` processes over a
+fresh copy of a generated dataset (see ``benchmarks.crm``), so the numbers
+show how many workers an instance size can keep busy. With ``--url`` it
+drives an already running server instead, logging in with the given account;
+there only read-only profiles run unless ``--allow-writes`` is given, since
+the others move real pipeline cards and create proposals.
+
+Each virtual user is an ``httpx.AsyncClient`` with its own session cookie.
+It logs in through ``/login``, then loops for ``--duration`` seconds picking
+actions by the profile's weights: browsing and paging ``/leads``, typing a
+search one keystroke at a time the way the HTMX search box does, dragging
+Kanban cards through ``/pipeline/move``, polling ``/scraper/status``,
+creating proposals and exporting CSV. Latency percentiles (p50/p95/p99) and
+throughput are reported per route as JSON.
+"""
+import argparse
+import asyncio
+import html
+import json
+import os
+import random
+import re
+import shutil
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from benchmarks import SCALES
+from benchmarks.crm import SEARCH_TERMS, git_commit, percentile, prepare
+
+ROOT = Path(__file__).resolve().parent.parent
+
+LOAD_EMAIL = "load-{n}@example.com"
+LOAD_PASSWORD = "load-test-password"
+# As app.PIPELINE_STAGES (not imported: the driver doesn't load the app)
+PIPELINE_STAGES = ["New", "Contacted", "Qualified", "Proposal", "Negotiation", "Won", "Lost"]
+
+# Relative weights of each action per profile
+PROFILES = {
+    "mixed": {"leads_browse": 20, "leads_search": 20, "dashboard": 10, "pipeline_move": 15,
+              "scraper_status": 25, "proposal_create": 5, "csv_export": 2},
+    # Reps reading and searching, nothing heavy
+    "browsing": {"leads_browse": 35, "leads_search": 40, "dashboard": 20, "scraper_status": 5},
+    # Pipeline reviews and proposal days: the write-heavy end
+    "selling": {"leads_browse": 10, "leads_search": 10, "pipeline_move": 45, "proposal_create": 25,
+                "csv_export": 5, "dashboard": 5},
+}
+# Actions that change data; kept off a --url server without --allow-writes
+WRITE_ACTIONS = {"pipeline_move", "proposal_create"}
+READ_ONLY_PROFILES = [name for name, weights in PROFILES.items() if not WRITE_ACTIONS & weights.keys()]
+
+# Users log in at once, so some get a 429 while every bcrypt worker is busy
+LOGIN_ATTEMPTS = 20
+
+
+# ── Recording ─────────────────────────────────────────────────────────────────
+
+@dataclass
+class _Recorder:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def record(self, route: str, started: float, response: httpx.Response | None) -> None:
+        self.latencies[route].append((time.perf_counter() - started) * 1000)
+        if response is None or response.status_code >= 400:
+            self.errors[route] += 1
+
+    def summary(self, seconds: float) -> dict:
+        routes = {}
+        for route, timings in sorted(self.latencies.items()):
+            routes[route] = {
+                "requests": len(timings),
+                "errors": self.errors.get(route, 0),
+                "rps": round(len(timings) / seconds, 2),
+                "p50": round(statistics.median(timings), 2),
+                "p95": round(percentile(timings, 95), 2),
+                "p99": round(percentile(timings, 99), 2),
+                "max": round(max(timings), 2),
+            }
+        everything = [ms for timings in self.latencies.values() for ms in timings]
+        total = {
+            "requests": len(everything),
+            "errors": sum(self.errors.values()),
+            "rps": round(len(everything) / seconds, 2),
+        }
+        if everything:
+            total.update(p50=round(statistics.median(everything), 2),
+                         p95=round(percentile(everything, 95), 2),
+                         p99=round(percentile(everything, 99), 2))
+        return {"total": total, "routes": routes}
+
+
+# ── Virtual user ──────────────────────────────────────────────────────────────
+
+# The row that loads the next page when scrolled into view
+_NEXT_PAGE = re.compile(r'hx-get="([^"]+)" hx-trigger="revealed"')
+
+
+def _next_page(response: httpx.Response | None) -> str | None:
+    if response is None or response.status_code != 200:
+        return None
+    match = _NEXT_PAGE.search(response.text)
+    return html.unescape(match.group(1)) if match else None
+
+
+def _retry_after(response: httpx.Response) -> float:
+    try:
+        return max(float(response.headers.get("retry-after", 1)), 0.0)
+    except ValueError:  # an HTTP date; the app only sends seconds
+        return 1.0
+
+
+class _User:
+    """One logged-in browser session replaying actions."""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: _Recorder, rng: random.Random, contacts: int):
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.contacts = contacts
+
+    async def _request(self, route: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        started = time.perf_counter()
+        response = None
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            pass
+        self.recorder.record(route, started, response)
+        return response
+
+    async def login(self, email: str, password: str) -> None:
+        for _ in range(LOGIN_ATTEMPTS):
+            response = await self._request("POST /login", "POST", "/login",
+                                           data={"email": email, "password": password})
+            if response is None or response.status_code != 429:
+                break
+            # Wait as told, plus jitter so the retries don't arrive together again
+            await asyncio.sleep(_retry_after(response) + self.rng.uniform(0, 1))
+        if response is None or response.status_code != 303:
+            raise RuntimeError(f"login as {email} failed")
+
+    async def leads_browse(self):
+        response = await self._request("GET /leads", "GET", "/leads")
+        # Scroll down a page or two, as the infinite scroll does
+        for _ in range(self.rng.randint(0, 2)):
+            next_url = _next_page(response)
+            if not next_url:
+                break
+            response = await self._request("GET /leads (scroll)", "GET", next_url, headers={"HX-Request": "true"})
+
+    async def leads_search(self):
+        term = self.rng.choice(SEARCH_TERMS)
+        for end in range(1, len(term) + 1):
+            await self._request("GET /leads?q (keystroke)", "GET", "/leads",
+                                params={"q": term[:end]}, headers={"HX-Request": "true"})
+            await asyncio.sleep(self.rng.uniform(0.05, 0.2))
+
+    async def dashboard(self):
+        await self._request("GET /", "GET", "/")
+
+    async def pipeline_move(self):
+        await self._request("POST /pipeline/move", "POST", "/pipeline/move", data={
+            "contact_id": self.rng.randint(1, self.contacts),
+            "new_status": self.rng.choice(PIPELINE_STAGES),
+        })
+
+    async def scraper_status(self):
+        await self._request("GET /scraper/status", "GET", "/scraper/status", headers={"HX-Request": "true"})
+
+    async def proposal_create(self):
+        products = self.rng.sample(["CorrShield Base Coat", "CorrShield Top Coat", "Surface Assessment"],
+                                   self.rng.randint(1, 2))
+        await self._request("POST /proposals/create", "POST", "/proposals/create", data={
+            "contact_id": self.rng.randint(1, self.contacts),
+            "products": products,
+            "quantities": [str(self.rng.randint(1, 40)) for _ in products],
+        })
+
+    async def csv_export(self):
+        started = time.perf_counter()
+        response = None
+        try:
+            async with self.client.stream("GET", "/leads/export") as response:
+                async for _ in response.aiter_bytes():
+                    pass
+        except httpx.HTTPError:
+            response = None
+        self.recorder.record("GET /leads/export", started, response)
+
+
+async def _run_user(n: int, base_url: str, email: str, password: str, weights: dict[str, int],
+                    deadline: float, recorder: _Recorder, contacts: int, seed: int, think: float) -> None:
+    rng = random.Random(seed * 1000 + n)
+    actions, action_weights = zip(*weights.items())
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+        user = _User(client, recorder, rng, contacts)
+        await user.login(email, password)
+        while time.perf_counter() < deadline:
+            await getattr(user, rng.choices(actions, action_weights)[0])()
+            if think:
+                await asyncio.sleep(rng.expovariate(1 / think))
+
+
+async def drive(base_url: str, accounts: list[tuple[str, str]], profile: str, duration: float,
+                contacts: int, seed: int = 0, think: float = 0.0) -> dict:
+    """Run ``len(accounts)`` virtual users for ``duration`` seconds; returns the summary."""
+    recorder = _Recorder()
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        _run_user(n, base_url, email, password, PROFILES[profile], deadline, recorder, contacts, seed, think)
+        for n, (email, password) in enumerate(accounts)
+    ))
+    return recorder.summary(time.perf_counter() - started)
+
+
+# ── Local server ──────────────────────────────────────────────────────────────
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _create_users(database_url: str, users: int) -> list[tuple[str, str]]:
+    from auth import hash_password
+    from database.db import build_engine
+    from database.models import User
+    from sqlalchemy.orm import Session
+
+    engine = build_engine(database_url)
+    password_hash = hash_password(LOAD_PASSWORD)
+    try:
+        with Session(engine) as db:
+            db.add_all(User(email=LOAD_EMAIL.format(n=n), full_name=f"Load {n}", password_hash=password_hash)
+                       for n in range(users))
+            db.commit()
+    finally:
+        engine.dispose()
+    return [(LOAD_EMAIL.format(n=n), LOAD_PASSWORD) for n in range(users)]
+
+
+def _start_server(env: dict[str, str], port: int, workers: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=ROOT, env=env,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {server.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/login", timeout=1.0).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("uvicorn did not start within 60 seconds")
+
+
+def _stop_server(server: subprocess.Popen) -> None:
+    server.send_signal(signal.SIGINT)
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def run_local(scale: str, workers: int, users: int, profile: str, duration: float,
+              seed: int = 0, think: float = 0.0) -> dict:
+    working = ROOT / "build" / f"bench-{scale}.load.db"
+    database_url = f"sqlite:///{working}"
+    # Before anything imports the settings; the server inherits them
+    env = {**os.environ, "DATABASE_URL": database_url, "DEBUG": "false", "BCRYPT_ROUNDS": "4"}
+    os.environ.update(env)
+
+    pristine, rows = prepare(scale, SCALES[scale], seed)
+    for leftover in working.parent.glob(working.name + "*"):
+        leftover.unlink()
+    shutil.copyfile(pristine, working)
+    accounts = _create_users(database_url, users)
+
+    port = _free_port()
+    server = _start_server(env, port, workers)
+    try:
+        summary = asyncio.run(drive(f"http://127.0.0.1:{port}", accounts, profile, duration,
+                                    rows["contacts"], seed, think))
+    finally:
+        _stop_server(server)
+        for leftover in working.parent.glob(working.name + "*"):
+            leftover.unlink()
+    return {"target": "local", "scale": scale, "rows": rows, "workers": workers, **summary}
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description=__doc__.split("\n")[0])
+    parser.add_argument("--profile", choices=PROFILES, default="mixed", help="action mix (default: mixed)")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--think", type=float, default=0.0,
+                        help="mean pause between a user's actions in seconds (default: none)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    local = parser.add_argument_group("local server (default)")
+    local.add_argument("--scale", choices=SCALES, default="10k", help="generated dataset size")
+    local.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    remote = parser.add_argument_group("running server")
+    remote.add_argument("--url", help="base URL of a running server; skips the local one")
+    remote.add_argument("--email", help="account every virtual user logs in as")
+    remote.add_argument("--password")
+    remote.add_argument("--contacts", type=int, default=100, help="highest contact id to touch")
+    remote.add_argument("--allow-writes", action="store_true",
+                        help="let profiles that change data (pipeline moves, proposals) run against --url")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        if not (args.email and args.password):
+            parser.error("--url needs --email and --password")
+        if args.profile not in READ_ONLY_PROFILES and not args.allow_writes:
+            parser.error(f"profile {args.profile!r} changes data on {args.url}; use --profile "
+                         f"{' or '.join(READ_ONLY_PROFILES)}, or pass --allow-writes")
+        summary = asyncio.run(drive(args.url.rstrip("/"), [(args.email, args.password)] * args.users,
+                                    args.profile, args.duration, args.contacts, args.seed, args.think))
+        results = {"target": args.url, **summary}
+    else:
+        results = run_local(args.scale, args.workers, args.users, args.profile, args.duration,
+                            args.seed, args.think)
+
+    results = {
+        "benchmark": "load",
+        "profile": args.profile,
+        "users": args.users,
+        "duration": args.duration,
+        "think": args.think,
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        **results,
+    }
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,144 @@
+"""Cold-start benchmark for the serverless entry point.
+
+Each run is a fresh interpreter configured the way ``api/index.py`` configures
+Vercel. It imports the app, runs the lifespan and serves one request, timing
+each phase::
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --path /login --output startup.json
+
+Three scenarios are measured: a fresh database (what a new Vercel instance
+sees), a fresh database filled from a prebuilt image (``database.image``),
+and a database whose schema marker is already current. The request is
+driven straight through ASGI, so no test client imports are counted.
+Results are printed as JSON.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from database import image
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in the child interpreter; prints one JSON object of phase timings
+_CHILD = """
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+from app import app
+t1 = time.perf_counter()
+
+async def request(path):
+    sent = []
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        sent.append(message)
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+             "root_path": "", "headers": [(b"host", b"localhost")], "client": ("127.0.0.1", 0),
+             "server": ("localhost", 80)}
+    await app(scope, receive, send)
+    return sent[0]["status"]
+
+async def main():
+    async with app.router.lifespan_context(app):
+        t2 = time.perf_counter()
+        status = await request(sys.argv[1])
+        t3 = time.perf_counter()
+    print(json.dumps({"import_ms": (t1 - t0) * 1000, "startup_ms": (t2 - t1) * 1000,
+                      "first_response_ms": (t3 - t2) * 1000, "total_ms": (t3 - t0) * 1000,
+                      "status": status}))
+
+asyncio.run(main())
+"""
+
+PHASES = ("import_ms", "startup_ms", "first_response_ms", "total_ms", "process_ms")
+
+
+def _run_once(env: dict[str, str], path: str) -> dict:
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", _CHILD, path], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def _summarise(runs: list[dict]) -> dict:
+    summary = {
+        phase: {
+            "median": round(statistics.median(r[phase] for r in runs), 1),
+            "min": round(min(r[phase] for r in runs), 1),
+            "max": round(max(r[phase] for r in runs), 1),
+        }
+        for phase in PHASES
+    }
+    summary["statuses"] = sorted({r["status"] for r in runs})
+    return summary
+
+
+def run(runs: int = 5, path: str = "/login") -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "startup.db"
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{db_path}",
+            "DB_PROFILE": "ephemeral",
+            "DB_POOL_SIZE": "5",
+            "DEBUG": "false",
+            "SERVERLESS": "true",
+        }
+
+        def fresh_runs(env):
+            results = []
+            for _ in range(runs):
+                for leftover in Path(tmp).glob("startup.db*"):
+                    leftover.unlink()
+                results.append(_run_once(env, path))
+            return results
+
+        fresh = fresh_runs(env)
+        image_path = Path(tmp) / "image.db"
+        image.build_image(image_path)
+        from_image = fresh_runs({**env, "DB_IMAGE": str(image_path)})
+        # The last run left a migrated, seeded database behind
+        current = [_run_once(env, path) for _ in range(runs)]
+
+    return {
+        "benchmark": "startup",
+        "python": platform.python_version(),
+        "runs": runs,
+        "path": path,
+        "scenarios": {
+            "fresh_database": _summarise(fresh),
+            "from_image": _summarise(from_image),
+            "current_schema": _summarise(current),
+        },
+    }
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="interpreters per scenario")
+    parser.add_argument("--path", default="/login", help="page served as the first response")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.runs, args.path)
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
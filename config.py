@@ -6,6 +6,66 @@ class Settings(BaseSettings):
     database_url: str = "sqlite:///mastersales.db"
     secret_key: str = "change-me-to-a-random-string"
     debug: bool = True
+    # Set by the Vercel entry point: skip startup work a warm database doesn't need
+    serverless: bool = False
+
+    # Database engine profile: "disk" (persistent SQLite, e.g. the Render disk),
+    # "ephemeral" (throwaway SQLite such as Vercel's /tmp) or "default" (no tuning)
+    db_profile: str = "disk"
+    db_pragmas: dict[str, str | int] = {}  # per-pragma overrides on top of the profile
+    # Prebuilt seeded SQLite file (python -m database.image build) copied into
+    # place when the database file doesn't exist yet; "" disables
+    db_image: str = ""
+    # Worker threads for the routes that are still sync (auth, bulk actions,
+    # exports, scraper, proposals/PDF, nurture); the dashboard, leads, pipeline
+    # and scheduler pages are async and don't use it. 40 matches Starlette's
+    # default, and db_pool_size keeps pace so each worker can hold a connection.
+    threadpool_size: int = 40
+    db_pool_size: int = 40
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    # Postgres only: recycle connections older than this (seconds) and cancel
+    # statements running longer than db_statement_timeout_ms (0 = no limit)
+    db_pool_recycle: int = 1800
+    db_statement_timeout_ms: int = 30000
+
+    # Seconds a cached aggregate (dashboard counters etc.) may be served;
+    # local writes invalidate immediately, 0 disables caching
+    query_cache_ttl: float = 30.0
+    # Filter dropdown values change only on contact writes, which invalidate them
+    facet_cache_ttl: float = 600.0
+    # Logged-in users resolved by the auth middleware, per process. Local
+    # updates (password reset, deactivation) evict at once; the TTL bounds how
+    # long another worker's change can take to show
+    user_cache_size: int = 1024
+    user_cache_ttl: float = 60.0
+
+    # bcrypt cost factor; stored hashes at another cost are upgraded on login
+    bcrypt_rounds: int = 12
+    # Dedicated password-hashing threads, and how many more logins may queue
+    # for them before further attempts get a 429
+    hash_workers: int = 4
+    hash_queue_size: int = 16
+
+    # Opt-in SQL instrumentation: statement count, DB time and the slowest
+    # statements of each request as a Server-Timing header, plus a JSON log
+    # of statements slower than slow_query_ms
+    sql_profiling: bool = False
+    slow_query_ms: float = 200.0
+    sql_profile_top: int = 3
+    # /metrics is open to logged-in users; Prometheus sends "Authorization:
+    # Bearer <metrics_token>" ("" disables that). metrics_allow_localhost also
+    # opens it to 127.0.0.1/::1: never behind a reverse proxy on the same host
+    metrics_token: str = ""
+    metrics_allow_localhost: bool = False
+
+    # Rows per page on the leads and trash tables (more load on scroll)
+    leads_page_size: int = 50
+    # CSV export: rows fetched and flushed to the client per chunk
+    export_chunk_rows: int = 500
+    # Compiled-template cache, relative to the project root ("" disables);
+    # filled at build time by `python -m templating`
+    template_cache_dir: str = "jinja_cache"
 
     # Corrizon company details
     company_name: str = "Corrizon Australasia Pty Ltd"
@@ -52,6 +112,17 @@ class Settings(BaseSettings):
     scrape_delay_min: float = 2.0
     scrape_delay_max: float = 5.0
     scrape_max_results: int = 50
+    # Scrapers share one browser, with up to scrape_max_contexts contexts
+    # (one per running source). It is relaunched after browser_recycle_pages
+    # page loads; once the browsers together use more than browser_recycle_mb
+    # the largest is relaunched (0 disables either)
+    scrape_max_contexts: int = 8
+    browser_recycle_pages: int = 200
+    browser_recycle_mb: int = 2048
+    # Logged-in browser state (cookies, localStorage) is saved encrypted with
+    # secret_key and reused until this many seconds after the login it came
+    # from, then the scraper logs in afresh (0 = until the site rejects it)
+    scrape_session_max_age: int = 14 * 24 * 3600
 
     model_config = {"env_file": ".env"}
 
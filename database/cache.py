@@ -0,0 +1,100 @@
+"""Short-lived, table-tagged cache for expensive read queries.
+
+Each entry is tagged with the tables it reads. When a session commits writes
+to one of those tables, whether through the unit of work or a bulk
+``query.update()``/``delete()``, every entry with a matching tag is dropped.
+Entries also expire after ``ttl`` seconds, which bounds staleness for writes
+made by other worker processes.
+
+Only cache plain values (numbers, dicts, lists of strings), never ORM
+instances: those are bound to the session that loaded them.
+"""
+import threading
+import time
+from itertools import chain
+from typing import Callable, Iterable
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from config import settings
+
+
+class QueryCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, object, frozenset[str]]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: str, tables: Iterable[str], compute: Callable[[], object],
+                       ttl: float | None = None):
+        """Return the cached value for ``key``, computing and storing it if missing.
+
+        ``ttl`` overrides the cache-wide expiry for this entry.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+            generation = self._generation
+
+        value = compute()
+
+        with self._lock:
+            # Skip the store if a write landed while we were computing
+            if ttl > 0 and generation == self._generation:
+                self._entries[key] = (now + ttl, value, frozenset(tables))
+        return value
+
+    def invalidate(self, tables: Iterable[str]) -> None:
+        tables = set(tables)
+        with self._lock:
+            self._generation += 1
+            for key in [k for k, (_, _, tags) in self._entries.items() if tags & tables]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+query_cache = QueryCache(ttl=settings.query_cache_ttl)
+
+
+# ── Invalidation hooks ────────────────────────────────────────────────────────
+# Written tables are collected per session and only invalidated after commit,
+# so a concurrent reader can't re-cache the pre-commit state.
+
+def _written_tables(session: Session) -> set[str]:
+    return session.info.setdefault("written_tables", set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed(session, _flush_context):
+    tables = _written_tables(session)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        tables.add(inspect(obj).mapper.local_table.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            _written_tables(orm_execute_state.session).add(mapper.local_table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    tables = session.info.pop("written_tables", None)
+    if tables:
+        query_cache.invalidate(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("written_tables", None)
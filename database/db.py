@@ -1,5 +1,8 @@
-from sqlalchemy import create_engine, inspect, text
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from config import settings
 
@@ -8,10 +11,141 @@ class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(settings.database_url, echo=False)
+# ── Engine profiles ───────────────────────────────────────────────────────────
+# PRAGMAs applied to every new SQLite connection. "disk" keeps readers off the
+# writer's lock with WAL; "ephemeral" trades durability for speed because the
+# file is thrown away with the instance anyway.
+
+SQLITE_PROFILES: dict[str, dict[str, str | int]] = {
+    "default": {},
+    "disk": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,        # ~64 MB page cache (negative = KiB)
+        "mmap_size": 268435456,      # 256 MB
+        "busy_timeout": 5000,        # ms to wait on a locked database
+        "temp_store": "MEMORY",
+    },
+    "ephemeral": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -16000,
+        "mmap_size": 67108864,       # 64 MB
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def sqlite_pragmas(profile: str, overrides: dict | None = None) -> dict[str, str | int]:
+    """Resolve the PRAGMAs for a profile name, with per-key overrides applied."""
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown database profile: {profile!r}")
+    return {**SQLITE_PROFILES[profile], **(overrides or {})}
+
+
+def normalize_url(database_url: str):
+    """Parse ``database_url``, accepting the ``postgres://`` scheme Render and
+    Heroku hand out (SQLAlchemy only knows ``postgresql://``)."""
+    if database_url.startswith("postgres://"):
+        database_url = "postgresql://" + database_url[len("postgres://"):]
+    return make_url(database_url)
+
+
+def _is_file_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def _postgres_connect_args(url) -> dict:
+    """Per-connection statement timeout, in each driver's own dialect."""
+    timeout = settings.db_statement_timeout_ms
+    if not timeout:
+        return {}
+    if url.get_driver_name() == "asyncpg":
+        return {"server_settings": {"statement_timeout": str(timeout)}}
+    return {"options": f"-c statement_timeout={timeout}"}
+
+
+def _engine_kwargs(url) -> dict:
+    kwargs: dict = {"echo": False}
+    pooled = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+    }
+    if _is_file_sqlite(url):
+        kwargs.update(pooled, connect_args={"check_same_thread": False})
+    elif url.get_backend_name() == "postgresql":
+        kwargs.update(
+            pooled,
+            # Drop connections the server (or a proxy) closed while idle
+            pool_pre_ping=True,
+            pool_recycle=settings.db_pool_recycle,
+            connect_args=_postgres_connect_args(url),
+        )
+    return kwargs
+
+
+def _install_pragmas(sync_engine, url, profile: str, pragmas: dict | None) -> None:
+    if url.get_backend_name() != "sqlite":
+        return
+    resolved = sqlite_pragmas(profile, pragmas)
+
+    @event.listens_for(sync_engine, "connect")
+    def _apply_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        for name, value in resolved.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def build_engine(database_url: str, profile: str = "default", pragmas: dict | None = None):
+    """Create an engine configured for the given profile.
+
+    SQLite connections get the profile's PRAGMAs on connect. File SQLite and
+    Postgres get a QueuePool sized to the request threadpool; Postgres also
+    pre-pings, recycles and sets a statement timeout on each connection.
+    """
+    url = normalize_url(database_url)
+    new_engine = create_engine(url, **_engine_kwargs(url))
+    _install_pragmas(new_engine, url, profile, pragmas)
+    return new_engine
+
+
+# Async drivers for each sync backend: aiosqlite for SQLite, asyncpg for Postgres
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_url(database_url: str):
+    """The same database as ``database_url``, addressed through its async driver."""
+    url = normalize_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} databases")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def build_async_engine(database_url: str, profile: str = "default", pragmas: dict | None = None):
+    """Async counterpart of ``build_engine``: same pool sizing and PRAGMAs."""
+    url = async_url(database_url)
+    kwargs = _engine_kwargs(url)
+    if _is_file_sqlite(url):
+        kwargs["poolclass"] = AsyncAdaptedQueuePool  # aiosqlite defaults to NullPool
+    new_engine = create_async_engine(url, **kwargs)
+    _install_pragmas(new_engine.sync_engine, url, profile, pragmas)
+    return new_engine
+
+
+engine = build_engine(settings.database_url, settings.db_profile, settings.db_pragmas)
 SessionLocal = sessionmaker(bind=engine)
 
 
+# Async routes use the async engine; scripts, migrations and the remaining
+# sync routes keep the sync one. Both point at the same database.
+async_engine = build_async_engine(settings.database_url, settings.db_profile, settings.db_pragmas)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -20,36 +154,27 @@ def get_db():
         db.close()
 
 
-def init_db():
-    Base.metadata.create_all(bind=engine)
-    _run_migrations()
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
 
 
-def _run_migrations():
-    """Add columns that don't exist yet (lightweight migration for SQLite)."""
-    inspector = inspect(engine)
-    if "contacts" in inspector.get_table_names():
-        columns = {c["name"] for c in inspector.get_columns("contacts")}
-        if "deleted_at" not in columns:
-            with engine.begin() as conn:
-                conn.execute(text("ALTER TABLE contacts ADD COLUMN deleted_at DATETIME"))
+def init_db() -> bool:
+    """Create tables and apply pending migrations.
 
-        # New fields for multi-source scraper
-        if "source_url" not in columns:
-            with engine.begin() as conn:
-                conn.execute(text("ALTER TABLE contacts ADD COLUMN source_url VARCHAR(500)"))
+    Once ``schema_migrations`` records the latest version this is a single
+    SELECT, so cold starts skip ``create_all`` and schema inspection.
+    Returns True if the schema was created or upgraded. A missing SQLite
+    file is first filled from the ``db_image`` image, if one is configured.
+    """
+    from database import migrations
 
-        indexes = inspector.get_indexes("contacts")
-        has_linkedin_unique = any(
-            idx.get("unique") and "linkedin_url" in idx.get("column_names", [])
-            for idx in indexes
-        )
-        if has_linkedin_unique:
-            with engine.begin() as conn:
-                conn.execute(text("DROP INDEX IF EXISTS ix_contacts_linkedin_url"))
-
-    if "companies" in inspector.get_table_names():
-        columns = {c["name"] for c in inspector.get_columns("companies")}
-        if "company_domain" not in columns:
-            with engine.begin() as conn:
-                conn.execute(text("ALTER TABLE companies ADD COLUMN company_domain VARCHAR(255)"))
+    if settings.db_image and _is_file_sqlite(engine.url):
+        from database import image
+        image.install(settings.db_image, engine.url.database)
+    if migrations.is_current(engine):
+        return False
+    with migrations.lock(engine):
+        Base.metadata.create_all(bind=engine)
+        migrations.upgrade(engine)
+    return True
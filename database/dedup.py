@@ -0,0 +1,63 @@
+"""Normalised keys used to detect duplicate contacts and companies.
+
+The same functions produce the keys stored on ``contacts``/``companies``
+(each behind a unique index) and the keys ``scraper.search_engine`` merges
+cross-source results on, so "already in the CRM" and "same person from two
+scrapers" agree.
+
+- ``company_key("Acme Coatings Pty. Ltd.") == "acme coatings"``
+- ``contact_key("Mary-Jane", "O'Neil", "ACME Limited") == "mary jane|o neil|acme"``
+- ``linkedin_key("https://au.linkedin.com/in/jdoe/?trk=x") == "linkedin.com/in/jdoe"``
+"""
+import re
+import unicodedata
+from urllib.parse import unquote, urlsplit
+
+# Trailing legal-entity words, matched after punctuation is stripped. Longest
+# forms first so "pty ltd" goes before "ltd" gets a chance.
+_LEGAL_SUFFIXES = (
+    "proprietary limited", "pty limited", "pty ltd", "pty",
+    "limited", "ltd", "incorporated", "inc", "corporation", "corp",
+    "llc", "plc", "gmbh", "co",
+)
+_SUFFIX_RE = re.compile(r"(?:\s+(?:" + "|".join(re.escape(s) for s in _LEGAL_SUFFIXES) + r"))+$")
+
+
+def normalize_text(value: str | None) -> str:
+    """Casefold, strip accents, turn punctuation into spaces and collapse runs."""
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFKD", value)
+    value = "".join(ch for ch in value if not unicodedata.combining(ch))
+    value = re.sub(r"[\W_]+", " ", value.casefold())
+    return value.strip()
+
+
+def company_key(name: str | None) -> str | None:
+    """Company name without case, punctuation or legal suffixes; None if blank."""
+    key = _SUFFIX_RE.sub("", f" {normalize_text(name)}").strip()
+    return key or None
+
+
+def contact_key(first_name: str | None, last_name: str | None, company_name: str | None) -> str | None:
+    """``first|last|company`` key, or None unless all three parts are present."""
+    parts = (normalize_text(first_name), normalize_text(last_name), company_key(company_name))
+    if not all(parts):
+        return None
+    return "|".join(parts)
+
+
+def linkedin_key(url: str | None) -> str | None:
+    """Profile URL reduced to host + path: no scheme, www/country subdomain,
+    query string, fragment or trailing slash. None if blank."""
+    if not url or not url.strip():
+        return None
+    url = url.strip()
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    host = (parts.hostname or "").lower()
+    if host.endswith("linkedin.com"):
+        host = "linkedin.com"
+    elif host.startswith("www."):
+        host = host[4:]
+    path = unquote(parts.path).rstrip("/").lower()
+    return f"{host}{path}" or None
@@ -0,0 +1,38 @@
+"""Distinct values with counts for the /leads filter dropdowns.
+
+Each facet is one ``GROUP BY`` over active contacts, answered from a partial
+index on the column. Results are cached until a committed write to
+``contacts`` invalidates them (or ``facet_cache_ttl`` expires).
+"""
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from config import settings
+from database.cache import query_cache
+from database.models import Contact
+
+LEAD_FACETS = {
+    "states": Contact.location_state,
+    "sources": Contact.lead_source,
+    "countries": Contact.location_country,
+}
+
+
+def _facet_counts(db: Session, column) -> list[tuple[str, int]]:
+    rows = (
+        db.query(column, func.count())
+        .filter(Contact.deleted_at.is_(None), column.isnot(None), column != "")
+        .group_by(column)
+        .order_by(column)
+        .all()
+    )
+    return [(value, count) for value, count in rows]
+
+
+def get_lead_facets(db: Session) -> dict[str, list[tuple[str, int]]]:
+    """Return {facet_name: [(value, count), ...]} sorted by value."""
+    return query_cache.get_or_compute(
+        "lead_facets", ("contacts",),
+        lambda: {name: _facet_counts(db, column) for name, column in LEAD_FACETS.items()},
+        ttl=settings.facet_cache_ttl,
+    )
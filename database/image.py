@@ -0,0 +1,132 @@
+"""Prebuilt, seeded SQLite image for ephemeral deployments.
+
+A fresh Vercel instance starts with an empty ``/tmp``, so without help every
+cold start creates the schema, runs the migrations and seeds the demo data
+through the ORM. Instead the deployment can bundle a migrated, seeded,
+VACUUMed database file built ahead of time::
+
+    python -m database.image build          # (re)build if missing or stale
+    python -m database.image build --force
+    python -m database.image check          # exit 1 if missing or stale
+
+When ``DB_IMAGE`` points at the file, ``init_db`` copies it into place with a
+single file copy, but only if the target database doesn't exist yet. The image
+stores a fingerprint of the latest migration and the seed data in
+``PRAGMA user_version``. At runtime a stale image is ignored and the database
+is built the slow way; the next ``build`` replaces it.
+"""
+import argparse
+import hashlib
+import logging
+import os
+import shutil
+import sqlite3
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import migrations
+from database.db import Base, build_engine
+
+logger = logging.getLogger("mastersales.image")
+
+_SEED_SOURCE = Path(__file__).with_name("seed.py")
+
+
+def expected_version() -> int:
+    """Fingerprint of the schema version and seed data, as a positive int32."""
+    digest = hashlib.blake2b(digest_size=4)
+    digest.update(str(migrations.latest_version()).encode())
+    digest.update(_SEED_SOURCE.read_bytes())
+    return int.from_bytes(digest.digest(), "big") & 0x7FFFFFFF
+
+
+def image_version(path: str | Path) -> int | None:
+    """The fingerprint recorded in the image, or None if it is missing or unreadable."""
+    if not Path(path).is_file():
+        return None
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+
+
+def is_current(path: str | Path) -> bool:
+    return image_version(path) == expected_version()
+
+
+def build_image(path: str | Path) -> Path:
+    """Build a migrated, seeded, VACUUMed image at ``path`` (replacing any old one)."""
+    from database.seed import seed_demo_data
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    building = path.with_name(path.name + ".building")
+    building.unlink(missing_ok=True)
+
+    engine = build_engine(f"sqlite:///{building}")
+    try:
+        Base.metadata.create_all(engine)
+        migrations.upgrade(engine)
+        with Session(engine) as db:
+            seed_demo_data(db)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            # Rollback journal, so the image is one self-contained file
+            conn.execute(text("PRAGMA journal_mode=DELETE"))
+            conn.execute(text(f"PRAGMA user_version={expected_version()}"))
+            conn.execute(text("VACUUM"))
+    finally:
+        engine.dispose()
+    os.replace(building, path)
+    return path
+
+
+def install(image: str | Path, target: str | Path) -> bool:
+    """Copy a current ``image`` to ``target`` unless ``target`` already exists.
+
+    Returns True if the image was installed.
+    """
+    target = Path(target)
+    if target.exists():
+        return False
+    if not is_current(image):
+        logger.warning("Database image %s is missing or stale; building the database from scratch", image)
+        return False
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Copy beside the target and rename, so a concurrent opener never sees half a file
+    partial = target.with_name(target.name + ".partial")
+    shutil.copyfile(image, partial)
+    os.replace(partial, target)
+    logger.info("Installed database image %s at %s", image, target)
+    return True
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m database.image", description=__doc__.split("\n")[0])
+    parser.add_argument("command", choices=["build", "check"])
+    parser.add_argument("--path", default=settings.db_image or "build/mastersales.db",
+                        help="image file (default: DB_IMAGE, else build/mastersales.db)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the image is current")
+    args = parser.parse_args(argv)
+
+    current = is_current(args.path)
+    if args.command == "check":
+        print(f"{args.path}: {'current' if current else 'missing or stale'}")
+        return 0 if current else 1
+    if current and not args.force:
+        print(f"{args.path} is current; nothing to do.")
+        return 0
+    build_image(args.path)
+    print(f"Built {args.path} ({Path(args.path).stat().st_size // 1024} KiB).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,130 @@
+"""Set-based import of scraper results into the CRM.
+
+``add_scraped_contacts`` handles a whole batch in a fixed number of
+statements: one ``IN`` lookup each on the indexed dedup keys (LinkedIn URL,
+contact, company; see ``database.dedup``), then one bulk ``INSERT`` for new
+companies and one for new contacts. Nothing is committed; the caller owns the
+transaction.
+
+The inserts are ``ON CONFLICT DO NOTHING``: a row another request inserted
+between the lookup and the insert hits the unique dedup indexes and is
+reported as a duplicate instead of failing the whole batch.
+"""
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from database import dedup
+from database.models import Company, Contact
+
+# Values per IN (...) so lookups stay under SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
+
+
+def _chunks(values: list, size: int = LOOKUP_CHUNK):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _existing(db: Session, key_column, keys: set[str]) -> set[str]:
+    found = set()
+    for chunk in _chunks(sorted(keys)):
+        found.update(db.scalars(select(key_column).where(key_column.in_(chunk))))
+    return found
+
+
+def _company_ids(db: Session, keys: set[str]) -> dict[str, int]:
+    ids: dict[str, int] = {}
+    for chunk in _chunks(sorted(keys)):
+        rows = db.execute(select(Company.company_key, Company.id).where(Company.company_key.in_(chunk)))
+        ids.update({key: company_id for key, company_id in rows})
+    return ids
+
+
+def _insert_or_skip(db: Session, model):
+    """``INSERT ... ON CONFLICT DO NOTHING`` for ``model`` on this session's database."""
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(model).on_conflict_do_nothing()
+
+
+def add_scraped_contacts(db: Session, results: list[dict]) -> list[str]:
+    """Insert scraper results as new leads, skipping ones already in the CRM.
+
+    A result is a duplicate if a contact with the same normalised LinkedIn URL
+    or the same normalised name + company already exists; repeats within the
+    batch count too. Companies are matched on their normalised name.
+    Returns 'added' or 'duplicate' for each result, in order.
+    """
+    keyed = [
+        (r, dedup.linkedin_key(r.get("linkedin_url")),
+         dedup.contact_key(r.get("first_name"), r.get("last_name"), r.get("company_name")),
+         dedup.company_key(r.get("company_name")))
+        for r in results
+    ]
+    url_keys = {k for _, k, _, _ in keyed if k}
+    contact_keys = {k for _, _, k, _ in keyed if k}
+    company_keys = {k for _, _, _, k in keyed if k}
+
+    seen_urls = _existing(db, Contact.linkedin_key, url_keys) if url_keys else set()
+    seen_contacts = _existing(db, Contact.contact_key, contact_keys) if contact_keys else set()
+    company_ids = _company_ids(db, company_keys) if company_keys else {}
+
+    statuses = []
+    new_contacts = []
+    new_companies: dict[str, dict] = {}
+    for result, url_key, contact_key, company_key in keyed:
+        if (url_key and url_key in seen_urls) or (contact_key and contact_key in seen_contacts):
+            statuses.append("duplicate")
+            continue
+        if url_key:
+            seen_urls.add(url_key)
+        if contact_key:
+            seen_contacts.add(contact_key)
+
+        if company_key and company_key not in company_ids and company_key not in new_companies:
+            new_companies[company_key] = {
+                "company_name": result["company_name"],
+                "company_key": company_key,
+                "company_domain": result.get("company_domain"),
+                "company_industry": result.get("company_industry", ""),
+                "company_location": result.get("company_location", ""),
+            }
+        new_contacts.append((result, url_key, contact_key, company_key))
+        statuses.append("added")
+
+    if new_companies:
+        rows = db.execute(
+            _insert_or_skip(db, Company).returning(Company.company_key, Company.id),
+            list(new_companies.values()),
+        )
+        company_ids.update({key: company_id for key, company_id in rows})
+        raced = new_companies.keys() - company_ids.keys()
+        if raced:  # inserted elsewhere since the lookup: use that row
+            company_ids.update(_company_ids(db, raced))
+
+    if new_contacts:
+        rows = db.execute(_insert_or_skip(db, Contact).returning(Contact.linkedin_key, Contact.contact_key), [
+            {
+                "first_name": r.get("first_name", ""),
+                "last_name": r.get("last_name", ""),
+                "job_title": r.get("job_title", ""),
+                "linkedin_url": r.get("linkedin_url"),
+                "location_city": r.get("location_city", ""),
+                "location_state": r.get("location_state", ""),
+                "location_country": r.get("location_country", "AU"),
+                "lead_status": "New",
+                "lead_source": r.get("source_name", "Unknown"),
+                "source_url": r.get("source_url"),
+                "company_id": company_ids.get(company_key),
+                "contact_key": contact_key,
+                "linkedin_key": url_key,
+            }
+            for r, url_key, contact_key, company_key in new_contacts
+        ])
+        inserted = set(rows)
+        added = [i for i, status in enumerate(statuses) if status == "added"]
+        for i, (_, url_key, contact_key, _) in zip(added, new_contacts):
+            # Skipped on conflict: inserted elsewhere since the lookup
+            if (url_key or contact_key) and (url_key, contact_key) not in inserted:
+                statuses[i] = "duplicate"
+    return statuses
@@ -0,0 +1,91 @@
+"""Eager-loading policy for the list views.
+
+Every list template dereferences relationships inside a loop
+(``contact.company.company_name``, ``meeting.contact.company``, ...). Left
+to lazy loading, each row costs one extra ``SELECT``. The helpers here attach
+the loader options each view needs so a page renders in a fixed number of
+statements however many rows it shows:
+
+- many-to-one hops (contact -> company, meeting -> contact) use
+  ``joinedload``, or ``contains_eager`` when the query already joins the
+  table for filtering;
+- collections would use ``selectinload`` (one extra query per relationship).
+
+``statement_budget`` is the test-mode guard: it fails if the code under it
+issues more statements than allowed.
+"""
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.orm import contains_eager, joinedload
+
+from database.models import Contact, Meeting, NurtureEnrollment, Proposal
+
+
+# ── Per-view loader options ───────────────────────────────────────────────────
+
+def lead_rows(query):
+    """/leads and /leads/trash: the query already outer-joins companies."""
+    return query.options(contains_eager(Contact.company))
+
+
+def contact_cards(query):
+    """Contacts shown with their company: pipeline cards, dashboard, pickers."""
+    return query.options(joinedload(Contact.company))
+
+
+def meeting_rows(query):
+    """/scheduler: meeting -> contact -> company."""
+    return query.options(joinedload(Meeting.contact).joinedload(Contact.company))
+
+
+def proposal_rows(query):
+    """/proposals: proposal -> contact -> company."""
+    return query.options(joinedload(Proposal.contact).joinedload(Contact.company))
+
+
+def enrollment_rows(query):
+    """/nurture: enrollment -> contact and enrollment -> sequence."""
+    return query.options(
+        joinedload(NurtureEnrollment.contact),
+        joinedload(NurtureEnrollment.sequence),
+    )
+
+
+# ── Statement budget (test mode) ──────────────────────────────────────────────
+
+class StatementBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def count_statements(*engines):
+    """Collect the SQL of every statement executed on ``engines`` in the block.
+
+    Accepts ``AsyncEngine``s too (their underlying sync engine is watched).
+    """
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    watched = [getattr(engine, "sync_engine", engine) for engine in engines]
+    for engine in watched:
+        event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        for engine in watched:
+            event.remove(engine, "before_cursor_execute", _record)
+
+
+@contextmanager
+def statement_budget(*engines, limit: int):
+    """Fail with StatementBudgetExceeded if the block runs more than ``limit`` statements."""
+    with count_statements(*engines) as statements:
+        yield statements
+    if len(statements) > limit:
+        listing = "\n".join(f"  {i + 1}. {s.strip()[:160]}" for i, s in enumerate(statements))
+        raise StatementBudgetExceeded(
+            f"{len(statements)} SQL statements issued, budget is {limit}:\n{listing}"
+        )
@@ -0,0 +1,260 @@
+"""Versioned schema migrations.
+
+Each migration is a function registered with ``@migration(version, description)``
+that receives an open connection inside a transaction. Applied versions are
+recorded in ``schema_migrations``; once the recorded version matches the latest
+registered one, startup skips schema inspection entirely.
+
+Migrations must be idempotent: a fresh database is built by ``create_all`` and
+then runs every migration, most of which find nothing to do. They run on both
+SQLite and Postgres, so schema changes go through the helpers below (which
+compile column types and index options for the connected dialect) rather than
+hand-written DDL.
+"""
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy import Column, DateTime, Integer, String, Table, exc, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from database.db import Base
+from database.models import SEARCH_COLUMNS  # also registers tables on Base.metadata
+
+logger = logging.getLogger("mastersales.migrations")
+
+schema_migrations = Table(
+    "schema_migrations",
+    Base.metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255)),
+    Column("applied_at", DateTime, default=datetime.utcnow),
+)
+
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = []
+
+
+def migration(version: int, description: str):
+    """Register a migration function under a version number."""
+    def decorator(fn: Callable[[Connection], None]):
+        MIGRATIONS.append((version, description, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return decorator
+
+
+def latest_version() -> int:
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def current_version(conn: Connection) -> int:
+    """Highest applied version, or 0 if the database has never been migrated."""
+    try:
+        return conn.execute(select(func.max(schema_migrations.c.version))).scalar() or 0
+    except exc.DBAPIError:
+        conn.rollback()
+        return 0
+
+
+def is_current(engine: Engine) -> bool:
+    with engine.connect() as conn:
+        return current_version(conn) >= latest_version()
+
+
+# Arbitrary constant identifying the migration advisory lock on Postgres
+_PG_LOCK_KEY = 7_214_031
+
+
+@contextmanager
+def lock(engine: Engine):
+    """Serialise schema setup across processes.
+
+    SQLite has a single writer, so there is nothing to do. On Postgres several
+    workers may boot at once; a session-level advisory lock makes all but one
+    wait, after which they find the schema current.
+    """
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _PG_LOCK_KEY})
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _PG_LOCK_KEY})
+            conn.commit()
+
+
+def upgrade(engine: Engine) -> list[int]:
+    """Apply pending migrations in order, each in its own transaction.
+
+    Returns the list of versions applied.
+    """
+    with engine.connect() as conn:
+        version = current_version(conn)
+
+    applied = []
+    for number, description, fn in MIGRATIONS:
+        if number <= version:
+            continue
+        with engine.begin() as conn:
+            fn(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=number, description=description, applied_at=datetime.utcnow()))
+        logger.info("Applied migration %d: %s", number, description)
+        applied.append(number)
+    return applied
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _columns(conn: Connection, table: str) -> set[str]:
+    inspector = inspect(conn)
+    if not inspector.has_table(table):
+        return set()
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def _add_column(conn: Connection, table: str, column: str) -> None:
+    """Add a column as declared on the model, if the table lacks it."""
+    existing = _columns(conn, table)
+    if not existing or column in existing:
+        return
+    col_type = Base.metadata.tables[table].c[column].type.compile(dialect=conn.dialect)
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}"))
+
+
+def _create_indexes(conn: Connection, *names: str) -> None:
+    """Create the named indexes declared on the models, skipping existing ones."""
+    wanted = set(names)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name in wanted:
+                index.create(conn, checkfirst=True)
+                wanted.discard(index.name)
+    if wanted:
+        raise LookupError(f"Indexes not declared on any model: {sorted(wanted)}")
+
+
+# ── Migrations ────────────────────────────────────────────────────────────────
+
+@migration(1, "Soft delete, multi-source scraper columns, non-unique linkedin_url")
+def _legacy_columns(conn: Connection) -> None:
+    _add_column(conn, "contacts", "deleted_at")
+    _add_column(conn, "contacts", "source_url")
+
+    if _columns(conn, "contacts"):
+        has_linkedin_unique = any(
+            idx.get("unique") and "linkedin_url" in idx.get("column_names", [])
+            for idx in inspect(conn).get_indexes("contacts")
+        )
+        if has_linkedin_unique:
+            conn.execute(text("DROP INDEX IF EXISTS ix_contacts_linkedin_url"))
+
+    _add_column(conn, "companies", "company_domain")
+
+
+@migration(2, "Partial and composite indexes for list, pipeline and scheduler queries")
+def _hot_query_indexes(conn: Connection) -> None:
+    _create_indexes(
+        conn,
+        "ix_contacts_active_status_updated",
+        "ix_contacts_active_created",
+        "ix_contacts_trashed",
+        "ix_contacts_company_id",
+        "ix_meetings_status_time",
+        "ix_meetings_meeting_time",
+        "ix_meetings_contact_id",
+        "ix_nurture_enrollments_contact_id",
+        "ix_proposals_contact_id",
+        "ix_proposals_created_at",
+    )
+
+
+@migration(3, "FTS5 full-text index over contacts for /leads search")
+def _contacts_fts(conn: Connection) -> None:
+    from database import search
+
+    if conn.dialect.name != "sqlite":
+        return  # Postgres searches through trigram indexes (migration 7)
+    if not search.fts5_supported(conn):
+        logger.warning("SQLite FTS5 unavailable; /leads search falls back to LIKE")
+        return
+    search.create_index(conn)
+    search.rebuild_index(conn)
+
+
+@migration(4, "Covering index for per-stage count and deal value")
+def _stage_totals_index(conn: Connection) -> None:
+    _create_indexes(conn, "ix_contacts_active_status_value")
+
+
+@migration(5, "Partial indexes for the /leads filter facets")
+def _facet_indexes(conn: Connection) -> None:
+    _create_indexes(conn, "ix_contacts_active_state", "ix_contacts_active_source", "ix_contacts_active_country")
+
+
+@migration(6, "Normalised dedup keys with unique indexes on contacts and companies")
+def _dedup_keys(conn: Connection) -> None:
+    from database import dedup
+
+    _add_column(conn, "companies", "company_key")
+    _add_column(conn, "contacts", "contact_key")
+    _add_column(conn, "contacts", "linkedin_key")
+
+    # Backfill oldest first. A later row whose key is already taken keeps a
+    # NULL key, so the unique indexes can be built over existing duplicates.
+    companies, contacts, urls = set(), set(), set()
+
+    def claim(seen: set, key: str | None) -> str | None:
+        if key is None or key in seen:
+            return None
+        seen.add(key)
+        return key
+
+    company_rows = [
+        {"id": company_id, "key": claim(companies, dedup.company_key(name))}
+        for company_id, name in conn.execute(text("SELECT id, company_name FROM companies ORDER BY id"))
+    ]
+    if company_rows:
+        conn.execute(text("UPDATE companies SET company_key = :key WHERE id = :id"), company_rows)
+
+    contact_rows = [
+        {
+            "id": contact_id,
+            "ckey": claim(contacts, dedup.contact_key(first, last, company)),
+            "lkey": claim(urls, dedup.linkedin_key(url)),
+        }
+        for contact_id, first, last, url, company in conn.execute(text(
+            "SELECT c.id, c.first_name, c.last_name, c.linkedin_url, co.company_name "
+            "FROM contacts c LEFT JOIN companies co ON co.id = c.company_id ORDER BY c.id"
+        ))
+    ]
+    if contact_rows:
+        conn.execute(
+            text("UPDATE contacts SET contact_key = :ckey, linkedin_key = :lkey WHERE id = :id"), contact_rows)
+
+    _create_indexes(conn, "ix_companies_company_key", "ix_contacts_contact_key", "ix_contacts_linkedin_key")
+
+
+@migration(7, "Postgres trigram indexes for /leads search")
+def _trigram_indexes(conn: Connection) -> None:
+    if conn.dialect.name != "postgresql":
+        return  # declared Postgres-only; SQLite uses the FTS5 index
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    _create_indexes(conn, "ix_companies_company_name_trgm", *(f"ix_contacts_{c}_trgm" for c in SEARCH_COLUMNS))
+
+
+@migration(8, "Row version stamps on meetings, enrollments and proposals")
+def _row_version_stamps(conn: Connection) -> None:
+    # Backfilled from the closest existing stamp; they feed the ETags of
+    # /leads/{id} and the proposal previews (see http_cache)
+    backfill = {"meetings": "created_at", "nurture_enrollments": "enrolled_at",
+                "proposals": "coalesce(sent_at, created_at)"}
+    for table, source in backfill.items():
+        if not _columns(conn, table):
+            continue
+        _add_column(conn, table, "updated_at")
+        conn.execute(text(f"UPDATE {table} SET updated_at = {source} WHERE updated_at IS NULL"))
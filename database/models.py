@@ -1,9 +1,10 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import ForeignKey, JSON, String, Text, Integer, Float, DateTime
+from sqlalchemy import ForeignKey, Index, JSON, String, Text, Integer, Float, DateTime, event, inspect, select, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from database import dedup
 from database.db import Base
 
 
@@ -27,8 +28,34 @@ class AppSetting(Base):
     value: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
 
+# Columns the /leads search falls back to matching with ILIKE when there is no
+# FTS5 index (always the case on Postgres); each gets a trigram index there.
+SEARCH_COLUMNS = ("first_name", "last_name", "job_title", "email_work", "lead_source")
+
+
+def _trigram(table: str, column: str) -> Index:
+    """Postgres GIN trigram index serving ILIKE '%term%' search on ``column``.
+
+    Skipped on SQLite, where search goes through the FTS5 index instead.
+    """
+    return Index(
+        f"ix_{table}_{column}_trgm", column,
+        postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
+
+
+@event.listens_for(Base.metadata, "before_create")
+def _create_pg_trgm(metadata, connection, **kw):
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
 class Company(Base):
     __tablename__ = "companies"
+    __table_args__ = (
+        Index("ix_companies_company_key", "company_key", unique=True),
+        _trigram("companies", "company_name"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     company_name: Mapped[str] = mapped_column(String(255))
@@ -42,6 +69,8 @@ class Company(Base):
     company_location: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     company_keywords: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     company_domain: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    # dedup.company_key(company_name), maintained by the listeners below
+    company_key: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     abn: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -49,8 +78,37 @@ class Company(Base):
     contacts: Mapped[list["Contact"]] = relationship(back_populates="company")
 
 
+# Partial-index predicate shared by the "active contacts" indexes; must match
+# the filter in app._active_contacts() for the planner to pick them up.
+_ACTIVE = text("deleted_at IS NULL")
+_TRASHED = text("deleted_at IS NOT NULL")
+
+
 class Contact(Base):
     __tablename__ = "contacts"
+    __table_args__ = (
+        Index("ix_contacts_active_status_updated", "lead_status", "updated_at",
+              sqlite_where=_ACTIVE, postgresql_where=_ACTIVE),
+        Index("ix_contacts_active_created", "created_at",
+              sqlite_where=_ACTIVE, postgresql_where=_ACTIVE),
+        # Covers the dashboard/pipeline GROUP BY lead_status with SUM(deal_value)
+        Index("ix_contacts_active_status_value", "lead_status", "deal_value",
+              sqlite_where=_ACTIVE, postgresql_where=_ACTIVE),
+        # Filter dropdown facets (GROUP BY over active contacts)
+        Index("ix_contacts_active_state", "location_state",
+              sqlite_where=_ACTIVE, postgresql_where=_ACTIVE),
+        Index("ix_contacts_active_source", "lead_source",
+              sqlite_where=_ACTIVE, postgresql_where=_ACTIVE),
+        Index("ix_contacts_active_country", "location_country",
+              sqlite_where=_ACTIVE, postgresql_where=_ACTIVE),
+        Index("ix_contacts_trashed", "deleted_at",
+              sqlite_where=_TRASHED, postgresql_where=_TRASHED),
+        Index("ix_contacts_company_id", "company_id"),
+        # Duplicate detection: point lookups, and the database rejects repeats
+        Index("ix_contacts_contact_key", "contact_key", unique=True),
+        Index("ix_contacts_linkedin_key", "linkedin_key", unique=True),
+        *(_trigram("contacts", c) for c in SEARCH_COLUMNS),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     first_name: Mapped[str] = mapped_column(String(100))
@@ -79,6 +137,9 @@ class Contact(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # dedup.contact_key(first, last, company name) and dedup.linkedin_key(linkedin_url)
+    contact_key: Mapped[Optional[str]] = mapped_column(String(400), nullable=True)
+    linkedin_key: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
 
     company_id: Mapped[Optional[int]] = mapped_column(ForeignKey("companies.id"), nullable=True)
     company: Mapped[Optional["Company"]] = relationship(back_populates="contacts")
@@ -89,6 +150,11 @@ class Contact(Base):
 
 class Meeting(Base):
     __tablename__ = "meetings"
+    __table_args__ = (
+        Index("ix_meetings_status_time", "status", "meeting_time"),
+        Index("ix_meetings_meeting_time", "meeting_time"),
+        Index("ix_meetings_contact_id", "contact_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     contact_id: Mapped[int] = mapped_column(ForeignKey("contacts.id"))
@@ -100,6 +166,7 @@ class Meeting(Base):
     status: Mapped[str] = mapped_column(String(50), default="Scheduled")
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     contact: Mapped["Contact"] = relationship(back_populates="meetings")
 
@@ -118,6 +185,9 @@ class NurtureSequence(Base):
 
 class NurtureEnrollment(Base):
     __tablename__ = "nurture_enrollments"
+    __table_args__ = (
+        Index("ix_nurture_enrollments_contact_id", "contact_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     contact_id: Mapped[int] = mapped_column(ForeignKey("contacts.id"))
@@ -125,6 +195,7 @@ class NurtureEnrollment(Base):
     current_step: Mapped[int] = mapped_column(Integer, default=0)
     enrolled_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     status: Mapped[str] = mapped_column(String(50), default="Active")
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     contact: Mapped["Contact"] = relationship(back_populates="nurture_enrollments")
     sequence: Mapped["NurtureSequence"] = relationship(back_populates="enrollments")
@@ -132,6 +203,10 @@ class NurtureEnrollment(Base):
 
 class Proposal(Base):
     __tablename__ = "proposals"
+    __table_args__ = (
+        Index("ix_proposals_contact_id", "contact_id"),
+        Index("ix_proposals_created_at", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     contact_id: Mapped[int] = mapped_column(ForeignKey("contacts.id"))
@@ -142,5 +217,36 @@ class Proposal(Base):
     status: Mapped[str] = mapped_column(String(50), default="Draft")
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     contact: Mapped["Contact"] = relationship(back_populates="proposals")
+
+
+# ── Dedup keys ────────────────────────────────────────────────────────────────
+# Kept in step with the source columns on every ORM flush. Bulk inserts that
+# bypass the ORM (database.ingest) compute the keys themselves.
+
+@event.listens_for(Company, "before_insert")
+@event.listens_for(Company, "before_update")
+def _company_keys(mapper, connection, company):
+    company.company_key = dedup.company_key(company.company_name)
+
+
+_CONTACT_KEY_SOURCES = ("first_name", "last_name", "company_id", "company", "linkedin_url")
+
+
+@event.listens_for(Contact, "before_insert")
+@event.listens_for(Contact, "before_update")
+def _contact_keys(mapper, connection, contact):
+    state = inspect(contact)
+    if state.persistent and not any(state.attrs[a].history.has_changes() for a in _CONTACT_KEY_SOURCES):
+        return
+    company = state.dict.get("company")  # only if already loaded: no lazy load mid-flush
+    if company is not None:
+        company_name = company.company_name
+    elif contact.company_id is not None:
+        company_name = connection.scalar(select(Company.company_name).where(Company.id == contact.company_id))
+    else:
+        company_name = None
+    contact.contact_key = dedup.contact_key(contact.first_name, contact.last_name, company_name)
+    contact.linkedin_key = dedup.linkedin_key(contact.linkedin_url)
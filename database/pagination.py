@@ -0,0 +1,74 @@
+"""Keyset (cursor) pagination for ORM queries.
+
+A page is described by an ordered list of sort keys ``(expression, descending)``
+that must end in a unique column (normally the primary key). The cursor is the
+last row's key values, so the next page is a range scan that starts where the
+previous one stopped instead of an ``OFFSET`` that re-reads every earlier row.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+SortKey = tuple  # (ColumnElement, descending: bool)
+
+
+def encode_cursor(values: list) -> str:
+    payload = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, size: int | None = None) -> list | None:
+    """Decode a cursor; returns None for an empty or malformed token, or one
+    that doesn't hold exactly ``size`` values when ``size`` is given."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or (size is not None and len(payload) != size):
+            return None
+        return [datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v for v in payload]
+    except (KeyError, TypeError, ValueError, binascii.Error):
+        return None
+
+
+def _after(keys: list[SortKey], values: list):
+    """WHERE clause for rows that sort strictly after ``values``.
+
+    Expanded as (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ... so keys may mix
+    ascending and descending directions.
+    """
+    clauses = []
+    for i, (expr, descending) in enumerate(keys):
+        equal = [k == v for (k, _), v in zip(keys[:i], values[:i])]
+        step = expr < values[i] if descending else expr > values[i]
+        clauses.append(and_(*equal, step))
+    return or_(*clauses)
+
+
+def keyset_page(query, keys: list[SortKey], cursor: str, page_size: int) -> tuple[list, str | None]:
+    """Fetch one page of ``query`` ordered by ``keys``.
+
+    Returns ``(items, next_cursor)``; ``next_cursor`` is None on the last page.
+    Any ordering already on ``query`` is replaced.
+    """
+    labelled = [expr.label(f"_k{i}") for i, (expr, _) in enumerate(keys)]
+    paged = query.add_columns(*labelled).order_by(None)
+
+    values = decode_cursor(cursor, len(keys))
+    if values is not None:
+        paged = paged.filter(_after(keys, values))
+
+    paged = paged.order_by(
+        *(expr.desc() if descending else expr.asc() for expr, descending in keys)
+    ).limit(page_size + 1)
+
+    rows = paged.all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = encode_cursor(list(rows[-1][1:])) if has_more else None
+    return [row[0] for row in rows], next_cursor
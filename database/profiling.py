@@ -0,0 +1,135 @@
+"""Opt-in per-request SQL profiling and slow-query log.
+
+With ``sql_profiling`` on, ``install`` hooks the engines' cursor events and
+the app's middleware opens a ``RequestProfile`` per request. Every statement
+executed while handling the request (in the route's threadpool worker, on the
+async engine or in the auth middleware) is counted and timed. The totals and
+the slowest few statements go back to the client as a ``Server-Timing``
+header, so the browser's network panel shows them next to the request.
+
+Statements slower than ``slow_query_ms`` are logged as JSON on
+``mastersales.sql.slow`` with their SQL normalised (literals and expanded
+``IN`` lists collapsed), so repeats of the same query group together. That
+log also covers work outside a request, such as scrapes and migrations.
+"""
+import heapq
+import json
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+
+logger = logging.getLogger("mastersales.sql.slow")
+
+_profile: ContextVar["RequestProfile | None"] = ContextVar("sql_profile", default=None)
+
+
+# ── SQL normalisation ─────────────────────────────────────────────────────────
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"\?|%\(\w+\)s|%s|\$\d+")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """One line with every literal and bound parameter shown as ``?``.
+
+    ``IN (?, ?, ?)`` of any length becomes ``IN (...)``.
+    """
+    sql = _STRING.sub("?", statement)
+    sql = _PARAM.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+# ── Per-request profile ───────────────────────────────────────────────────────
+
+@dataclass
+class RequestProfile:
+    path: str | None = None
+    top: int = 3
+    statements: int = 0
+    db_ms: float = 0.0
+    _slowest: list[tuple[float, int, str]] = field(default_factory=list)
+
+    def record(self, duration_ms: float, statement: str) -> None:
+        self.statements += 1
+        self.db_ms += duration_ms
+        entry = (duration_ms, self.statements, statement)
+        if len(self._slowest) < self.top:
+            heapq.heappush(self._slowest, entry)
+        elif duration_ms > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    @property
+    def slowest(self) -> list[tuple[float, str]]:
+        """The ``top`` slowest statements as (ms, normalised SQL), slowest first."""
+        return [(ms, normalize_sql(sql)) for ms, _, sql in sorted(self._slowest, reverse=True)]
+
+    def server_timing(self, total_ms: float | None = None) -> str:
+        metrics = [f'db;dur={self.db_ms:.1f};desc="{self.statements} queries"']
+        for i, (ms, sql) in enumerate(self.slowest, 1):
+            metrics.append(f'sql-{i};dur={ms:.1f};desc="{_quote(sql)}"')
+        if total_ms is not None:
+            metrics.append(f"app;dur={total_ms:.1f}")
+        return ", ".join(metrics)
+
+
+def _quote(sql: str, limit: int = 80) -> str:
+    # Server-Timing desc is an HTTP quoted-string: keep it short and ASCII
+    sql = sql.encode("ascii", "replace").decode().replace("\\", "").replace('"', "'")
+    return sql if len(sql) <= limit else sql[:limit - 3] + "..."
+
+
+@contextmanager
+def profile_request(path: str | None = None, top: int = 3):
+    """Collect the statements run in this context (and its threads/tasks)."""
+    profile = RequestProfile(path=path, top=top)
+    token = _profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _profile.reset(token)
+
+
+# ── Engine hooks ──────────────────────────────────────────────────────────────
+
+def install(*engines, slow_query_ms: float) -> None:
+    """Time every statement on ``engines`` (sync or async). Call once per engine."""
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profiling_started", []).append(time.perf_counter())
+
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["profiling_started"].pop()
+        duration_ms = (time.perf_counter() - started) * 1000
+        profile = _profile.get()
+        if profile is not None:
+            profile.record(duration_ms, statement)
+        if duration_ms >= slow_query_ms:
+            logger.warning(json.dumps({
+                "event": "slow_query",
+                "duration_ms": round(duration_ms, 2),
+                "sql": normalize_sql(statement),
+                "executemany": executemany,
+                "dialect": conn.dialect.name,
+                "path": profile.path if profile is not None else None,
+            }))
+
+    def _failed(context):
+        # after_cursor_execute doesn't fire for a failed statement
+        started = context.connection.info.get("profiling_started") if context.connection else None
+        if started:
+            started.pop()
+
+    for engine in engines:
+        engine = getattr(engine, "sync_engine", engine)
+        event.listen(engine, "before_cursor_execute", _before)
+        event.listen(engine, "after_cursor_execute", _after)
+        event.listen(engine, "handle_error", _failed)
@@ -0,0 +1,145 @@
+"""SQLite FTS5 full-text index behind the /leads search box.
+
+``contacts_fts`` holds one row per contact (rowid = contacts.id) with the
+contact's name, title, work email, source, notes and company name. Triggers on
+``contacts`` and ``companies`` keep it in sync with every write, including bulk
+``UPDATE`` statements that bypass the ORM.
+
+Rebuild the index for an existing database with::
+
+    python -m database.search rebuild
+"""
+import re
+import sys
+from functools import lru_cache
+
+from sqlalchemy import column, literal_column, table, text
+from sqlalchemy.engine import Connection, Engine
+
+from database.models import Contact
+
+FTS_TABLE = "contacts_fts"
+FTS_COLUMNS = ("name", "job_title", "email", "lead_source", "notes", "company_name")
+# bm25 column weights, in FTS_COLUMNS order: a hit on the name or company
+# outranks one buried in the notes.
+BM25_WEIGHTS = (10.0, 4.0, 3.0, 2.0, 1.0, 6.0)
+
+_COLUMN_LIST = ", ".join(FTS_COLUMNS)
+
+_ROW_SELECT = """
+    SELECT c.id,
+           trim(c.first_name || ' ' || coalesce(c.last_name, '')),
+           coalesce(c.job_title, ''),
+           coalesce(c.email_work, ''),
+           coalesce(c.lead_source, ''),
+           coalesce(c.notes, ''),
+           coalesce(co.company_name, '')
+    FROM contacts c LEFT JOIN companies co ON co.id = c.company_id
+"""
+
+_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {_COLUMN_LIST}, tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS contacts_fts_ai AFTER INSERT ON contacts BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_COLUMN_LIST}) {_ROW_SELECT} WHERE c.id = NEW.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS contacts_fts_au AFTER UPDATE OF
+        first_name, last_name, job_title, email_work, lead_source, notes, company_id
+        ON contacts BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = OLD.id;
+        INSERT INTO {FTS_TABLE}(rowid, {_COLUMN_LIST}) {_ROW_SELECT} WHERE c.id = NEW.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS contacts_fts_ad AFTER DELETE ON contacts BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = OLD.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS companies_fts_au AFTER UPDATE OF company_name ON companies BEGIN
+        UPDATE {FTS_TABLE} SET company_name = coalesce(NEW.company_name, '')
+        WHERE rowid IN (SELECT id FROM contacts WHERE company_id = NEW.id);
+    END""",
+]
+
+
+def fts5_supported(conn: Connection) -> bool:
+    """True if this is SQLite compiled with FTS5."""
+    if conn.dialect.name != "sqlite":
+        return False
+    options = {row[0] for row in conn.execute(text("PRAGMA compile_options"))}
+    return "ENABLE_FTS5" in options
+
+
+def create_index(conn: Connection) -> None:
+    """Create the FTS table and its sync triggers (no-op if they exist)."""
+    for statement in _DDL:
+        conn.execute(text(statement))
+
+
+def rebuild_index(conn: Connection) -> int:
+    """Repopulate the index from contacts/companies. Returns the row count."""
+    conn.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}(rowid, {_COLUMN_LIST}) {_ROW_SELECT}"))
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"))
+    return conn.execute(text(f"SELECT count(*) FROM {FTS_TABLE}")).scalar()
+
+
+@lru_cache(maxsize=None)
+def fts_enabled(bind: Engine) -> bool:
+    """True once the FTS table exists on this engine's database."""
+    if bind.dialect.name != "sqlite":
+        return False
+    with bind.connect() as conn:
+        return conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE},
+        ).first() is not None
+
+
+def build_match(q: str) -> str:
+    """Turn free text into an FTS5 query: every word must match as a prefix.
+
+    Only word characters survive, so user input can never inject FTS syntax.
+    """
+    terms = re.findall(r"\w+", q)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def rank():
+    """Weighted bm25 score for the current MATCH; lower is more relevant."""
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+    return literal_column(f"bm25({FTS_TABLE}, {weights})")
+
+
+def match_contacts(query, q: str):
+    """Restrict a Contact query to rows whose FTS entry matches ``q``.
+
+    Order by ``rank()`` for best-match-first. Returns the query unchanged if
+    ``q`` contains no searchable words.
+    """
+    match = build_match(q)
+    if not match:
+        return query
+    fts = table(FTS_TABLE, column("rowid"))
+    return (
+        query.join(fts, fts.c.rowid == Contact.id)
+        .filter(text(f"{FTS_TABLE} MATCH :fts_match").bindparams(fts_match=match))
+    )
+
+
+def main(argv: list[str]) -> int:
+    from database.db import engine
+
+    if argv != ["rebuild"]:
+        print("usage: python -m database.search rebuild", file=sys.stderr)
+        return 2
+    with engine.begin() as conn:
+        if not fts5_supported(conn):
+            print("FTS5 is not available for this database; nothing to do.", file=sys.stderr)
+            return 1
+        create_index(conn)
+        count = rebuild_index(conn)
+    print(f"Rebuilt {FTS_TABLE}: {count} contacts indexed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
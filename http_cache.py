@@ -0,0 +1,88 @@
+"""Conditional GET (ETag / Last-Modified) for read-only pages.
+
+A handler builds its validators from row versions (``updated_at`` stamps)
+with one cheap query, then calls ``not_modified`` before rendering or reading
+anything from disk. A matching ``If-None-Match`` (or, without one,
+``If-Modified-Since``) gets an empty 304.
+
+Responses are marked ``private, no-cache``: the browser keeps a copy but
+revalidates it on every use, so an edit is visible on the next navigation.
+HTMX requests go through the same browser HTTP cache, so hx-get / hx-boost
+navigations revalidate to a 304 the same way.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+
+from fastapi import Request, Response
+
+from config import settings
+
+REVALIDATE = "private, no-cache"
+
+_ROOT = Path(__file__).parent
+_TEMPLATE_DIRS = ("templates", "proposals/templates")
+
+
+def _render_version() -> str:
+    """Fingerprint of the templates and display settings baked into every page.
+
+    Part of every ETag, so a deploy that changes either never answers 304
+    with a client's copy of the old markup.
+    """
+    h = hashlib.blake2b(digest_size=8)
+    for directory in _TEMPLATE_DIRS:
+        for path in sorted((_ROOT / directory).rglob("*.html")):
+            h.update(str(path.relative_to(_ROOT)).encode())
+            h.update(path.read_bytes())
+    h.update(settings.model_dump_json(exclude={"secret_key", "database_url"}).encode())
+    return h.hexdigest()
+
+
+RENDER_VERSION = _render_version()
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over ``parts`` (ids, version stamps, ...) and RENDER_VERSION."""
+    digest = hashlib.blake2b(repr((RENDER_VERSION, *parts)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def validator_headers(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def not_modified(request: Request, etag: str, last_modified: datetime | None = None) -> Response | None:
+    """A 304 if the client's copy is current, else None (render as usual)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison, as RFC 9110 requires for If-None-Match
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        fresh = "*" in tags or etag.removeprefix("W/") in tags
+    elif last_modified is not None and (since := _parse_http_date(request.headers.get("if-modified-since"))):
+        fresh = _as_utc(last_modified) <= since
+    else:
+        fresh = False
+    if not fresh:
+        return None
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Stamps are stored as naive UTC; HTTP dates have whole-second resolution
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _parse_http_date(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return _as_utc(parsedate_to_datetime(value))
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,130 @@
+"""Prometheus metrics.
+
+Everything is registered on ``REGISTRY`` and served by ``/metrics`` in the
+text exposition format. That endpoint answers a logged-in session or a
+request with ``Authorization: Bearer <METRICS_TOKEN>`` (and localhost, only
+with ``METRICS_ALLOW_LOCALHOST``).
+
+- HTTP: request count and latency per route template (not per raw URL, to
+  keep label cardinality bounded), recorded by middleware in app.py.
+- DB: time to open a pooled connection, how long connections stay checked
+  out, and connections checked out now, per engine.
+- Scrapers: pages loaded, results and failures per source; shared browsers
+  open and recycled.
+- Proposals: PDF render duration.
+- App state: size of the in-memory scraper results list.
+
+Values are per process: with several workers, scrape each one or aggregate
+in Prometheus.
+"""
+import time
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, PlatformCollector, ProcessCollector
+from sqlalchemy import event
+
+REGISTRY = CollectorRegistry()
+ProcessCollector(registry=REGISTRY)
+PlatformCollector(registry=REGISTRY)
+
+_NS = "mastersales"
+
+# ── HTTP ──────────────────────────────────────────────────────────────────────
+
+HTTP_REQUESTS = Counter(
+    "http_requests", "Requests handled, by route template and status code",
+    ["method", "route", "status"], namespace=_NS, registry=REGISTRY,
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time to the response start, by route template",
+    ["method", "route"], namespace=_NS, registry=REGISTRY,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+# ── Database pool ─────────────────────────────────────────────────────────────
+
+DB_POOL_CONNECT = Histogram(
+    "db_pool_connect_seconds", "Time to open a new pooled connection",
+    ["engine"], namespace=_NS, registry=REGISTRY,
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_HELD = Histogram(
+    "db_pool_checkout_seconds", "Time a connection stays checked out of the pool",
+    ["engine"], namespace=_NS, registry=REGISTRY,
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30, 120),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool",
+    ["engine"], namespace=_NS, registry=REGISTRY,
+)
+
+# ── Scrapers ──────────────────────────────────────────────────────────────────
+
+SCRAPER_PAGES = Counter(
+    "scraper_pages_loaded", "Browser page loads, by source",
+    ["source"], namespace=_NS, registry=REGISTRY,
+)
+SCRAPER_RESULTS = Counter(
+    "scraper_results", "Results returned by a scraper, by source",
+    ["source"], namespace=_NS, registry=REGISTRY,
+)
+SCRAPER_FAILURES = Counter(
+    "scraper_failures", "Scraper runs that raised, by source",
+    ["source"], namespace=_NS, registry=REGISTRY,
+)
+SCRAPER_BROWSERS = Gauge(
+    "scraper_browsers_open", "Browsers held open by the scraping engine",
+    namespace=_NS, registry=REGISTRY,
+)
+BROWSER_RECYCLES = Counter(
+    "scraper_browser_recycles", "Shared browsers retired after their page or memory limit",
+    namespace=_NS, registry=REGISTRY,
+)
+
+# ── Proposals ─────────────────────────────────────────────────────────────────
+
+PDF_RENDER = Histogram(
+    "pdf_render_duration_seconds", "Time to render a proposal PDF",
+    namespace=_NS, registry=REGISTRY,
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+)
+
+# ── App state ─────────────────────────────────────────────────────────────────
+
+SCRAPER_RESULTS_HELD = Gauge(
+    "scraper_results_held", "Scraper results held in memory awaiting review",
+    namespace=_NS, registry=REGISTRY,
+)
+
+
+def instrument_engine(engine, name: str) -> None:
+    """Time connections opened and checked out on ``engine`` (sync or async)
+    and export its checked-out count.
+
+    Uses pool events, which carry over to the new pool ``engine.dispose()``
+    creates. The pool has no event before a checkout, so a wait for a free
+    connection shows as checked-out count at the pool size, not as a time.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "do_connect")
+    def _opening(dialect, record, cargs, cparams):
+        record.info["metrics_connecting"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "connect")
+    def _opened(dbapi_connection, record):
+        started = record.info.pop("metrics_connecting", None)
+        if started is not None:
+            DB_POOL_CONNECT.labels(name).observe(time.perf_counter() - started)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _checked_out(dbapi_connection, record, proxy):
+        record.info["metrics_checked_out"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _checked_in(dbapi_connection, record):
+        started = record.info.pop("metrics_checked_out", None)
+        if started is not None:
+            DB_POOL_HELD.labels(name).observe(time.perf_counter() - started)
+
+    if hasattr(sync_engine.pool, "checkedout"):
+        DB_POOL_CHECKED_OUT.labels(name).set_function(lambda: sync_engine.pool.checkedout())
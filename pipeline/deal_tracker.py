@@ -1,7 +1,9 @@
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from database.models import Contact
+from database.models import Contact, Meeting, Proposal
 
 PIPELINE_STAGES = ["New", "Contacted", "Qualified", "Proposal", "Negotiation", "Won", "Lost"]
+ACTIVE_DEAL_STAGES = ["Qualified", "Proposal", "Negotiation"]
 
 
 def get_pipeline_data(db: Session) -> dict:
@@ -35,3 +37,37 @@ def get_pipeline_stats(db: Session) -> dict:
             "total_value": sum(c.deal_value or 0 for c in contacts),
         }
     return stats
+
+
+def get_stage_totals(db: Session) -> dict[str, dict]:
+    """Count and deal value per lead_status for active contacts, in one GROUP BY.
+
+    Every stage in PIPELINE_STAGES is present, zero-filled if empty.
+    """
+    rows = (
+        db.query(Contact.lead_status, func.count(), func.coalesce(func.sum(Contact.deal_value), 0))
+        .filter(Contact.deleted_at.is_(None))
+        .group_by(Contact.lead_status)
+        .all()
+    )
+    totals = {stage: {"count": 0, "total_value": 0} for stage in PIPELINE_STAGES}
+    for status, count, value in rows:
+        totals[status] = {"count": count, "total_value": value}
+    return totals
+
+
+def get_dashboard_summary(db: Session) -> dict:
+    """Headline numbers for the dashboard: two queries regardless of data size."""
+    stages = get_stage_totals(db)
+    proposals_sent, meetings_count = db.execute(select(
+        select(func.count()).select_from(Proposal).where(Proposal.status != "Draft").scalar_subquery(),
+        select(func.count()).select_from(Meeting).scalar_subquery(),
+    )).one()
+    return {
+        "total_leads": sum(s["count"] for s in stages.values()),
+        "active_deals": sum(stages[stage]["count"] for stage in ACTIVE_DEAL_STAGES),
+        "proposals_sent": proposals_sent,
+        "meetings_count": meetings_count,
+        "pipeline_counts": {stage: stages[stage]["count"] for stage in PIPELINE_STAGES},
+        "total_pipeline_value": sum(s["total_value"] for s in stages.values()),
+    }
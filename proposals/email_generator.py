@@ -1,7 +1,5 @@
-from jinja2 import Environment, FileSystemLoader
 from config import settings
-
-proposal_env = Environment(loader=FileSystemLoader("proposals/templates"))
+from templating import proposal_env
 
 
 def render_email_proposal(
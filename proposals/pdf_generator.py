@@ -1,9 +1,9 @@
 import os
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader
-from config import settings
 
-proposal_env = Environment(loader=FileSystemLoader("proposals/templates"))
+import metrics
+from config import settings
+from templating import proposal_env
 
 
 def generate_pdf_proposal(
@@ -36,5 +36,6 @@ def generate_pdf_proposal(
     pdf_path = os.path.join(output_dir, f"{proposal_number}.pdf")
 
     from weasyprint import HTML
-    HTML(string=html_content).write_pdf(pdf_path)
+    with metrics.PDF_RENDER.time():
+        HTML(string=html_content).write_pdf(pdf_path)
     return pdf_path
@@ -2,6 +2,8 @@ import logging
 import re
 from urllib.parse import urlparse
 
+from scraper import async_engine
+from scraper.async_engine import browser_context
 from scraper.base import BaseScraper, ScraperConfig, ScraperResult
 
 logger = logging.getLogger("mastersales.scraper.aca")
@@ -93,40 +95,41 @@ class ACAScraper(BaseScraper):
     ]
 
     def scrape(self, config: ScraperConfig) -> list[ScraperResult]:
-        from scraper.search_engine import is_cancelled
+        return async_engine.run(self.scrape_async(config))
+
+    async def scrape_async(self, config: ScraperConfig) -> list[ScraperResult]:
         max_results = config.get("max_results", 20)
         results: list[ScraperResult] = []
         try:
-            from playwright.sync_api import sync_playwright
+            import playwright.async_api  # noqa: F401
         except ImportError:
             logger.warning("[ACA] Playwright not installed — cannot scrape")
             return []
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
+            async with browser_context() as context:
+                page = self.track_page(await context.new_page())
 
                 # --- Primary: public Corrosion Control Directory ---
                 try:
-                    page.goto(DIRECTORY_URL, timeout=20000)
-                    page.wait_for_load_state("domcontentloaded", timeout=15000)
+                    await page.goto(DIRECTORY_URL, timeout=20000)
+                    await page.wait_for_load_state("domcontentloaded", timeout=15000)
 
                     # Wait for DataTable to initialise
-                    page.wait_for_selector("table tbody tr", timeout=15000)
+                    await page.wait_for_selector("table tbody tr", timeout=15000)
 
                     # Show 100 entries to minimise pagination
                     try:
-                        page.select_option(
+                        await page.select_option(
                             'select[name$="_length"]',  # DataTables length select
                             value="100",
                         )
                         # Wait for table to re-render after changing page size
-                        page.wait_for_timeout(2000)
-                        page.wait_for_selector("table tbody tr", timeout=10000)
+                        await page.wait_for_timeout(2000)
+                        await page.wait_for_selector("table tbody tr", timeout=10000)
                     except Exception as e:
                         logger.warning(f"[ACA] Could not change page size: {e}")
 
-                    results = self._extract_directory_rows(page)
+                    results = await self._extract_directory_rows(page)
                     logger.info(f"[ACA] Directory: found {len(results)} entries")
 
                 except Exception as e:
@@ -136,41 +139,39 @@ class ACAScraper(BaseScraper):
                 creds = config.get("credentials", {})
                 if creds.get("username") and creds.get("password") and len(results) < max_results:
                     try:
-                        self._login(page, creds["username"], creds["password"])
-                        member_results = self._scrape_member_directory(page, max_results - len(results))
+                        await self._login(page, creds["username"], creds["password"])
+                        member_results = await self._scrape_member_directory(page, max_results - len(results))
                         results.extend(member_results)
                     except Exception as e:
                         logger.warning(f"[ACA] Member directory login failed: {e}")
-
-                browser.close()
         except Exception as e:
             logger.error(f"[ACA] Scraper error: {e}")
 
         return results[:max_results]
 
-    def _extract_directory_rows(self, page) -> list[ScraperResult]:
+    async def _extract_directory_rows(self, page) -> list[ScraperResult]:
         """Extract leads from the Corrosion Control Directory DataTable."""
         results: list[ScraperResult] = []
-        rows = page.query_selector_all("table tbody tr")
+        rows = await page.query_selector_all("table tbody tr")
 
         for row in rows:
             try:
-                cells = row.query_selector_all("td")
+                cells = await row.query_selector_all("td")
                 if len(cells) < 3:
                     continue
 
                 # --- Column 1: Company ---
                 company_cell = cells[0]
-                strong_el = company_cell.query_selector("strong")
-                company_name = strong_el.inner_text().strip() if strong_el else None
+                strong_el = await company_cell.query_selector("strong")
+                company_name = (await strong_el.inner_text()).strip() if strong_el else None
                 if not company_name:
                     continue
 
                 # Website link
-                website_link = company_cell.query_selector('a[href*="://"]')
+                website_link = await company_cell.query_selector('a[href*="://"]')
                 website_url = None
                 if website_link:
-                    href = website_link.get_attribute("href") or ""
+                    href = await website_link.get_attribute("href") or ""
                     # Skip tel: and mailto: links
                     if href.startswith("http"):
                         website_url = href
@@ -178,14 +179,14 @@ class ACAScraper(BaseScraper):
 
                 # --- Column 3: Contact ---
                 contact_cell = cells[2]
-                p_tags = contact_cell.query_selector_all("p")
+                p_tags = await contact_cell.query_selector_all("p")
 
                 contact_name = ""
                 phone = None
                 address_parts = []
 
                 for i, p_tag in enumerate(p_tags):
-                    text = p_tag.inner_text().strip()
+                    text = (await p_tag.inner_text()).strip()
                     if not text:
                         continue
 
@@ -195,9 +196,9 @@ class ACAScraper(BaseScraper):
                         continue
 
                     # Check for phone link
-                    phone_link = p_tag.query_selector('a[href^="tel:"]')
+                    phone_link = await p_tag.query_selector('a[href^="tel:"]')
                     if phone_link:
-                        phone = phone_link.inner_text().strip()
+                        phone = (await phone_link.inner_text()).strip()
                         continue
 
                     # Remaining are address lines
@@ -205,7 +206,7 @@ class ACAScraper(BaseScraper):
 
                 if not contact_name:
                     # Fallback: try raw text
-                    raw = contact_cell.inner_text().strip()
+                    raw = (await contact_cell.inner_text()).strip()
                     lines = [l.strip() for l in raw.split("\n") if l.strip()]
                     if lines:
                         contact_name = lines[0]
@@ -241,19 +242,19 @@ class ACAScraper(BaseScraper):
 
         return results
 
-    def _login(self, page, username: str, password: str):
-        page.goto("https://www.corrosion.com.au/login", timeout=15000)
-        page.fill('input[name="username"], input[type="email"]', username)
-        page.fill('input[type="password"]', password)
-        page.click('button[type="submit"], input[type="submit"]')
-        page.wait_for_load_state("domcontentloaded", timeout=10000)
+    async def _login(self, page, username: str, password: str):
+        await page.goto("https://www.corrosion.com.au/login", timeout=15000)
+        await page.fill('input[name="username"], input[type="email"]', username)
+        await page.fill('input[type="password"]', password)
+        await page.click('button[type="submit"], input[type="submit"]')
+        await page.wait_for_load_state("domcontentloaded", timeout=10000)
 
-    def _scrape_member_directory(self, page, max_results: int) -> list[ScraperResult]:
+    async def _scrape_member_directory(self, page, max_results: int) -> list[ScraperResult]:
         results = []
         try:
-            page.goto("https://www.corrosion.com.au/members/directory", timeout=15000)
-            page.wait_for_load_state("domcontentloaded", timeout=10000)
-            results = self._extract_directory_rows(page)
+            await page.goto("https://www.corrosion.com.au/members/directory", timeout=15000)
+            await page.wait_for_load_state("domcontentloaded", timeout=10000)
+            results = await self._extract_directory_rows(page)
         except Exception as e:
             logger.warning(f"[ACA] Member directory scrape failed: {e}")
         return results[:max_results]
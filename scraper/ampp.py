@@ -1,6 +1,8 @@
 import logging
 import re
 from urllib.parse import urlparse
+from scraper import async_engine
+from scraper.async_engine import browser_context
 from scraper.base import BaseScraper, ScraperConfig, ScraperResult
 
 logger = logging.getLogger("mastersales.scraper.ampp")
@@ -118,25 +120,27 @@ class AMPPScraper(BaseScraper):
     ]
 
     def scrape(self, config: ScraperConfig) -> list[ScraperResult]:
+        return async_engine.run(self.scrape_async(config))
+
+    async def scrape_async(self, config: ScraperConfig) -> list[ScraperResult]:
         from scraper.search_engine import is_cancelled
         max_results = config.get("max_results", 20)
         results: list[ScraperResult] = []
         try:
-            from playwright.sync_api import sync_playwright
+            import playwright.async_api  # noqa: F401
         except ImportError:
             logger.warning("[AMPP] Playwright not installed — cannot scrape")
             return []
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
+            async with browser_context() as context:
+                page = self.track_page(await context.new_page())
 
                 # Navigate to the public corporate directory
-                page.goto(DIRECTORY_URL, timeout=60000)
-                page.wait_for_load_state("domcontentloaded", timeout=30000)
+                await page.goto(DIRECTORY_URL, timeout=60000)
+                await page.wait_for_load_state("domcontentloaded", timeout=30000)
 
                 # Wait for the table to appear
-                page.wait_for_selector("table", timeout=30000)
+                await page.wait_for_selector("table", timeout=30000)
 
                 page_num = 0
                 while len(results) < max_results:
@@ -144,7 +148,7 @@ class AMPPScraper(BaseScraper):
                         break
 
                     page_num += 1
-                    new_entries = self._extract_from_table(page)
+                    new_entries = await self._extract_from_table(page)
                     if not new_entries:
                         logger.info(f"[AMPP] Page {page_num}: no entries found, stopping")
                         break
@@ -156,11 +160,9 @@ class AMPPScraper(BaseScraper):
                         break
 
                     # Try to click Next for pagination
-                    if not self._go_to_next_page(page):
+                    if not await self._go_to_next_page(page):
                         logger.info("[AMPP] No more pages available")
                         break
-
-                browser.close()
         except Exception as e:
             logger.error(f"[AMPP] Scraper error: {e}")
             if not results:
@@ -169,33 +171,33 @@ class AMPPScraper(BaseScraper):
 
         return results[:max_results]
 
-    def _extract_from_table(self, page) -> list[ScraperResult]:
+    async def _extract_from_table(self, page) -> list[ScraperResult]:
         """Extract company/contact data from the corporate directory table."""
         results = []
 
         # The table uses <rowgroup> and <row> elements, or standard tr/td
         # Try multiple selectors for rows
-        rows = page.query_selector_all("table tr")
+        rows = await page.query_selector_all("table tr")
         if not rows:
-            rows = page.query_selector_all("table row")
+            rows = await page.query_selector_all("table row")
         if not rows:
-            rows = page.query_selector_all("table tbody tr")
+            rows = await page.query_selector_all("table tbody tr")
 
         for row in rows:
             try:
-                cells = row.query_selector_all("td")
+                cells = await row.query_selector_all("td")
                 if not cells:
-                    cells = row.query_selector_all("cell")
+                    cells = await row.query_selector_all("cell")
                 if len(cells) < 5:
                     continue  # Skip header rows or malformed rows
 
                 # Cell 0: Company Name
-                company_name = (cells[0].inner_text() or "").strip()
+                company_name = (await cells[0].inner_text() or "").strip()
                 if not company_name:
                     continue
 
                 # Cell 1: Address
-                address_text = (cells[1].inner_text() or "").strip()
+                address_text = (await cells[1].inner_text() or "").strip()
                 city, state, country = _parse_address(address_text)
 
                 # Cell 2: Phone (not used in ScraperResult but logged)
@@ -203,15 +205,15 @@ class AMPPScraper(BaseScraper):
 
                 # Cell 3: Website — extract href from link or text
                 website = None
-                website_link = cells[3].query_selector("a")
+                website_link = await cells[3].query_selector("a")
                 if website_link:
-                    website = website_link.get_attribute("href")
+                    website = await website_link.get_attribute("href")
                 if not website:
-                    website = (cells[3].inner_text() or "").strip()
+                    website = (await cells[3].inner_text() or "").strip()
                 company_domain = _extract_domain(website)
 
                 # Cell 4: Primary Contact Name
-                contact_name = (cells[4].inner_text() or "").strip()
+                contact_name = (await cells[4].inner_text() or "").strip()
                 if not contact_name:
                     continue
                 first_name, last_name = _parse_contact_name(contact_name)
@@ -246,33 +248,33 @@ class AMPPScraper(BaseScraper):
 
         return results
 
-    def _go_to_next_page(self, page) -> bool:
+    async def _go_to_next_page(self, page) -> bool:
         """Click the 'Next' pagination link. Returns True if successful."""
         try:
             # Look for a "Next" link in the pagination
-            next_link = page.query_selector("a:has-text('Next')")
+            next_link = await page.query_selector("a:has-text('Next')")
             if not next_link:
-                next_link = page.query_selector("a:text-is('Next')")
+                next_link = await page.query_selector("a:text-is('Next')")
             if not next_link:
                 # Try finding by aria-label or title
-                next_link = page.query_selector("[aria-label='Next']")
+                next_link = await page.query_selector("[aria-label='Next']")
             if not next_link:
-                next_link = page.query_selector("a.next, .pagination a:has-text('Next')")
+                next_link = await page.query_selector("a.next, .pagination a:has-text('Next')")
 
             if not next_link:
                 return False
 
             # Check if the Next link is disabled
-            classes = next_link.get_attribute("class") or ""
+            classes = await next_link.get_attribute("class") or ""
             if "disabled" in classes:
                 return False
 
-            next_link.click()
+            await next_link.click()
             # Wait for table to reload
-            page.wait_for_load_state("networkidle", timeout=10000)
-            page.wait_for_selector("table", timeout=10000)
+            await page.wait_for_load_state("networkidle", timeout=10000)
+            await page.wait_for_selector("table", timeout=10000)
             # Small delay to ensure content is updated
-            page.wait_for_timeout(500)
+            await page.wait_for_timeout(500)
             return True
         except Exception as e:
             logger.debug(f"[AMPP] Pagination error: {e}")
@@ -0,0 +1,288 @@
+"""The asyncio scraping engine: one event loop and one shared browser.
+
+``run_scrape`` used to start an OS thread per source, each blocking in
+``time.sleep`` between pages. Now every source is a task on a single
+long-lived event loop (its own thread, started on first use), awaiting
+``BaseScraper.scrape_async``. Scrapers drive ``playwright.async_api`` and
+open pages through ``browser_context()``, which hands out an isolated
+``BrowserContext`` (its own cookies, storage and cache) on one shared
+Chromium. While one source waits on a page load or a polite
+``asyncio.sleep``, the others run.
+
+At most ``scrape_max_contexts`` contexts are open at once; further sources
+wait for one to close. The browser is retired after
+``browser_recycle_pages`` page loads (navigations, not pages opened). Each
+browser's memory is that of its own process tree: once the browsers together
+pass ``browser_recycle_mb``, the largest is retired. New contexts then go to
+a fresh browser, and the old one closes once its last context does. A
+browser that has crashed or been killed is dropped and relaunched.
+``shutdown()`` in the app lifespan closes everything.
+"""
+import asyncio
+import logging
+import os
+import threading
+from contextlib import asynccontextmanager
+
+import metrics
+from config import settings
+
+logger = logging.getLogger("mastersales.scraper.engine")
+
+# Every scraper's browser is launched with these
+LAUNCH_ARGS = ["--disable-blink-features=AutomationControlled"]
+
+
+def _process_table() -> dict[int, tuple[int, int]]:
+    """pid -> (parent pid, resident pages) for every process; empty without /proc."""
+    table = {}
+    if not os.path.isdir("/proc"):
+        return table
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+            with open(f"/proc/{entry}/statm") as f:
+                resident = int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue  # exited meanwhile
+        # The command name may contain spaces: fields resume after its ")"
+        table[int(entry)] = (int(stat.rsplit(")", 1)[1].split()[1]), resident)
+    return table
+
+
+def _descendants(table: dict[int, tuple[int, int]], root: int) -> set[int]:
+    found, frontier = set(), [root]
+    while frontier:
+        parent = frontier.pop()
+        for pid, (ppid, _) in table.items():
+            if ppid == parent and pid not in found:
+                found.add(pid)
+                frontier.append(pid)
+    return found
+
+
+def _child_processes() -> set[int]:
+    return _descendants(_process_table(), os.getpid())
+
+
+def _new_process_root(before: set[int]) -> int | None:
+    """The one process tree started under this process since ``before`` was
+    taken (a just-launched browser), or None if that isn't clear-cut."""
+    table = _process_table()
+    new = _descendants(table, os.getpid()) - before
+    roots = [pid for pid in new if table[pid][0] not in new]
+    return roots[0] if len(roots) == 1 else None
+
+
+def process_tree_mb(root: int) -> float | None:
+    """Resident memory of process ``root`` and its descendants, in MB. None
+    where /proc is missing or ``root`` has exited."""
+    table = _process_table()
+    if root not in table:
+        return None
+    pages = sum(table[pid][1] for pid in _descendants(table, root) | {root})
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+class _Browser:
+    """A launched async browser, its process and the contexts open on it."""
+
+    def __init__(self, browser, pid: int | None):
+        self.browser = browser
+        self.pid = pid  # root of the browser's process tree, if identified
+        self.loads = 0
+        self.open_contexts = 0
+        self.retired = False
+
+    def watch_page(self, page) -> None:
+        # Navigations, counted like the pages-loaded metric: one per load event
+        page.on("load", self._count_load)
+
+    def _count_load(self, _page) -> None:
+        self.loads += 1
+
+
+class _Engine:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        # Loop-side state, only touched from the engine's own thread
+        self._playwright = None
+        self._launching: asyncio.Lock | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._current: dict[bool, _Browser] = {}  # headless? -> browser taking new contexts
+        self._browsers: list[_Browser] = []  # current and retired-but-still-open
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._thread is not None and not self._thread.is_alive():
+                self._forget()  # a shutdown that timed out has since finished
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def serve():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=serve, name="scraper-engine", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def run(self, coro):
+        """Run ``coro`` on the engine's loop and wait for its result (from any other thread)."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def open_browsers(self) -> int:
+        return len(self._browsers)
+
+    async def _browser(self, headless: bool) -> _Browser:
+        if self._launching is None:
+            self._launching = asyncio.Lock()
+        async with self._launching:
+            current = self._current.get(headless)
+            if current is not None:
+                if current.browser.is_connected():
+                    return current
+                # Crashed or killed: forget it, or it counts as open for good
+                logger.warning("Shared browser (headless=%s) disconnected; relaunching", headless)
+                await self._drop(current)
+            if self._playwright is None:
+                from playwright.async_api import async_playwright
+                self._playwright = await async_playwright().start()
+            logger.info("Launching shared Chromium (headless=%s)", headless)
+            # Launches are serialised here, so the one new process tree is this browser
+            before = await asyncio.to_thread(_child_processes)
+            browser = await self._playwright.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+            launched = _Browser(browser, await asyncio.to_thread(_new_process_root, before))
+            self._current[headless] = launched
+            self._browsers.append(launched)
+            return launched
+
+    async def _drop(self, browser: _Browser) -> None:
+        """Take ``browser`` out of service at once, whatever is still open on it."""
+        browser.retired = True
+        for headless, current in list(self._current.items()):
+            if current is browser:
+                del self._current[headless]
+        if browser in self._browsers:
+            self._browsers.remove(browser)
+        await _quietly(browser.browser.close())
+
+    async def _retire(self, browser: _Browser, reason: str) -> None:
+        """Send new contexts to a fresh browser; ``browser`` closes with its last context."""
+        logger.info("Retiring shared browser after %s", reason)
+        metrics.BROWSER_RECYCLES.inc()
+        browser.retired = True
+        for headless, current in list(self._current.items()):
+            if current is browser:
+                del self._current[headless]
+        if browser.open_contexts == 0:
+            await self._drop(browser)
+
+    def _memory_by_browser(self) -> dict[_Browser, float]:
+        sizes = {}
+        for browser in self._browsers:
+            used = process_tree_mb(browser.pid) if browser.pid else None
+            if used is not None:
+                sizes[browser] = used
+        return sizes
+
+    async def _check_memory(self) -> None:
+        """Retire the largest browser once they together pass ``browser_recycle_mb``."""
+        if not settings.browser_recycle_mb:
+            return
+        sizes = await asyncio.to_thread(self._memory_by_browser)
+        total = sum(sizes.values())
+        if total <= settings.browser_recycle_mb:
+            return
+        largest = max(sizes, key=sizes.get)
+        if not largest.retired:  # else it is already on its way out
+            await self._retire(largest, f"browsers using {total:.0f} MB, this one {sizes[largest]:.0f} MB")
+
+    async def _context_closed(self, browser: _Browser) -> None:
+        browser.open_contexts -= 1
+        if not browser.retired and settings.browser_recycle_pages and browser.loads >= settings.browser_recycle_pages:
+            await self._retire(browser, f"{browser.loads} page loads")
+        elif browser.retired and browser.open_contexts == 0 and browser in self._browsers:
+            await self._drop(browser)
+        await self._check_memory()
+
+    @asynccontextmanager
+    async def context(self, headless: bool = True, **options):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(settings.scrape_max_contexts)
+        async with self._slots:
+            browser = await self._browser(headless)
+            browser.open_contexts += 1
+            try:
+                context = await browser.browser.new_context(**options)
+                context.on("page", browser.watch_page)
+                try:
+                    yield context
+                finally:
+                    await _quietly(context.close())
+            finally:
+                await self._context_closed(browser)
+
+    async def _close(self) -> None:
+        for browser in self._browsers:
+            await _quietly(browser.browser.close())
+        self._browsers.clear()
+        self._current.clear()
+        if self._playwright is not None:
+            await _quietly(self._playwright.stop())
+            self._playwright = None
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Close the shared browser and stop the loop; it starts afresh on next use."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._close(), loop).result(timeout)
+            except Exception as e:
+                logger.warning("Closing scraper browsers failed: %s", e)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if thread.is_alive():
+                # Its tasks may still be using the loop-side state: leave it be
+                logger.warning("Scraper engine loop still running after %.0fs; not stopping it", timeout)
+                return
+            self._forget()
+
+    def _forget(self) -> None:
+        """Drop the stopped loop and its state (call with ``_lock`` held)."""
+        self._loop.close()
+        self._loop = self._thread = None
+        self._playwright = self._launching = self._slots = None
+        self._current.clear()
+        self._browsers.clear()
+
+
+async def _quietly(awaitable) -> None:
+    try:
+        await awaitable
+    except Exception as e:
+        logger.debug("Ignoring error while closing: %s", e)
+
+
+_engine = _Engine()
+run = _engine.run
+shutdown = _engine.shutdown
+metrics.SCRAPER_BROWSERS.set_function(_engine.open_browsers)
+
+
+def browser_context(headless: bool = True, **options):
+    """``async with browser_context(...) as context``: a fresh ``BrowserContext``
+    on the shared browser, closed on exit. ``options`` go to ``new_context``."""
+    return _engine.context(headless, **options)
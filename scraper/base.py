@@ -1,7 +1,10 @@
 from __future__ import annotations
+import asyncio
 from abc import ABC, abstractmethod
 from typing import TypedDict
 
+import metrics
+
 class ScraperConfig(TypedDict, total=False):
     keywords: list[str]
     location: str
@@ -37,9 +40,24 @@ class BaseScraper(ABC):
     def scrape(self, config: ScraperConfig) -> list[ScraperResult]:
         ...
 
+    async def scrape_async(self, config: ScraperConfig) -> list[ScraperResult]:
+        """What the async engine (``scraper.async_engine``) awaits.
+
+        Browser scrapers override this, driving ``playwright.async_api`` on the
+        engine's shared browser. By default the sync ``scrape`` runs in a
+        worker thread, which suits scrapers that never open a browser.
+        """
+        return await asyncio.to_thread(self.scrape, config)
+
     @abstractmethod
     def generate_demo_results(self, config: ScraperConfig) -> list[ScraperResult]:
         ...
 
     def validate_credentials(self, credentials: dict) -> bool:
         return True
+
+    def track_page(self, page):
+        """Count every load of a Playwright ``page`` in the pages-loaded metric; returns the page."""
+        pages_loaded = metrics.SCRAPER_PAGES.labels(self.slug)
+        page.on("load", lambda _: pages_loaded.inc())
+        return page
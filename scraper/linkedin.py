@@ -1,15 +1,14 @@
 import re
 import time
 import json
+import asyncio
 import random
 import logging
 import os
 from urllib.parse import quote_plus
-try:
-    from playwright.sync_api import sync_playwright
-except ImportError:
-    sync_playwright = None
 from config import settings
+from scraper import async_engine, sessions
+from scraper.async_engine import browser_context
 from scraper.base import BaseScraper, ScraperConfig, ScraperResult
 
 logger = logging.getLogger("mastersales.scraper")
@@ -126,46 +125,50 @@ class LinkedInScraper(BaseScraper):
     def __init__(self, email: str = "", password: str = ""):
         self.email = email
         self.password = password
-        self.browser = None
+        self.context = None
         self.page = None
         self._api_responses = []
 
-    def _random_delay(self, label: str = ""):
+    async def _random_delay(self, label: str = ""):
         delay = random.uniform(settings.scrape_delay_min, settings.scrape_delay_max)
         if label:
             logger.info(f"  [{label}] waiting {delay:.1f}s...")
-        time.sleep(delay)
+        await asyncio.sleep(delay)
 
-    def _screenshot(self, name: str):
+    async def _screenshot(self, name: str):
         """Save a debug screenshot."""
         try:
             path = os.path.join(OUTPUT_DIR, f"{name}.png")
-            self.page.screenshot(path=path, full_page=True)
+            await self.page.screenshot(path=path, full_page=True)
             logger.info(f"  Screenshot saved: {path}")
         except Exception as e:
             logger.warning(f"  Screenshot failed: {e}")
 
-    def _login(self):
+    async def _login(self):
         """Log into LinkedIn."""
         logger.info("=" * 50)
         logger.info("SCRAPER: Starting LinkedIn login...")
         logger.info(f"  Email: {self.email[:3]}***@{self.email.split('@')[-1] if '@' in self.email else '***'}")
 
-        self.page.goto("https://www.linkedin.com/login")
-        self._random_delay("login page load")
+        await self.page.goto("https://www.linkedin.com/login")
+        await self._random_delay("login page load")
 
         # Wait for CAPTCHA to be solved if present (up to 120s for manual solving)
         captcha_selectors = ['iframe[src*="captcha"]', 'iframe[src*="recaptcha"]', '#captcha-internal']
-        has_captcha = any(self.page.query_selector(s) for s in captcha_selectors)
-        if has_captcha or "checkpoint" in self.page.url or "security" in self.page.content()[:2000].lower():
+        has_captcha = False
+        for selector in captcha_selectors:
+            if await self.page.query_selector(selector):
+                has_captcha = True
+                break
+        if has_captcha or "checkpoint" in self.page.url or "security" in (await self.page.content())[:2000].lower():
             logger.info("  CAPTCHA detected — waiting up to 120s for manual solving...")
             try:
-                self.page.wait_for_selector(
+                await self.page.wait_for_selector(
                     '#username, input[name="session_key"]',
                     timeout=120_000,
                 )
                 logger.info("  CAPTCHA solved — login form is now visible")
-                self._random_delay("post-captcha")
+                await self._random_delay("post-captcha")
             except Exception:
                 logger.error("  CAPTCHA not solved within 120s — aborting login")
                 raise Exception("LinkedIn CAPTCHA not solved in time")
@@ -175,9 +178,9 @@ class LinkedInScraper(BaseScraper):
         email_filled = False
         for selector in ['#username', 'input[name="session_key"]', 'input[autocomplete="username"]']:
             try:
-                el = self.page.query_selector(selector)
+                el = await self.page.query_selector(selector)
                 if el:
-                    el.fill(self.email)
+                    await el.fill(self.email)
                     email_filled = True
                     logger.info(f"  Email filled via: {selector}")
                     break
@@ -186,15 +189,15 @@ class LinkedInScraper(BaseScraper):
 
         if not email_filled:
             # LinkedIn may render duplicate inputs (desktop + mobile) — use .first
-            self.page.get_by_label("Email or phone").first.fill(self.email)
+            await self.page.get_by_label("Email or phone").first.fill(self.email)
             logger.info("  Email filled via label 'Email or phone' (.first)")
 
         pwd_filled = False
         for selector in ['#password', 'input[name="session_password"]', 'input[autocomplete="current-password"]']:
             try:
-                el = self.page.query_selector(selector)
+                el = await self.page.query_selector(selector)
                 if el:
-                    el.fill(self.password)
+                    await el.fill(self.password)
                     pwd_filled = True
                     logger.info(f"  Password filled via: {selector}")
                     break
@@ -202,7 +205,7 @@ class LinkedInScraper(BaseScraper):
                 continue
 
         if not pwd_filled:
-            self.page.get_by_label("Password").first.fill(self.password)
+            await self.page.get_by_label("Password").first.fill(self.password)
             logger.info("  Password filled via label 'Password' (.first)")
 
         logger.info("  Submitting login form...")
@@ -210,19 +213,19 @@ class LinkedInScraper(BaseScraper):
         submitted = False
         for selector in ['button[type="submit"]', 'button:has-text("Sign in")', 'button.btn__primary--large']:
             try:
-                el = self.page.query_selector(selector)
+                el = await self.page.query_selector(selector)
                 if el:
-                    el.click()
+                    await el.click()
                     submitted = True
                     break
             except Exception:
                 continue
         if not submitted:
-            self.page.get_by_role("button", name="Sign in").first.click()
-        self._random_delay("login submit")
+            await self.page.get_by_role("button", name="Sign in").first.click()
+        await self._random_delay("login submit")
 
         try:
-            self.page.wait_for_url("**/feed*", timeout=30000)
+            await self.page.wait_for_url("**/feed*", timeout=30000)
             logger.info("  LOGIN SUCCESS - redirected to feed")
         except Exception as e:
             current_url = self.page.url
@@ -241,10 +244,25 @@ class LinkedInScraper(BaseScraper):
             else:
                 logger.error(f"  REASON: Unexpected redirect to {current_url}")
 
-            self._screenshot("login_error")
+            await self._screenshot("login_error")
             raise Exception(f"LinkedIn login failed. Current URL: {current_url}")
 
-    def _on_response(self, response):
+    async def _resume_session(self) -> bool:
+        """Check a saved session with one feed load; False (and forget it) if LinkedIn wants a login."""
+        logger.info("SCRAPER: Checking saved LinkedIn session...")
+        try:
+            await self.page.goto("https://www.linkedin.com/feed/", wait_until="domcontentloaded", timeout=20000)
+        except Exception as e:
+            logger.warning(f"  Feed check failed: {e}")
+        current_url = self.page.url
+        if "/feed" in current_url and not any(m in current_url for m in ("/login", "checkpoint", "authwall")):
+            logger.info("  SESSION VALID - skipping login")
+            return True
+        logger.info(f"  Saved session expired (landed on {current_url}) — logging in again")
+        await asyncio.to_thread(sessions.clear, self.slug, self.email)
+        return False
+
+    async def _on_response(self, response):
         """Intercept LinkedIn API responses containing search results."""
         url = response.url
         # LinkedIn API endpoints that may contain search data
@@ -260,13 +278,13 @@ class LinkedInScraper(BaseScraper):
             try:
                 ct = response.headers.get("content-type", "")
                 if response.status == 200 and ("json" in ct or "octet-stream" in ct):
-                    body = response.json()
+                    body = await response.json()
                     self._api_responses.append(body)
                     logger.info(f"  Intercepted API: ...{url.split('?')[0][-60:]}")
             except Exception:
                 pass
 
-    def search_people(self, keywords: list[str], location: str, max_results: int = 20) -> list[dict]:
+    async def search_people(self, keywords: list[str], location: str, max_results: int = 20) -> list[dict]:
         """Search LinkedIn for people matching keywords and location.
 
         Uses DOM extraction as the primary strategy since it reads the rendered
@@ -279,26 +297,35 @@ class LinkedInScraper(BaseScraper):
         search_queries = self._build_search_queries(keywords)
 
         logger.info("=" * 50)
-        logger.info("SCRAPER: Initializing Playwright browser...")
+        logger.info("SCRAPER: Opening browser context...")
         logger.info(f"  Keywords: {keywords}")
         logger.info(f"  Search queries: {search_queries}")
         logger.info(f"  Location: {location}")
         logger.info(f"  Max results: {max_results}")
 
-        with sync_playwright() as p:
-            logger.info("  Launching headless Chromium...")
-            self.browser = p.chromium.launch(headless=False)
-            context = self.browser.new_context(
-                viewport={"width": 1280, "height": 900},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
-            )
-            self.page = context.new_page()
+        # A fresh context on the shared, already running browser, carrying the
+        # cookies of the last login if there is a saved one
+        saved = await asyncio.to_thread(sessions.load, self.slug, self.email)
+        saved_state, logged_in_at = saved or (None, None)
+        async with browser_context(
+            headless=False,
+            viewport={"width": 1280, "height": 900},
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+            storage_state=saved_state,
+        ) as context:
+            self.context = context
+            self.page = self.track_page(await context.new_page())
 
             # Intercept network responses
             self.page.on("response", self._on_response)
 
             try:
-                self._login()
+                if not (saved_state and await self._resume_session()):
+                    await self._login()
+                    logged_in_at = time.time()
+                # Saved on every run so LinkedIn's refreshed cookies carry over;
+                # the login time stays that of the original login
+                await asyncio.to_thread(sessions.save, self.slug, self.email, await context.storage_state(), logged_in_at)
 
                 geo_param = _build_geo_param(location)
                 logger.info(f"  Geo filter: {location} → {geo_param}")
@@ -317,26 +344,26 @@ class LinkedInScraper(BaseScraper):
                         self._api_responses.clear()
 
                         if page_num == 1:
-                            self.page.goto(search_url)
+                            await self.page.goto(search_url)
                         else:
-                            self.page.goto(f"{search_url}&page={page_num}")
+                            await self.page.goto(f"{search_url}&page={page_num}")
 
-                        self._random_delay("search page load")
-                        self.page.wait_for_load_state("domcontentloaded", timeout=15000)
-                        time.sleep(3)
+                        await self._random_delay("search page load")
+                        await self.page.wait_for_load_state("domcontentloaded", timeout=15000)
+                        await asyncio.sleep(3)
 
                         # Scroll to trigger lazy loading
-                        self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                        time.sleep(2)
+                        await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                        await asyncio.sleep(2)
 
-                        self._screenshot(f"search_q{q_idx+1}_page_{page_num}")
+                        await self._screenshot(f"search_q{q_idx+1}_page_{page_num}")
 
                         # Save HTML for first search for debugging
                         if q_idx == 0 and page_num == 1:
                             try:
                                 html_path = os.path.join(OUTPUT_DIR, "search_page_debug.html")
                                 with open(html_path, "w", encoding="utf-8") as f:
-                                    f.write(self.page.content())
+                                    f.write(await self.page.content())
                                 logger.info(f"  Page HTML saved: {html_path}")
                             except Exception:
                                 pass
@@ -344,7 +371,7 @@ class LinkedInScraper(BaseScraper):
                         logger.info(f"  Processing page {page_num}...")
 
                         # DOM extraction is our primary strategy
-                        page_people = self._extract_from_dom()
+                        page_people = await self._extract_from_dom()
                         logger.info(f"  DOM extraction: found {len(page_people)} people")
 
                         # API interception as supplement for missing fields
@@ -370,7 +397,7 @@ class LinkedInScraper(BaseScraper):
                             logger.warning(f"  No results on page {page_num}")
                             empty_pages += 1
                             if empty_pages >= 2 or page_num == 1:
-                                self._dump_page_debug()
+                                await self._dump_page_debug()
                                 break
                             continue
 
@@ -393,7 +420,7 @@ class LinkedInScraper(BaseScraper):
                             break
 
                         # Check for next page
-                        has_next = self.page.evaluate('''
+                        has_next = await self.page.evaluate('''
                             () => {
                                 const btns = document.querySelectorAll('button[aria-label="Next"]');
                                 for (const btn of btns) {
@@ -408,17 +435,16 @@ class LinkedInScraper(BaseScraper):
 
                         logger.info(f"  Moving to page {page_num + 1}...")
                         page_num += 1
-                        self._random_delay("next page")
+                        await self._random_delay("next page")
 
-                    self._random_delay("between searches")
+                    await self._random_delay("between searches")
 
             except Exception as e:
                 logger.error(f"SCRAPER ERROR: {e}")
-                self._screenshot("scraper_error")
+                await self._screenshot("scraper_error")
                 raise
             finally:
-                logger.info("SCRAPER: Closing browser...")
-                self.browser.close()
+                logger.info("SCRAPER: Closing browser context...")
 
         logger.info("=" * 50)
         logger.info(f"SCRAPER: Complete. Found {len(results)} leads.")
@@ -455,7 +481,7 @@ class LinkedInScraper(BaseScraper):
 
     # ── DOM extraction (primary) ─────────────────────────────────────────
 
-    def _extract_from_dom(self) -> list[dict]:
+    async def _extract_from_dom(self) -> list[dict]:
         """Extract people from DOM using LinkedIn's current HTML structure.
 
         LinkedIn uses data-view-name="search-entity-result-universal-template"
@@ -465,7 +491,7 @@ class LinkedInScraper(BaseScraper):
         """
         people = []
 
-        raw = self.page.evaluate('''
+        raw = await self.page.evaluate('''
             () => {
                 const results = [];
                 // Current LinkedIn selector (2025+)
@@ -875,13 +901,13 @@ class LinkedInScraper(BaseScraper):
 
     # ── Debug ────────────────────────────────────────────────────────────
 
-    def _dump_page_debug(self):
+    async def _dump_page_debug(self):
         """Log debug info when extraction fails."""
         try:
             logger.info(f"  Page URL: {self.page.url}")
-            logger.info(f"  Page title: {self.page.title()}")
+            logger.info(f"  Page title: {await self.page.title()}")
 
-            info = self.page.evaluate('''
+            info = await self.page.evaluate('''
                 () => {
                     return {
                         searchCards: document.querySelectorAll('[data-view-name="people-search-result"]').length,
@@ -898,7 +924,7 @@ class LinkedInScraper(BaseScraper):
 
             # Save page HTML for offline debugging
             html_path = os.path.join(OUTPUT_DIR, "search_page_debug.html")
-            html = self.page.content()
+            html = await self.page.content()
             with open(html_path, "w", encoding="utf-8") as f:
                 f.write(html)
             logger.info(f"  Full page HTML saved: {html_path}")
@@ -908,6 +934,9 @@ class LinkedInScraper(BaseScraper):
     # ---- BaseScraper interface ----
 
     def scrape(self, config: ScraperConfig) -> list[ScraperResult]:
+        return async_engine.run(self.scrape_async(config))
+
+    async def scrape_async(self, config: ScraperConfig) -> list[ScraperResult]:
         creds = config.get("credentials", {})
         email = creds.get("email", "")
         password = creds.get("password", "")
@@ -915,7 +944,7 @@ class LinkedInScraper(BaseScraper):
             return self.generate_demo_results(config)
         self.email = email
         self.password = password
-        raw_results = self.search_people(
+        raw_results = await self.search_people(
             config.get("keywords", []),
             config.get("location", "Australia"),
             config.get("max_results", 20),
@@ -1,14 +1,17 @@
+import asyncio
 import logging
 import time
 import random
 import threading
+import metrics
+from database.dedup import contact_key, linkedin_key
 from scraper.base import BaseScraper, ScraperConfig, ScraperResult
+from scraper import async_engine
 
 logger = logging.getLogger("mastersales.scraper")
 SCRAPERS: dict[str, type[BaseScraper]] = {}
 _lock = threading.Lock()
 _cancel_event = threading.Event()
-_browser_semaphore = threading.Semaphore(5)
 
 
 # ---------------------------------------------------------------------------
@@ -137,8 +140,13 @@ def generate_demo_data(
 # Deduplication
 # ---------------------------------------------------------------------------
 
-def _dedup_key(r: dict) -> str:
-    return f"{r['first_name'].lower().strip()}|{r['last_name'].lower().strip()}|{r['company_name'].lower().strip()}"
+def _dedup_key(r: dict) -> str | None:
+    """Same normalised keys the CRM stores, so merges here match its duplicate check."""
+    key = contact_key(r.get("first_name"), r.get("last_name"), r.get("company_name"))
+    if key:
+        return key
+    url = linkedin_key(r.get("linkedin_url"))
+    return f"url|{url}" if url else None
 
 
 def _richness(r: dict) -> int:
@@ -153,8 +161,8 @@ def _richness(r: dict) -> int:
 def dedup_results(results: list[dict]) -> list[dict]:
     """Cross-source dedup: keep richer record, combine source_names."""
     seen: dict[str, dict] = {}
-    for r in results:
-        key = _dedup_key(r)
+    for i, r in enumerate(results):
+        key = _dedup_key(r) or f"row|{i}"  # nothing to match on: keep as-is
         if key in seen:
             existing = seen[key]
             # Combine source names
@@ -196,7 +204,7 @@ def run_scrape(
     source_configs: dict | None = None,
     live_status: dict | None = None,
 ) -> tuple[list[ScraperResult], dict]:
-    """Run scrape across multiple sources in parallel.
+    """Run scrape across multiple sources concurrently; blocks until done.
 
     Args:
         live_status: If provided, this dict is updated in real-time so the
@@ -204,6 +212,21 @@ def run_scrape(
 
     Returns (deduped_results, status_dict).
     """
+    return async_engine.run(run_scrape_async(
+        sources, keywords, location, max_results, credentials, source_configs, live_status,
+    ))
+
+
+async def run_scrape_async(
+    sources: list[str],
+    keywords: list[str],
+    location: str = "Australia",
+    max_results: int = 20,
+    credentials: dict | None = None,
+    source_configs: dict | None = None,
+    live_status: dict | None = None,
+) -> tuple[list[ScraperResult], dict]:
+    """``run_scrape`` on the async engine: every source is a task on one event loop."""
     credentials = credentials or {}
     source_configs = source_configs or {}
     _cancel_event.clear()
@@ -216,9 +239,10 @@ def run_scrape(
 
     all_results: list[dict] = []
 
-    def _run_source(slug: str) -> None:
-        scraper_cls = SCRAPERS.get(slug)
+    async def _run_source(slug: str) -> None:
+        scraper_cls = get_scrapers().get(slug)
         if scraper_cls is None:
+            metrics.SCRAPER_FAILURES.labels(slug).inc()
             with _lock:
                 status["sources"][slug] = {"status": "error", "found": 0}
             return
@@ -243,17 +267,13 @@ def run_scrape(
         with _lock:
             status["sources"][slug] = {"status": "running", "found": 0}
 
-        acquired = False
         try:
-            if scraper.uses_browser:
-                _browser_semaphore.acquire()
-                acquired = True
-
             if needs_auth and not has_creds:
                 logger.info("[%s] No credentials provided — skipping (demo disabled)", slug)
                 results = []
             else:
-                results = scraper.scrape(config)
+                results = await scraper.scrape_async(config)
+            metrics.SCRAPER_RESULTS.labels(slug).inc(len(results))
 
             with _lock:
                 all_results.extend(results)
@@ -263,20 +283,11 @@ def run_scrape(
                 )
         except Exception as e:
             logger.exception("Scraper %s failed: %s", slug, e)
+            metrics.SCRAPER_FAILURES.labels(slug).inc()
             with _lock:
                 status["sources"][slug] = {"status": "error", "found": 0}
-        finally:
-            if acquired:
-                _browser_semaphore.release()
-
-    threads: list[threading.Thread] = []
-    for slug in sources:
-        t = threading.Thread(target=_run_source, args=(slug,), daemon=True)
-        threads.append(t)
-        t.start()
 
-    for t in threads:
-        t.join()
+    await asyncio.gather(*(_run_source(slug) for slug in sources))
 
     deduped = dedup_results(all_results)
 
@@ -312,7 +323,7 @@ def _fair_merge(
         # Map sub-sources to parent (e.g. "AusTender" -> "tenders_au")
         matched_slug = None
         for slug in sources:
-            scraper_cls = SCRAPERS.get(slug)
+            scraper_cls = get_scrapers().get(slug)
             if scraper_cls and primary.startswith(scraper_cls.name.split()[0]):
                 matched_slug = slug
                 break
@@ -349,7 +360,7 @@ def _fair_merge(
 
 
 # ---------------------------------------------------------------------------
-# Scraper registration (called in Task 10 after all scrapers exist)
+# Scraper registration (on first use: the scraper modules pull in Playwright)
 # ---------------------------------------------------------------------------
 
 def _register_scrapers():
@@ -366,4 +377,7 @@ def _register_scrapers():
     }
 
 
-_register_scrapers()
+def get_scrapers() -> dict[str, type[BaseScraper]]:
+    if not SCRAPERS:
+        _register_scrapers()
+    return SCRAPERS
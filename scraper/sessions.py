@@ -0,0 +1,99 @@
+"""Saved browser sessions, so a scraper with a login doesn't log in on every run.
+
+After logging in, a scraper saves its context's ``storage_state()`` (cookies
+and localStorage) with ``save(slug, account, state, logged_in_at)``. The next
+scrape opens its context with the state from ``load(slug, account)`` and only
+logs in again if the site no longer accepts it, calling ``clear()`` first.
+
+States live in ``app_settings``, one row per scraper and account, encrypted
+with a key derived from ``secret_key``: a saved session is as good as the
+account's password, so nothing is saved while ``secret_key`` is the shipped
+default. Changing ``secret_key`` invalidates every saved session.
+Each state carries the time of the login it came from, kept across re-saves,
+and ``load`` ignores it once that login is more than ``scrape_session_max_age``
+seconds old, however often the session has been used since.
+"""
+import base64
+import hashlib
+import json
+import logging
+import time
+
+from cryptography.fernet import Fernet, InvalidToken
+from sqlalchemy import delete
+from sqlalchemy.exc import SQLAlchemyError
+
+from config import settings
+from database.db import SessionLocal
+from database.models import AppSetting
+
+logger = logging.getLogger("mastersales.scraper.sessions")
+
+
+def _fernet() -> Fernet:
+    digest = hashlib.sha256(b"scraper-session:" + settings.secret_key.encode()).digest()
+    return Fernet(base64.urlsafe_b64encode(digest))
+
+
+def _key(slug: str, account: str) -> str:
+    # The account (an email) is hashed so it doesn't sit in the table in clear
+    account_hash = hashlib.sha256(account.strip().lower().encode()).hexdigest()[:16]
+    return f"session:{slug}:{account_hash}"
+
+
+def load(slug: str, account: str) -> tuple[dict, float] | None:
+    """The saved ``(storage_state, logged_in_at)`` for ``account`` on ``slug``,
+    or None if there is none, its login is too old or it can't be decrypted."""
+    try:
+        with SessionLocal() as db:
+            row = db.get(AppSetting, _key(slug, account))
+            token = row.value if row else None
+    except SQLAlchemyError as e:
+        logger.warning("Could not read saved %s session: %s", slug, e)
+        return None
+    if not token:
+        return None
+    try:
+        saved = json.loads(_fernet().decrypt(token.encode()))
+    except InvalidToken:
+        logger.info("Saved %s session can't be decrypted (another secret key?)", slug)
+        return None
+    try:
+        state, logged_in_at = saved["state"], float(saved["logged_in_at"])
+    except (KeyError, TypeError, ValueError):
+        # Saved in an older format: forget it and log in afresh
+        logger.info("Saved %s session is in an unknown format; discarding it", slug)
+        clear(slug, account)
+        return None
+    max_age = settings.scrape_session_max_age
+    if max_age and time.time() - logged_in_at > max_age:
+        logger.info("Saved %s session is from a login over %ss ago", slug, max_age)
+        return None
+    return state, logged_in_at
+
+
+def save(slug: str, account: str, state: dict, logged_in_at: float) -> None:
+    """Encrypt and store ``state`` from the login at ``logged_in_at`` (a Unix
+    time), replacing any earlier one. Nothing is saved while ``secret_key`` is
+    the shipped default: the key would be public."""
+    if settings.secret_key == type(settings).model_fields["secret_key"].default:
+        logger.warning("SECRET_KEY is still the default, so the %s login is not saved "
+                       "and every scrape logs in afresh; set SECRET_KEY", slug)
+        return
+    payload = json.dumps({"state": state, "logged_in_at": logged_in_at})
+    token = _fernet().encrypt(payload.encode()).decode()
+    try:
+        with SessionLocal() as db:
+            db.merge(AppSetting(key=_key(slug, account), value=token))
+            db.commit()
+    except SQLAlchemyError as e:
+        logger.warning("Could not save %s session: %s", slug, e)
+
+
+def clear(slug: str, account: str) -> None:
+    try:
+        with SessionLocal() as db:
+            db.execute(delete(AppSetting).where(AppSetting.key == _key(slug, account)))
+            db.commit()
+    except SQLAlchemyError as e:
+        logger.warning("Could not clear saved %s session: %s", slug, e)
@@ -1,6 +1,8 @@
 # scraper/tenders_au.py
 import logging
 from datetime import datetime, timedelta
+from scraper import async_engine
+from scraper.async_engine import browser_context
 from scraper.base import BaseScraper, ScraperConfig, ScraperResult
 
 logger = logging.getLogger("mastersales.scraper.tenders_au")
@@ -48,6 +50,9 @@ class AusTenderScraper(BaseScraper):
     credential_fields = []
 
     def scrape(self, config: ScraperConfig) -> list[ScraperResult]:
+        return async_engine.run(self.scrape_async(config))
+
+    async def scrape_async(self, config: ScraperConfig) -> list[ScraperResult]:
         from scraper.search_engine import is_cancelled
 
         max_results = config.get("max_results", 20)
@@ -56,20 +61,16 @@ class AusTenderScraper(BaseScraper):
         results: list[ScraperResult] = []
 
         try:
-            from playwright.sync_api import sync_playwright
+            import playwright.async_api  # noqa: F401
         except ImportError:
             logger.warning("[AU Tenders] Playwright not installed — cannot scrape")
             return []
 
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(
-                    headless=True,
-                    args=["--disable-blink-features=AutomationControlled"],
-                )
-                page = browser.new_page(
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
-                )
+            async with browser_context(
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+            ) as context:
+                page = self.track_page(await context.new_page())
 
                 # Always scrape AusTender (federal)
                 portals_to_scrape = ["austender"]
@@ -87,30 +88,28 @@ class AusTenderScraper(BaseScraper):
 
                     portal = AU_PORTALS[portal_slug]
                     try:
-                        entries = self._scrape_portal(
+                        entries = await self._scrape_portal(
                             page, portal, keywords, config, max_results - len(results)
                         )
                         results.extend(entries)
                         logger.info(f"[AU Tenders] {portal['name']}: found {len(entries)} entries")
                     except Exception as e:
                         logger.warning(f"[AU Tenders] {portal['name']} failed: {e}")
-
-                browser.close()
         except Exception as e:
             logger.error(f"[AU Tenders] Scraper error: {e}")
 
         return results[:max_results]
 
-    def _scrape_portal(
+    async def _scrape_portal(
         self, page, portal: dict, keywords: list[str], config: ScraperConfig, limit: int
     ) -> list[ScraperResult]:
         """Scrape a single tender portal for awarded contracts matching keywords."""
         # Use specialised path for AusTender Contract Notices
         if portal.get("name") == "AusTender":
-            return self._scrape_austender_cn(page, portal, keywords, limit)
-        return self._scrape_generic_portal(page, portal, keywords, limit)
+            return await self._scrape_austender_cn(page, portal, keywords, limit)
+        return await self._scrape_generic_portal(page, portal, keywords, limit)
 
-    def _scrape_austender_cn(
+    async def _scrape_austender_cn(
         self, page, portal: dict, keywords: list[str], limit: int
     ) -> list[ScraperResult]:
         """Scrape AusTender Contract Notices via the 'View by Publish Date' button.
@@ -124,24 +123,24 @@ class AusTenderScraper(BaseScraper):
         url = f"{base_url}{portal['search_path']}"
 
         try:
-            page.goto(url, timeout=25000)
-            page.wait_for_load_state("domcontentloaded", timeout=15000)
+            await page.goto(url, timeout=25000)
+            await page.wait_for_load_state("domcontentloaded", timeout=15000)
 
             # Click the "View" button to load results by publish date
             try:
-                page.get_by_role("button", name="View").click()
+                await page.get_by_role("button", name="View").click()
             except Exception:
                 try:
-                    page.locator('button:has-text("View")').click()
+                    await page.locator('button:has-text("View")').click()
                 except Exception:
                     # Last resort: submit the form
-                    page.get_by_role("button", name="Search").click()
+                    await page.get_by_role("button", name="Search").click()
 
-            page.wait_for_load_state("domcontentloaded", timeout=20000)
+            await page.wait_for_load_state("domcontentloaded", timeout=20000)
 
             # Extract results from articles, paginating as needed
             while len(results) < limit:
-                page_results = self._extract_article_results(page, portal)
+                page_results = await self._extract_article_results(page, portal)
                 if not page_results:
                     break
                 results.extend(page_results)
@@ -150,16 +149,15 @@ class AusTenderScraper(BaseScraper):
                     break
 
                 # Try to navigate to the next page
-                next_link = page.query_selector('a[href*="page="]')
                 # Find the "next page" link — look for page=N where N > current
                 next_page_found = False
-                links = page.query_selector_all('a[href*="page="]')
+                links = await page.query_selector_all('a[href*="page="]')
                 for link in links:
-                    text = link.inner_text().strip()
+                    text = (await link.inner_text()).strip()
                     # Look for "Next" or ">" or a number that's the next page
                     if text in ("Next", ">", "»", "next"):
-                        link.click()
-                        page.wait_for_load_state("domcontentloaded", timeout=15000)
+                        await link.click()
+                        await page.wait_for_load_state("domcontentloaded", timeout=15000)
                         next_page_found = True
                         break
                 if not next_page_found:
@@ -170,7 +168,7 @@ class AusTenderScraper(BaseScraper):
 
         return results[:limit]
 
-    def _extract_article_results(self, page, portal: dict) -> list[ScraperResult]:
+    async def _extract_article_results(self, page, portal: dict) -> list[ScraperResult]:
         """Extract company/contact data from AusTender <article> elements.
 
         Each article contains a heading (contract title) and div pairs
@@ -178,11 +176,11 @@ class AusTenderScraper(BaseScraper):
         """
         results = []
         base_url = portal["base_url"]
-        articles = page.query_selector_all("article")
+        articles = await page.query_selector_all("article")
 
         for article in articles:
             try:
-                text = article.inner_text()
+                text = await article.inner_text()
                 lines = [l.strip() for l in text.split("\n") if l.strip()]
                 if len(lines) < 2:
                     continue
@@ -194,9 +192,9 @@ class AusTenderScraper(BaseScraper):
                 title = None
 
                 # Try to get heading (h2) for contract title
-                heading = article.query_selector("h2, h3, heading")
+                heading = await article.query_selector("h2, h3, heading")
                 if heading:
-                    title = heading.inner_text().strip()
+                    title = (await heading.inner_text()).strip()
                 elif lines:
                     title = lines[0]
 
@@ -227,17 +225,17 @@ class AusTenderScraper(BaseScraper):
 
                 # Try to find "Full Details" link for source URL
                 source_url = None
-                links = article.query_selector_all("a[href]")
+                links = await article.query_selector_all("a[href]")
                 for link in links:
-                    link_text = link.inner_text().strip().lower()
+                    link_text = (await link.inner_text()).strip().lower()
                     if "full details" in link_text or "detail" in link_text:
-                        href = link.get_attribute("href")
+                        href = await link.get_attribute("href")
                         if href:
                             source_url = href if href.startswith("http") else f"{base_url}{href}"
                         break
                 # Fallback: use first link
                 if not source_url and links:
-                    href = links[0].get_attribute("href")
+                    href = await links[0].get_attribute("href")
                     if href:
                         source_url = href if href.startswith("http") else f"{base_url}{href}"
 
@@ -259,7 +257,7 @@ class AusTenderScraper(BaseScraper):
 
         return results
 
-    def _scrape_generic_portal(
+    async def _scrape_generic_portal(
         self, page, portal: dict, keywords: list[str], limit: int
     ) -> list[ScraperResult]:
         """Scrape a generic state tender portal."""
@@ -268,8 +266,8 @@ class AusTenderScraper(BaseScraper):
         url = f"{portal['base_url']}{portal['search_path']}"
 
         try:
-            page.goto(url, timeout=20000)
-            page.wait_for_load_state("domcontentloaded", timeout=15000)
+            await page.goto(url, timeout=20000)
+            await page.wait_for_load_state("domcontentloaded", timeout=15000)
 
             # Try to find and fill search input
             search_selectors = [
@@ -280,9 +278,9 @@ class AusTenderScraper(BaseScraper):
             filled = False
             for sel in search_selectors:
                 try:
-                    el = page.query_selector(sel)
+                    el = await page.query_selector(sel)
                     if el:
-                        el.fill(keyword_str)
+                        await el.fill(keyword_str)
                         filled = True
                         break
                 except Exception:
@@ -296,32 +294,32 @@ class AusTenderScraper(BaseScraper):
                 ]
                 for sel in submit_selectors:
                     try:
-                        btn = page.query_selector(sel)
+                        btn = await page.query_selector(sel)
                         if btn:
-                            btn.click()
-                            page.wait_for_load_state("domcontentloaded", timeout=15000)
+                            await btn.click()
+                            await page.wait_for_load_state("domcontentloaded", timeout=15000)
                             break
                     except Exception:
                         continue
 
             # Extract results from table rows or cards
-            results = self._extract_tender_results(page, portal)
+            results = await self._extract_tender_results(page, portal)
 
         except Exception as e:
             logger.warning(f"[AU Tenders] Portal {portal['name']} scrape error: {e}")
 
         return results[:limit]
 
-    def _extract_tender_results(self, page, portal: dict) -> list[ScraperResult]:
+    async def _extract_tender_results(self, page, portal: dict) -> list[ScraperResult]:
         """Extract company/contact data from tender search results.
 
         Handles both <article>-based layouts (AusTender) and traditional
         table/list layouts (state portals).
         """
         # First try article-based extraction (AusTender style)
-        articles = page.query_selector_all("article")
+        articles = await page.query_selector_all("article")
         if articles:
-            return self._extract_article_results(page, portal)
+            return await self._extract_article_results(page, portal)
 
         # Fallback: table rows or list items (state portals)
         results = []
@@ -331,12 +329,12 @@ class AusTenderScraper(BaseScraper):
         ]
 
         for selector in row_selectors:
-            rows = page.query_selector_all(selector)
+            rows = await page.query_selector_all(selector)
             if not rows:
                 continue
 
             for row in rows:
-                text = row.inner_text()
+                text = await row.inner_text()
                 lines = [l.strip() for l in text.split("\n") if l.strip()]
                 if len(lines) < 2:
                     continue
@@ -367,10 +365,10 @@ class AusTenderScraper(BaseScraper):
                     elif len(parts) == 1:
                         first_name = parts[0]
 
-                link = row.query_selector("a[href]")
+                link = await row.query_selector("a[href]")
                 source_url = None
                 if link:
-                    href = link.get_attribute("href")
+                    href = await link.get_attribute("href")
                     if href:
                         source_url = href if href.startswith("http") else f"{portal['base_url']}{href}"
 
@@ -1,5 +1,7 @@
 # scraper/tenders_nz.py
 import logging
+from scraper import async_engine
+from scraper.async_engine import browser_context
 from scraper.base import BaseScraper, ScraperConfig, ScraperResult
 
 logger = logging.getLogger("mastersales.scraper.tenders_nz")
@@ -18,6 +20,9 @@ class GETSScraper(BaseScraper):
     GETS_CURRENT = "/ExternalIndex.htm"
 
     def scrape(self, config: ScraperConfig) -> list[ScraperResult]:
+        return async_engine.run(self.scrape_async(config))
+
+    async def scrape_async(self, config: ScraperConfig) -> list[ScraperResult]:
         from scraper.search_engine import is_cancelled
 
         max_results = config.get("max_results", 20)
@@ -25,44 +30,38 @@ class GETSScraper(BaseScraper):
         results: list[ScraperResult] = []
 
         try:
-            from playwright.sync_api import sync_playwright
+            import playwright.async_api  # noqa: F401
         except ImportError:
             logger.warning("[GETS] Playwright not installed — cannot scrape")
             return []
 
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(
-                    headless=True,
-                    args=["--disable-blink-features=AutomationControlled"],
-                )
-                page = browser.new_page(
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
-                )
+            async with browser_context(
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+            ) as context:
+                page = self.track_page(await context.new_page())
 
                 keyword_str = " ".join(keywords[:3])
 
                 # --- Phase 1: Completed/awarded tenders (supplier data) ---
-                results.extend(self._scrape_gets_page(
+                results.extend(await self._scrape_gets_page(
                     page, self.GETS_AWARDED, keyword_str,
                     max_results, is_cancelled, source_label="awarded",
                 ))
 
                 # --- Phase 2: Current tenders (procuring agencies) ---
                 if len(results) < max_results and not is_cancelled():
-                    results.extend(self._scrape_gets_page(
+                    results.extend(await self._scrape_gets_page(
                         page, self.GETS_CURRENT, keyword_str,
                         max_results - len(results), is_cancelled,
                         source_label="current",
                     ))
-
-                browser.close()
         except Exception as e:
             logger.error(f"[GETS] Scraper error: {e}")
 
         return results[:max_results]
 
-    def _scrape_gets_page(
+    async def _scrape_gets_page(
         self, page, path: str, keyword_str: str, limit: int, is_cancelled, source_label: str
     ) -> list[ScraperResult]:
         """Scrape a single GETS listing page (awarded or current tenders)."""
@@ -70,8 +69,8 @@ class GETSScraper(BaseScraper):
         url = f"{self.GETS_BASE}{path}"
 
         try:
-            page.goto(url, timeout=20000)
-            page.wait_for_load_state("domcontentloaded", timeout=15000)
+            await page.goto(url, timeout=20000)
+            await page.wait_for_load_state("domcontentloaded", timeout=15000)
 
             # Fill search box if keywords provided.  The GETS search form
             # uses a plain textbox without a distinguishing name attribute,
@@ -85,9 +84,9 @@ class GETSScraper(BaseScraper):
                 ]
                 for sel in search_selectors:
                     try:
-                        el = page.query_selector(sel)
+                        el = await page.query_selector(sel)
                         if el:
-                            el.fill(keyword_str)
+                            await el.fill(keyword_str)
                             filled = True
                             break
                     except Exception:
@@ -96,7 +95,7 @@ class GETSScraper(BaseScraper):
                 # If CSS selectors failed, try Playwright role locator
                 if not filled:
                     try:
-                        page.get_by_role("textbox").first.fill(keyword_str)
+                        await page.get_by_role("textbox").first.fill(keyword_str)
                         filled = True
                     except Exception:
                         pass
@@ -110,18 +109,18 @@ class GETSScraper(BaseScraper):
                         'button[type="submit"]',
                     ]:
                         try:
-                            btn = page.query_selector(sel)
+                            btn = await page.query_selector(sel)
                             if btn:
-                                btn.click()
-                                page.wait_for_load_state("domcontentloaded", timeout=15000)
+                                await btn.click()
+                                await page.wait_for_load_state("domcontentloaded", timeout=15000)
                                 submitted = True
                                 break
                         except Exception:
                             continue
                     if not submitted:
                         try:
-                            page.get_by_role("button", name="Submit").click()
-                            page.wait_for_load_state("domcontentloaded", timeout=15000)
+                            await page.get_by_role("button", name="Submit").click()
+                            await page.wait_for_load_state("domcontentloaded", timeout=15000)
                         except Exception:
                             pass
 
@@ -129,33 +128,33 @@ class GETSScraper(BaseScraper):
             # GETS tables have 6 columns:
             #   0: RFx ID, 1: Reference #, 2: Title, 3: Tender Type,
             #   4: Close Date, 5: Organisation
-            rows = page.query_selector_all("table tr")
+            rows = await page.query_selector_all("table tr")
             for row in rows:
                 if is_cancelled() or len(results) >= limit:
                     break
 
-                cells = row.query_selector_all("td")
+                cells = await row.query_selector_all("td")
                 if len(cells) < 3:
                     continue  # skip header rows or malformed rows
 
                 # Extract title from cell index 2 (third column)
                 title = ""
                 if len(cells) > 2:
-                    title = cells[2].inner_text().strip()
+                    title = (await cells[2].inner_text()).strip()
 
                 # Extract organisation from cell index 5 (sixth column)
                 organisation = ""
                 if len(cells) > 5:
-                    organisation = cells[5].inner_text().strip()
+                    organisation = (await cells[5].inner_text()).strip()
 
                 company_name = organisation or title or "Unknown"
 
                 # Try to get the detail link from the row
-                link = row.query_selector("a[href]")
+                link = await row.query_selector("a[href]")
                 source_url = url
                 detail_href = None
                 if link:
-                    href = link.get_attribute("href")
+                    href = await link.get_attribute("href")
                     if href:
                         source_url = href if href.startswith("http") else f"{self.GETS_BASE}{href}"
                         detail_href = source_url
@@ -176,14 +175,14 @@ class GETSScraper(BaseScraper):
 
             # Try to visit detail pages of awarded tenders to find supplier names
             if source_label == "awarded" and results:
-                self._enrich_with_supplier_details(page, results)
+                await self._enrich_with_supplier_details(page, results)
 
         except Exception as e:
             logger.warning(f"[GETS] Error scraping {source_label} tenders: {e}")
 
         return results
 
-    def _enrich_with_supplier_details(
+    async def _enrich_with_supplier_details(
         self, page, results: list[ScraperResult], max_detail_visits: int = 5
     ) -> None:
         """Visit individual tender detail pages to extract supplier names."""
@@ -195,12 +194,12 @@ class GETSScraper(BaseScraper):
             if not detail_url or detail_url == f"{self.GETS_BASE}{self.GETS_AWARDED}":
                 continue
             try:
-                page.goto(detail_url, timeout=15000)
-                page.wait_for_load_state("domcontentloaded", timeout=10000)
+                await page.goto(detail_url, timeout=15000)
+                await page.wait_for_load_state("domcontentloaded", timeout=10000)
                 visited += 1
 
                 # Look for supplier/awardee info on the detail page
-                body_text = page.inner_text("body")
+                body_text = await page.inner_text("body")
                 for marker in ("Supplier:", "Awarded to:", "Successful Tenderer:",
                                "Awardee:", "Contractor:"):
                     if marker.lower() in body_text.lower():
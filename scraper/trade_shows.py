@@ -1,5 +1,7 @@
 # scraper/trade_shows.py
 import logging
+from scraper import async_engine
+from scraper.async_engine import browser_context
 from scraper.base import BaseScraper, ScraperConfig, ScraperResult
 
 logger = logging.getLogger("mastersales.scraper.trade_shows")
@@ -47,6 +49,9 @@ class TradeShowScraper(BaseScraper):
     credential_fields = []
 
     def scrape(self, config: ScraperConfig) -> list[ScraperResult]:
+        return async_engine.run(self.scrape_async(config))
+
+    async def scrape_async(self, config: ScraperConfig) -> list[ScraperResult]:
         from scraper.search_engine import is_cancelled
 
         max_results = config.get("max_results", 20)
@@ -55,15 +60,14 @@ class TradeShowScraper(BaseScraper):
         results: list[ScraperResult] = []
 
         try:
-            from playwright.sync_api import sync_playwright
+            import playwright.async_api  # noqa: F401
         except ImportError:
             logger.warning("[Trade Shows] Playwright not installed — cannot scrape")
             return []
 
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
+            async with browser_context() as context:
+                page = self.track_page(await context.new_page())
 
                 # Scrape hardcoded events
                 for slug in event_slugs:
@@ -73,23 +77,21 @@ class TradeShowScraper(BaseScraper):
                     if not event:
                         logger.warning(f"[Trade Shows] Unknown event slug: {slug}")
                         continue
-                    entries = self._scrape_event(page, event, max_results - len(results))
+                    entries = await self._scrape_event(page, event, max_results - len(results))
                     results.extend(entries)
 
                 # Scrape custom URLs (generic mode)
                 for url in custom_urls:
                     if is_cancelled() or len(results) >= max_results:
                         break
-                    entries = self._scrape_generic_url(page, url, max_results - len(results))
+                    entries = await self._scrape_generic_url(page, url, max_results - len(results))
                     results.extend(entries)
-
-                browser.close()
         except Exception as e:
             logger.error(f"[Trade Shows] Scraper error: {e}")
 
         return results[:max_results]
 
-    def _scrape_event(self, page, event: dict, limit: int) -> list[ScraperResult]:
+    async def _scrape_event(self, page, event: dict, limit: int) -> list[ScraperResult]:
         """Scrape a hardcoded event's known exhibitor/speaker pages."""
         results = []
         event_name = event["name"]
@@ -98,9 +100,9 @@ class TradeShowScraper(BaseScraper):
             if len(results) >= limit:
                 break
             try:
-                page.goto(url, timeout=15000)
-                page.wait_for_load_state("domcontentloaded", timeout=10000)
-                entries = self._extract_exhibitors(page, url, f"Trade Show: {event_name}")
+                await page.goto(url, timeout=15000)
+                await page.wait_for_load_state("domcontentloaded", timeout=10000)
+                entries = await self._extract_exhibitors(page, url, f"Trade Show: {event_name}")
                 results.extend(entries)
                 logger.info(f"[Trade Shows] {event_name} ({url}): {len(entries)} entries")
             except Exception as e:
@@ -108,12 +110,12 @@ class TradeShowScraper(BaseScraper):
 
         return results[:limit]
 
-    def _scrape_generic_url(self, page, url: str, limit: int) -> list[ScraperResult]:
+    async def _scrape_generic_url(self, page, url: str, limit: int) -> list[ScraperResult]:
         """Attempt to extract exhibitor data from any URL. Returns empty + warning if 0 found."""
         try:
-            page.goto(url, timeout=15000)
-            page.wait_for_load_state("domcontentloaded", timeout=10000)
-            results = self._extract_exhibitors(page, url, "Trade Show: Custom")
+            await page.goto(url, timeout=15000)
+            await page.wait_for_load_state("domcontentloaded", timeout=10000)
+            results = await self._extract_exhibitors(page, url, "Trade Show: Custom")
             if not results:
                 logger.warning(f"[Trade Shows] Generic URL returned 0 results: {url}")
             else:
@@ -123,7 +125,7 @@ class TradeShowScraper(BaseScraper):
             logger.warning(f"[Trade Shows] Generic URL failed {url}: {e}")
             return []
 
-    def _extract_exhibitors(self, page, url: str, source_name: str) -> list[ScraperResult]:
+    async def _extract_exhibitors(self, page, url: str, source_name: str) -> list[ScraperResult]:
         """Extract exhibitor/company data from common HTML patterns."""
         results = []
         selectors = [
@@ -133,12 +135,12 @@ class TradeShowScraper(BaseScraper):
         ]
 
         for selector in selectors:
-            elements = page.query_selector_all(selector)
+            elements = await page.query_selector_all(selector)
             if not elements:
                 continue
 
             for el in elements:
-                text = el.inner_text()
+                text = await el.inner_text()
                 lines = [l.strip() for l in text.split("\n") if l.strip()]
                 if len(lines) < 1:
                     continue
@@ -157,10 +159,10 @@ class TradeShowScraper(BaseScraper):
                     company_name = lines[1] if len(lines) > 1 else "Unknown"
 
                 # Try to find a link
-                link = el.query_selector("a[href]")
+                link = await el.query_selector("a[href]")
                 entry_url = url
                 if link:
-                    href = link.get_attribute("href")
+                    href = await link.get_attribute("href")
                     if href and href.startswith("http"):
                         entry_url = href
 
@@ -0,0 +1,99 @@
+"""Shared Jinja environments with a persistent bytecode cache.
+
+The app pages (``templates/``) and the proposal documents
+(``proposals/templates/``) each get one environment, and both share a
+filesystem bytecode cache. A fresh process then loads compiled templates
+instead of parsing and compiling every one on first use. Jinja checks each
+cache entry against the template source, so a stale entry only costs a
+recompile. Entries are keyed on the environment and template name only, not
+the absolute path Jinja passes, so a cache built in one checkout is valid
+wherever the project is deployed.
+
+``python -m templating`` compiles every template into the cache. It runs at
+build time: in the Dockerfile, and in ``vercel.json``'s build command, whose
+``includeFiles`` bundles ``jinja_cache/`` (gitignored) with the function. At
+runtime a read-only cache directory is fine: entries are still loaded, and
+new ones just aren't written.
+
+With ``debug`` off, ``auto_reload`` is off too, so templates aren't re-checked
+on disk on every render.
+"""
+import logging
+import sys
+from hashlib import sha1
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from config import settings
+
+logger = logging.getLogger("mastersales.templating")
+
+_ROOT = Path(__file__).parent
+
+
+class _BytecodeCache(FileSystemBytecodeCache):
+    """FileSystemBytecodeCache that tolerates a read-only cache directory and
+    keys entries on ``namespace`` and template name rather than file path."""
+
+    def __init__(self, directory: str, namespace: str):
+        super().__init__(directory)
+        self.namespace = namespace
+
+    def get_cache_key(self, name: str, filename: str | None = None) -> str:
+        return sha1(f"{self.namespace}|{name}".encode()).hexdigest()
+
+    def dump_bytecode(self, bucket) -> None:
+        try:
+            super().dump_bytecode(bucket)
+        except OSError:
+            pass
+
+
+def _cache_directory() -> Path | None:
+    if not settings.template_cache_dir:
+        return None
+    directory = _ROOT / settings.template_cache_dir
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        if not directory.is_dir():
+            logger.warning("Template cache %s unavailable; compiling templates in memory", directory)
+            return None
+    return directory
+
+
+_cache_dir = _cache_directory()
+
+
+def _environment(directory: str, autoescape: bool) -> Environment:
+    # The template directory names the namespace, so the two environments'
+    # same-named templates (if any) don't collide in the shared directory
+    return Environment(
+        loader=FileSystemLoader(str(_ROOT / directory)),
+        autoescape=autoescape,
+        bytecode_cache=_BytecodeCache(str(_cache_dir), directory) if _cache_dir else None,
+        auto_reload=settings.debug,
+    )
+
+
+# Pages escape like Starlette's Jinja2Templates default; proposal documents
+# have never been escaped, so they keep rendering exactly as before
+page_env = _environment("templates", autoescape=True)
+proposal_env = _environment("proposals/templates", autoescape=False)
+
+
+def precompile() -> int:
+    """Compile every template into the bytecode cache; returns how many."""
+    count = 0
+    for env in (page_env, proposal_env):
+        for name in env.list_templates(extensions=["html"]):
+            env.get_template(name)
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    if _cache_dir is None:
+        sys.exit("TEMPLATE_CACHE_DIR is unset or unwritable; nothing to precompile")
+    print(f"Compiled {precompile()} templates into {_cache_dir}")
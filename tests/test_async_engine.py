@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+
+import pytest
+
+from config import settings
+from scraper import async_engine, search_engine
+from scraper.base import BaseScraper
+
+
+def _result(first_name, source):
+    return {"first_name": first_name, "last_name": "Smith", "job_title": None,
+            "company_name": f"{source} Pty Ltd", "company_domain": None, "linkedin_url": None,
+            "location_city": None, "location_state": None, "location_country": None,
+            "source_url": None, "source_name": source}
+
+
+def _slow_source(slug):
+    class SlowAsync(BaseScraper):
+        name = slug; uses_browser = True
+        def scrape(self, config): raise AssertionError("the engine awaits scrape_async")
+        async def scrape_async(self, config):
+            await asyncio.sleep(0.2)  # a page load or polite delay
+            return [_result(threading.current_thread().name, slug)]
+        def generate_demo_results(self, config): return []
+    SlowAsync.slug = slug
+    return SlowAsync
+
+
+def test_async_sources_interleave_on_one_loop(monkeypatch):
+    slugs = ["slow_a", "slow_b", "slow_c"]
+    monkeypatch.setattr(search_engine, "SCRAPERS", {s: _slow_source(s) for s in slugs})
+    started = time.perf_counter()
+    results, status = search_engine.run_scrape(slugs, ["steel"])
+    assert time.perf_counter() - started < 0.5  # not 3 x 0.2 s
+    assert {s["status"] for s in status["sources"].values()} == {"complete"}
+    assert {r["first_name"] for r in results} == {"scraper-engine"}
+
+
+async def _loop_thread():
+    return threading.current_thread(), asyncio.get_running_loop()
+
+
+def test_shutdown_stops_the_loop_and_it_restarts():
+    thread, loop = async_engine.run(_loop_thread())
+    async_engine.shutdown()
+    assert not thread.is_alive() and loop.is_closed()
+    assert async_engine.run(_loop_thread())[0].is_alive()
+
+
+def test_every_browser_scraper_runs_on_the_engine():
+    for slug, cls in search_engine.get_scrapers().items():
+        if cls.uses_browser:
+            assert cls.scrape_async is not BaseScraper.scrape_async, slug
+
+
+def test_process_memory_is_measured_where_proc_exists():
+    used = async_engine.process_tree_mb(os.getpid())
+    assert used is None or used > 0
+
+
+# ── Recycling, on fake browsers ──────────────────────────────────────────────
+
+class _FakePage:
+    def __init__(self):
+        self.handlers = []
+
+    def on(self, event, handler):
+        assert event == "load"
+        self.handlers.append(handler)
+
+    async def goto(self, url):
+        for handler in self.handlers:
+            handler(self)
+
+
+class _FakeContext:
+    def __init__(self):
+        self.handlers = []
+
+    def on(self, event, handler):
+        assert event == "page"
+        self.handlers.append(handler)
+
+    async def new_page(self):
+        page = _FakePage()
+        for handler in self.handlers:
+            handler(page)
+        return page
+
+    async def close(self):
+        pass
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected and not self.closed
+
+    async def new_context(self, **options):
+        return _FakeContext()
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeChromium:
+    def __init__(self):
+        self.launched = []
+
+    async def launch(self, **options):
+        self.launched.append(_FakeBrowser())
+        return self.launched[-1]
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = async_engine._Engine()
+    chromium = _FakeChromium()
+    engine._playwright = type("FakePlaywright", (), {"chromium": chromium, "stop": lambda self: asyncio.sleep(0)})()
+    pids = iter(range(1001, 2000))
+    monkeypatch.setattr(async_engine, "_child_processes", set)
+    monkeypatch.setattr(async_engine, "_new_process_root", lambda before: next(pids))
+    monkeypatch.setattr(settings, "browser_recycle_pages", 0)
+    monkeypatch.setattr(settings, "browser_recycle_mb", 0)
+    yield engine, chromium.launched
+    engine.shutdown()
+
+
+async def _scrape(engine, loads: int):
+    async with engine.context() as context:
+        page = await context.new_page()
+        for _ in range(loads):
+            await page.goto("https://example.com")
+
+
+def test_browser_is_relaunched_after_n_page_loads(engine, monkeypatch):
+    engine, launched = engine
+    monkeypatch.setattr(settings, "browser_recycle_pages", 5)
+
+    # One page per scrape, navigated several times: it's the loads that count
+    engine.run(_scrape(engine, 3))
+    assert len(launched) == 1 and not launched[0].closed
+    engine.run(_scrape(engine, 3))
+    assert launched[0].closed
+    engine.run(_scrape(engine, 1))
+    assert len(launched) == 2 and not launched[1].closed
+
+
+def test_memory_limit_retires_the_largest_browser(engine, monkeypatch):
+    engine, launched = engine
+    monkeypatch.setattr(settings, "browser_recycle_mb", 1000)
+    sizes = {}
+    monkeypatch.setattr(async_engine, "process_tree_mb", sizes.get)
+
+    async def two_browsers():
+        async with engine.context(headless=True):
+            async with engine.context(headless=False):
+                sizes.update({1001: 300, 1002: 600})  # under the limit together
+            sizes[1002] = 900  # the idle headed one grows: 1200 MB together
+        # ... and goes when the headless one's context closes, not the headless one
+        await _scrape(engine, 0)
+
+    engine.run(two_browsers())
+    assert launched[1].closed and not launched[0].closed
+    assert len(launched) == 2  # the headless browser took the last context
+
+
+def test_contexts_beyond_the_limit_wait_for_one_to_close(engine, monkeypatch):
+    engine, launched = engine
+    monkeypatch.setattr(settings, "scrape_max_contexts", 2)
+    open_now = most = 0
+
+    async def scrape():
+        nonlocal open_now, most
+        async with engine.context():
+            open_now += 1
+            most = max(most, open_now)
+            await asyncio.sleep(0.01)
+            open_now -= 1
+
+    async def five_sources():
+        await asyncio.gather(*(scrape() for _ in range(5)))
+
+    engine.run(five_sources())
+    assert most == 2
+    assert len(launched) == 1  # all on the one shared browser
+
+
+def test_a_crashed_browser_is_dropped_and_relaunched(engine):
+    engine, launched = engine
+    engine.run(_scrape(engine, 1))
+    launched[0].connected = False  # the Chromium process died
+
+    engine.run(_scrape(engine, 1))
+    assert len(launched) == 2
+    assert launched[0].closed  # its Playwright handle released too
+    assert engine.open_browsers() == 1
+
+
+def test_shutdown_leaves_a_loop_that_will_not_stop(engine, caplog):
+    engine, _ = engine
+    release = threading.Event()
+
+    async def stuck():
+        release.wait()  # blocks the loop thread itself
+
+    thread, loop = engine.run(_loop_thread())
+    asyncio.run_coroutine_threadsafe(stuck(), loop)
+    with caplog.at_level(logging.WARNING, logger="mastersales.scraper.engine"):
+        engine.shutdown(timeout=0.1)
+    assert "still running" in caplog.text
+    assert thread.is_alive() and not loop.is_closed()
+
+    release.set()
+    thread.join(5)
+    assert engine.run(_loop_thread())[1] is not loop  # a fresh loop once it has stopped
+    assert loop.is_closed()
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+
+import bcrypt
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+import auth
+from app import app
+from auth import (
+    CurrentUser, HashingBusy, UserCache, hash_password, needs_rehash, user_cache, verify_password_async,
+)
+from config import settings
+from database.db import Base, build_async_engine, get_async_db
+from database.models import User
+
+
+def _user(user_id):
+    return CurrentUser(id=user_id, email=f"u{user_id}@example.com", full_name=f"User {user_id}")
+
+
+def test_user_cache_evicts_least_recently_used():
+    cache = UserCache(maxsize=2, ttl=60)
+    cache.put(_user(1))
+    cache.put(_user(2))
+    assert cache.get(1) == _user(1)  # 1 is now most recent
+    cache.put(_user(3))
+    assert cache.get(2) is None
+    assert cache.get(1) and cache.get(3)
+
+
+def test_user_cache_entries_expire(monkeypatch):
+    cache = UserCache(maxsize=10, ttl=60)
+    clock = [1000.0]
+    monkeypatch.setattr("auth.time.monotonic", lambda: clock[0])
+    cache.put(_user(1))
+    clock[0] += 61
+    assert cache.get(1) is None
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    user_cache.clear()
+
+
+@pytest.mark.parametrize("change", [
+    lambda u: setattr(u, "password_hash", "new-hash"),  # password reset
+    lambda u: setattr(u, "is_active", False),           # deactivation
+])
+def test_committed_user_change_evicts_cached_user(db_session, change):
+    user = User(email="a@example.com", full_name="A", password_hash="x")
+    db_session.add(user)
+    db_session.commit()
+    user_cache.put(CurrentUser.from_model(user))
+
+    change(user)
+    db_session.flush()
+    assert user_cache.get(user.id) is not None  # not until commit
+    db_session.commit()
+    assert user_cache.get(user.id) is None
+
+
+def test_needs_rehash_tracks_configured_cost(monkeypatch):
+    monkeypatch.setattr(settings, "bcrypt_rounds", 4)
+    hashed = hash_password("correct horse")
+    assert hashed.startswith("$2b$04$")
+    assert not needs_rehash(hashed)
+    monkeypatch.setattr(settings, "bcrypt_rounds", 5)
+    assert needs_rehash(hashed)
+
+
+def test_hashing_rejects_when_executor_is_saturated(monkeypatch):
+    monkeypatch.setattr("auth._hash_slots", threading.BoundedSemaphore(1))
+    auth._hash_slots.acquire()  # the only slot is taken
+    with pytest.raises(HashingBusy):
+        asyncio.run(verify_password_async("pw", "hash"))
+
+
+@pytest.fixture
+def login_client(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'auth.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(settings, "bcrypt_rounds", 4)
+    with Session(engine) as db:
+        # Stored at an older cost than configured
+        db.add(User(email="rep@example.com", full_name="Rep",
+                    password_hash=bcrypt.hashpw(b"password1", bcrypt.gensalt(rounds=5)).decode()))
+        db.commit()
+    AsyncSessionLocal = async_sessionmaker(build_async_engine(url), expire_on_commit=False)
+
+    async def _get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = _get_async_db
+    yield TestClient(app), engine
+    app.dependency_overrides.clear()
+
+
+def test_login_rehashes_at_configured_cost(login_client):
+    client, engine = login_client
+    response = client.post("/login", data={"email": "rep@example.com", "password": "password1"},
+                           follow_redirects=False)
+    assert response.status_code == 303
+    with Session(engine) as db:
+        assert db.query(User).one().password_hash.startswith("$2b$04$")
+
+
+def test_login_returns_429_when_hashing_is_saturated(login_client, monkeypatch):
+    client, _ = login_client
+    monkeypatch.setattr("auth._hash_slots", threading.BoundedSemaphore(1))
+    auth._hash_slots.acquire()
+    response = client.post("/login", data={"email": "rep@example.com", "password": "password1"})
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "1"
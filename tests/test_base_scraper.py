@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 from scraper.base import ScraperResult, ScraperConfig, BaseScraper
 
 def test_scraper_result_has_required_fields():
@@ -135,3 +138,14 @@ def test_full_scrape_demo_mode():
     # Multiple sources represented
     sources_seen = {r["source_name"].split(",")[0].strip() for r in results}
     assert len(sources_seen) >= 3
+
+
+def test_scraper_registry_is_imported_on_first_use():
+    # A fresh interpreter, so modules imported by other tests don't interfere
+    code = (
+        "import sys; from scraper import search_engine; "
+        "assert 'scraper.linkedin' not in sys.modules; "
+        "assert 'linkedin' in search_engine.get_scrapers(); "
+        "assert 'scraper.linkedin' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
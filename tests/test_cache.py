@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from database.cache import QueryCache, query_cache
+from database.db import Base
+from database.models import Contact, Meeting
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    query_cache.clear()
+    with Session(engine) as session:
+        session.add(Contact(first_name="Jane", lead_status="New"))
+        session.commit()
+        yield session
+    query_cache.clear()
+
+
+def _cached_count(session):
+    return query_cache.get_or_compute("count", ("contacts",), lambda: session.query(Contact).count())
+
+
+def test_value_is_reused_until_expiry():
+    cache = QueryCache(ttl=60)
+    calls = []
+    for _ in range(3):
+        cache.get_or_compute("k", ("contacts",), lambda: calls.append(1) or len(calls))
+    assert calls == [1]
+
+
+def test_zero_ttl_disables_caching():
+    cache = QueryCache(ttl=0)
+    values = [cache.get_or_compute("k", (), lambda: object()) for _ in range(2)]
+    assert values[0] is not values[1]
+
+
+def test_commit_invalidates_matching_tables(db_session):
+    assert _cached_count(db_session) == 1
+    db_session.add(Contact(first_name="John", lead_status="New"))
+    assert _cached_count(db_session) == 1  # not committed yet
+    db_session.commit()
+    assert _cached_count(db_session) == 2
+
+
+def test_bulk_update_invalidates(db_session):
+    assert _cached_count(db_session) == 1
+    db_session.query(Contact).update({"lead_status": "Won"}, synchronize_session=False)
+    db_session.add(Contact(first_name="John", lead_status="New"))
+    db_session.rollback()
+    assert _cached_count(db_session) == 1
+
+    db_session.query(Contact).filter(Contact.id == 1).delete(synchronize_session=False)
+    db_session.commit()
+    assert _cached_count(db_session) == 0
+
+
+def test_unrelated_writes_keep_entry(db_session):
+    _cached_count(db_session)
+    db_session.add(Meeting(contact_id=1, title="Intro", meeting_time=datetime(2026, 1, 1)))
+    db_session.commit()
+    # A recompute would now see the flushed contact; the cached value must not
+    db_session.add(Contact(first_name="Late", lead_status="New"))
+    db_session.flush()
+    assert _cached_count(db_session) == 1
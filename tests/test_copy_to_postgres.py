@@ -0,0 +1,61 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from database import migrations
+from database.copy_to_postgres import copy_database, read_only_url
+from database.db import Base, build_engine
+from database.models import Company, Contact, NurtureSequence
+
+
+@pytest.fixture
+def source(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'source.db'}")
+    Base.metadata.create_all(engine)
+    migrations.upgrade(engine)
+    with Session(engine) as db:
+        company = Company(company_name="Acme Pty Ltd")
+        db.add_all([Contact(first_name=f"Lead{i}", last_name="X", company=company) for i in range(7)])
+        db.add(NurtureSequence(name="Welcome", steps=[{"day_offset": 0, "subject": "Hi"}]))
+        db.commit()
+    return engine
+
+
+def test_copy_streams_every_table_in_batches(source, tmp_path):
+    target = create_engine(f"sqlite:///{tmp_path / 'target.db'}")
+    copied = copy_database(source, target, batch_size=3)
+
+    assert copied["contacts"] == 7 and copied["companies"] == 1
+    with Session(target) as db:
+        contact = db.get(Contact, 7)
+        assert contact.company.company_key == "acme"
+        assert contact.contact_key == "lead6|x|acme"
+        assert db.query(NurtureSequence).one().steps == [{"day_offset": 0, "subject": "Hi"}]
+
+
+def test_copy_refuses_non_empty_target(source, tmp_path):
+    target = create_engine(f"sqlite:///{tmp_path / 'target.db'}")
+    copy_database(source, target)
+    with pytest.raises(RuntimeError, match="not empty"):
+        copy_database(source, target)
+
+
+def test_source_is_opened_read_only_and_must_be_migrated(tmp_path):
+    path = tmp_path / "old.db"
+    old = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(old)  # never migrated
+    old.dispose()
+    modified = os.path.getmtime(path)
+
+    source = build_engine(read_only_url(f"sqlite:///{path}"))
+    target = create_engine(f"sqlite:///{tmp_path / 'target.db'}")
+    with pytest.raises(RuntimeError, match="Source is at migration 0"):
+        copy_database(source, target)
+    with source.connect() as conn, pytest.raises(OperationalError, match="readonly"):
+        conn.execute(text("CREATE TABLE scratch (id INTEGER)"))
+    assert os.path.getmtime(path) == modified
+    with pytest.raises(ValueError):
+        read_only_url("postgresql://localhost/mastersales")
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from benchmarks import dataset
+from database import ingest, migrations
+from database.db import Base, build_engine
+from database.models import Company, Contact, Meeting, NurtureEnrollment, Proposal
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'bench.db'}")
+    Base.metadata.create_all(engine)
+    migrations.upgrade(engine)
+    yield engine
+    engine.dispose()
+
+
+def _rows(engine, model):
+    with engine.connect() as conn:
+        return conn.scalar(select(func.count()).select_from(model))
+
+
+def test_generate_fills_every_table_in_proportion(engine):
+    counts = dataset.generate(engine, 500, batch_size=120)
+    assert counts == dataset.row_counts(500)
+    for model, table in [(Company, "companies"), (Contact, "contacts"), (Meeting, "meetings"),
+                         (Proposal, "proposals"), (NurtureEnrollment, "nurture_enrollments")]:
+        assert _rows(engine, model) == counts[table]
+    with engine.connect() as conn:
+        # Searchable through the FTS index, like contacts added by the app
+        assert conn.scalar(text("SELECT count(*) FROM contacts_fts WHERE contacts_fts MATCH 'anderson'")) > 0
+    with pytest.raises(ValueError):
+        dataset.generate(engine, 10)
+
+
+def test_generated_leads_are_recognised_as_duplicates(engine):
+    dataset.generate(engine, 200)
+    with Session(engine) as db:
+        contact = db.scalars(select(Contact).where(Contact.contact_key.is_not(None))).first()
+        result = {"first_name": contact.first_name, "last_name": contact.last_name,
+                  "company_name": contact.company.company_name, "linkedin_url": contact.linkedin_url}
+        assert ingest.add_scraped_contacts(db, [result]) == ["duplicate"]
+
+
+def test_same_seed_gives_same_rows(tmp_path):
+    snapshots = []
+    for name in ("a", "b"):
+        engine = build_engine(f"sqlite:///{tmp_path / name}.db")
+        Base.metadata.create_all(engine)
+        migrations.upgrade(engine)
+        dataset.generate(engine, 100, seed=3)
+        with engine.connect() as conn:
+            snapshots.append(conn.execute(text("SELECT * FROM contacts ORDER BY id")).all())
+        engine.dispose()
+    assert snapshots[0] == snapshots[1]
@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from database.db import _engine_kwargs, async_url, build_engine, sqlite_pragmas
+
+
+def test_disk_profile_enables_wal(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'test.db'}", "disk")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+    assert isinstance(engine.pool, QueuePool)
+
+
+def test_pragma_overrides_apply_on_top_of_profile(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'test.db'}", "disk", {"cache_size": -2000})
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -2000
+
+
+def test_memory_database_skips_pool_sizing():
+    engine = build_engine("sqlite:///:memory:", "ephemeral")
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_unknown_profile_rejected():
+    with pytest.raises(ValueError):
+        sqlite_pragmas("turbo")
+
+
+def test_postgres_engine_pre_pings_with_statement_timeout():
+    engine = build_engine("postgres://user:pw@db.example.com/mastersales")
+    assert engine.url.drivername == "postgresql"
+    assert engine.pool._pre_ping
+    assert isinstance(engine.pool, QueuePool)
+    assert _engine_kwargs(engine.url)["connect_args"] == {"options": "-c statement_timeout=30000"}
+    asyncpg = async_url("postgres://u@h/db")
+    assert _engine_kwargs(asyncpg)["connect_args"] == {"server_settings": {"statement_timeout": "30000"}}
+
+
+def test_async_url_picks_driver_per_backend():
+    assert async_url("sqlite:///mastersales.db").drivername == "sqlite+aiosqlite"
+    assert async_url("postgres://u@h/db").drivername == "postgresql+asyncpg"
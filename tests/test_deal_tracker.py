@@ -0,0 +1,49 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from database.db import Base
+from database.models import Company, Contact, Meeting, Proposal
+from pipeline.deal_tracker import get_stage_totals, get_dashboard_summary
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        company = Company(company_name="Steel Co", company_industry="Steel")
+        session.add(company)
+        session.flush()
+        session.add_all([
+            Contact(first_name="A", company_id=company.id, lead_status="New"),
+            Contact(first_name="B", company_id=company.id, lead_status="Qualified", deal_value=5000),
+            Contact(first_name="C", company_id=company.id, lead_status="Negotiation", deal_value=2500),
+            Contact(first_name="D", company_id=company.id, lead_status="Won", deal_value=1000),
+            Contact(first_name="E", company_id=company.id, lead_status="Qualified", deal_value=9999,
+                    deleted_at=datetime(2026, 1, 1)),
+        ])
+        session.flush()
+        session.add_all([
+            Proposal(contact_id=2, pricing=5000, status="Sent"),
+            Proposal(contact_id=3, pricing=2500, status="Draft"),
+            Meeting(contact_id=2, title="Intro", meeting_time=datetime(2026, 3, 1, 10)),
+        ])
+        session.commit()
+        yield session
+
+
+def test_stage_totals_skip_deleted_and_zero_fill(db_session):
+    totals = get_stage_totals(db_session)
+    assert totals["Qualified"] == {"count": 1, "total_value": 5000}
+    assert totals["Lost"] == {"count": 0, "total_value": 0}
+
+
+def test_dashboard_summary(db_session):
+    summary = get_dashboard_summary(db_session)
+    assert summary["total_leads"] == 4
+    assert summary["active_deals"] == 2
+    assert summary["proposals_sent"] == 1
+    assert summary["meetings_count"] == 1
+    assert summary["total_pipeline_value"] == 8500
+    assert summary["pipeline_counts"]["New"] == 1
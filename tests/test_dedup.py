@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from database.db import Base
+from database.dedup import company_key, contact_key, linkedin_key
+from database.models import Company, Contact
+
+
+@pytest.mark.parametrize("name,key", [
+    ("Acme Coatings Pty Ltd", "acme coatings"),
+    ("ACME COATINGS PTY. LTD.", "acme coatings"),
+    ("Acme Coatings Limited", "acme coatings"),
+    ("Acme Coatings & Co", "acme coatings"),
+    ("Société Générale", "societe generale"),
+    ("  ", None),
+    (None, None),
+])
+def test_company_key(name, key):
+    assert company_key(name) == key
+
+
+def test_contact_key_needs_all_parts():
+    assert contact_key(" John ", "O'Brien", "BHP Limited") == "john|o brien|bhp"
+    assert contact_key("John", "", "BHP") is None
+    assert contact_key("John", "Smith", None) is None
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.linkedin.com/in/jdoe/",
+    "http://au.linkedin.com/in/JDoe?trk=public_profile",
+    "linkedin.com/in/jdoe#about",
+])
+def test_linkedin_key_variants_collapse(url):
+    assert linkedin_key(url) == "linkedin.com/in/jdoe"
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def test_keys_maintained_on_flush(db_session):
+    company = Company(company_name="BHP Group Limited")
+    contact = Contact(first_name="Jane", last_name="Doe", company=company,
+                      linkedin_url="https://www.linkedin.com/in/janedoe/")
+    db_session.add(contact)
+    db_session.commit()
+    assert company.company_key == "bhp group"
+    assert contact.contact_key == "jane|doe|bhp group"
+    assert contact.linkedin_key == "linkedin.com/in/janedoe"
+
+    # Company set by id only, as the seed data does
+    other = Contact(first_name="Joe", last_name="Bloggs", company_id=company.id)
+    db_session.add(other)
+    db_session.commit()
+    assert other.contact_key == "joe|bloggs|bhp group"
+
+    contact.last_name = "Smith"
+    db_session.commit()
+    assert contact.contact_key == "jane|smith|bhp group"
+
+
+def test_database_rejects_duplicate_contact(db_session):
+    company = Company(company_name="Rio Tinto")
+    db_session.add(Contact(first_name="Jane", last_name="Doe", company=company))
+    db_session.commit()
+    db_session.add(Contact(first_name="JANE", last_name="doe", company=company))
+    with pytest.raises(IntegrityError):
+        db_session.commit()
@@ -0,0 +1,76 @@
+import csv
+import gzip
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app as app_module
+from app import app
+from auth import SESSION_COOKIE, CurrentUser, create_session_cookie, user_cache
+from config import settings
+from database.db import Base, get_db
+from database.models import Company, Contact
+
+
+@pytest.fixture
+def client(monkeypatch):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        for i in range(7):
+            db.add(Contact(first_name=f"Lead{i}", company=Company(company_name=f"Co{i}")))
+        db.add(Contact(first_name="Gone", deleted_at=app_module.datetime.utcnow()))
+        db.commit()
+
+    def _get_db():
+        with Session() as db:
+            yield db
+
+    # Small chunks so every export spans several flushes and ID slices
+    monkeypatch.setattr(settings, "export_chunk_rows", 2)
+    monkeypatch.setattr(app_module, "EXPORT_ID_CHUNK", 3)
+    app.dependency_overrides[get_db] = _get_db
+    user_cache.put(CurrentUser(id=1, email="rep@example.com", full_name="Rep"))
+    client = TestClient(app)
+    client.cookies.set(SESSION_COOKIE, create_session_cookie(1))
+    yield client
+    app.dependency_overrides.pop(get_db, None)
+    user_cache.clear()
+
+
+def _rows(text):
+    return list(csv.reader(io.StringIO(text)))
+
+
+def test_export_streams_active_contacts_with_companies(client):
+    response = client.get("/leads/export")
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = _rows(response.text)
+    assert rows[0][0] == "First Name"
+    assert [r[0] for r in rows[1:]] == [f"Lead{i}" for i in reversed(range(7))]
+    assert rows[1][8] == "Co6"
+
+
+def test_export_gzip_matches_plain(client):
+    plain = client.get("/leads/export").content
+    response = client.get("/leads/export?gzip=true")
+    assert response.headers["content-type"] == "application/gzip"
+    assert 'filename="leads-export-' in response.headers["content-disposition"]
+    assert gzip.decompress(response.content) == plain
+
+
+def test_export_selected_chunks_id_list(client):
+    response = client.post("/leads/export-selected", data={"ids": [7, 1, 2, 3, 4, 5, 99]})
+    assert [r[0] for r in _rows(response.text)[1:]] == ["Lead0", "Lead1", "Lead2", "Lead3", "Lead4", "Lead6"]
+
+
+def test_export_selected_all_matching_uses_filters(client):
+    response = client.post("/leads/export-selected", data={"all_matching": "true", "q": "Lead3"})
+    assert [r[0] for r in _rows(response.text)[1:]] == ["Lead3"]
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from database.cache import query_cache
+from database.db import Base
+from database.facets import get_lead_facets
+from database.models import Contact
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    query_cache.clear()
+    with Session(engine) as session:
+        session.add_all([
+            Contact(first_name="A", location_state="WA", location_country="AU", lead_source="LinkedIn"),
+            Contact(first_name="B", location_state="WA", location_country="AU", lead_source="ACA"),
+            Contact(first_name="C", location_state="VIC", location_country="AU", lead_source="LinkedIn"),
+            Contact(first_name="D", location_state="", location_country="NZ"),
+            Contact(first_name="E", location_state="QLD", location_country="AU",
+                    deleted_at=datetime(2026, 1, 1)),
+        ])
+        session.commit()
+        yield session
+    query_cache.clear()
+
+
+def test_facets_count_active_contacts_only(db_session):
+    facets = get_lead_facets(db_session)
+    assert facets["states"] == [("VIC", 1), ("WA", 2)]
+    assert facets["countries"] == [("AU", 3), ("NZ", 1)]
+    assert facets["sources"] == [("ACA", 1), ("LinkedIn", 2)]
+
+
+def test_contact_write_refreshes_facets(db_session):
+    get_lead_facets(db_session)
+    db_session.add(Contact(first_name="F", location_state="NSW"))
+    db_session.commit()
+    assert ("NSW", 1) in get_lead_facets(db_session)["states"]
@@ -0,0 +1,101 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app import app
+from auth import SESSION_COOKIE, CurrentUser, create_session_cookie, user_cache
+from database.db import Base, get_db
+from database.models import Company, Contact, Meeting, Proposal, User
+from http_cache import make_etag, not_modified
+
+
+def _request(**headers) -> Request:
+    return Request({"type": "http", "headers": [(k.replace("_", "-").encode(), v.encode())
+                                                for k, v in headers.items()]})
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = make_etag("lead", 1)
+    assert not_modified(_request(if_none_match=etag.removeprefix("W/")), etag).status_code == 304
+    assert not_modified(_request(if_none_match=f'"other", {etag}'), etag).status_code == 304
+    assert not_modified(_request(if_none_match='"other"'), etag) is None
+    assert make_etag("lead", 2) != etag
+
+
+def test_if_modified_since_only_without_if_none_match():
+    stamp = datetime(2024, 5, 1, 12, 0, 0, 500)
+    since = "Wed, 01 May 2024 12:00:00 GMT"
+    response = not_modified(_request(if_modified_since=since), "W/\"x\"", stamp)
+    assert response.status_code == 304
+    assert response.headers["last-modified"] == since
+    assert not_modified(_request(if_modified_since="Wed, 01 May 2024 11:59:59 GMT"), "W/\"x\"", stamp) is None
+    assert not_modified(_request(if_modified_since=since, if_none_match='"y"'), "W/\"x\"", stamp) is None
+    assert not_modified(_request(if_modified_since="not a date"), "W/\"x\"", stamp) is None
+
+
+@pytest.fixture
+def client(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'etag.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        user = User(email="rep@example.com", full_name="Rep", password_hash="x")
+        contact = Contact(first_name="Ada", company=Company(company_name="Acme"), lead_status="New")
+        proposal = Proposal(contact=contact, products=[], pricing=1000.0, email_html="<p>Hi</p>")
+        db.add_all([user, contact, proposal])
+        db.commit()
+        ids = user.id, contact.id, proposal.id
+
+    def _get_db():
+        with Session() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = _get_db
+    user_cache.put(CurrentUser(id=ids[0], email="rep@example.com", full_name="Rep"))
+    client = TestClient(app)
+    client.cookies.set(SESSION_COOKIE, create_session_cookie(ids[0]))
+    client.Session, client.contact_id, client.proposal_id = Session, ids[1], ids[2]
+    yield client
+    app.dependency_overrides.clear()
+    user_cache.clear()
+
+
+def _revalidate(client, path):
+    first = client.get(path)
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+    return client.get(path, headers={"If-None-Match": first.headers["etag"]})
+
+
+def test_lead_detail_revalidates_until_a_related_row_changes(client):
+    path = f"/leads/{client.contact_id}"
+    assert _revalidate(client, path).status_code == 304
+
+    with client.Session() as db:
+        db.add(Meeting(contact_id=client.contact_id, title="Intro", meeting_time=datetime.utcnow()))
+        db.commit()
+    assert _revalidate(client, path).status_code == 304
+    stale = client.get(path).headers["etag"]
+    with client.Session() as db:
+        db.get(Meeting, 1).status = "Completed"
+        db.commit()
+    assert client.get(path, headers={"If-None-Match": stale}).status_code == 200
+
+
+def test_proposal_previews_revalidate(client):
+    preview = f"/proposals/{client.proposal_id}/preview"
+    email = f"/proposals/{client.proposal_id}/email-preview"
+    assert _revalidate(client, preview).status_code == 304
+    assert _revalidate(client, email).status_code == 304
+
+    stale = client.get(email).headers["etag"]
+    with client.Session() as db:
+        db.get(Proposal, client.proposal_id).email_html = "<p>Hello</p>"
+        db.commit()
+    response = client.get(email, headers={"If-None-Match": stale})
+    assert response.status_code == 200
+    assert response.text == "<p>Hello</p>"
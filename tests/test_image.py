@@ -0,0 +1,34 @@
+import sqlite3
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from database import image
+from database.models import Company, NurtureSequence
+
+
+def test_built_image_is_current_and_seeded(tmp_path):
+    path = image.build_image(tmp_path / "image.db")
+    assert image.is_current(path)
+    assert not list(tmp_path.glob("image.db?*"))  # no journal or build leftovers
+    with Session(create_engine(f"sqlite:///{path}")) as db:
+        assert db.query(Company).count() > 0
+        assert db.query(NurtureSequence).count() > 0
+
+
+def test_install_copies_only_into_a_missing_database(tmp_path):
+    path = image.build_image(tmp_path / "image.db")
+    target = tmp_path / "data" / "app.db"
+    assert image.install(path, target)
+    assert target.read_bytes() == path.read_bytes()
+    assert not image.install(path, target)
+
+
+def test_stale_image_is_not_installed(tmp_path):
+    path = image.build_image(tmp_path / "image.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("PRAGMA user_version=1")
+    assert not image.is_current(path)
+    assert not image.install(path, tmp_path / "app.db")
+    assert not (tmp_path / "app.db").exists()
+    assert not image.install(tmp_path / "missing.db", tmp_path / "app.db")
@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from database import ingest
+from database.db import Base
+from database.ingest import add_scraped_contacts
+from database.loading import count_statements
+from database.models import Company, Contact
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        acme = Company(company_name="Acme")
+        session.add_all([
+            acme,
+            Contact(first_name="Ann", last_name="Lee", company=acme, linkedin_url="https://linkedin.com/in/ann"),
+        ])
+        session.commit()
+        yield session
+
+
+def _result(first, last, company, url=None):
+    return {"first_name": first, "last_name": last, "company_name": company,
+            "linkedin_url": url, "source_name": "LinkedIn"}
+
+
+def test_statuses_follow_input_order(db_session):
+    statuses = add_scraped_contacts(db_session, [
+        _result("Someone", "Else", "Other", "https://linkedin.com/in/ann"),  # known URL
+        _result("Ann", "Lee", "Acme"),                                       # known name + company
+        _result("Bob", "Ray", "Acme"),
+        _result("Cat", "Fox", "NewCo"),
+        _result("Cat", "Fox", "NewCo"),                                      # repeat within batch
+        _result("Dan", "Ng", "NewCo"),
+        _result("ann", "LEE", "Acme Pty Ltd"),                            # same person, normalised
+        _result("Eve", "Wu", "ACME Limited", "https://www.linkedin.com/in/ann/"),  # same URL, normalised
+        _result("Fay", "Ho", "Acme Pty Ltd"),                            # existing company
+    ])
+    db_session.commit()
+
+    assert statuses == ["duplicate", "duplicate", "added", "added", "duplicate", "added",
+                        "duplicate", "duplicate", "added"]
+    assert db_session.query(Contact).count() == 5
+    assert db_session.query(Company).count() == 2
+    assert db_session.query(Contact).filter_by(first_name="Fay").one().company.company_name == "Acme"
+    assert db_session.query(Company).filter_by(company_name="NewCo").count() == 1
+    bob = db_session.query(Contact).filter_by(first_name="Bob").one()
+    assert bob.company.company_name == "Acme"
+    assert bob.lead_status == "New" and bob.lead_source == "LinkedIn" and bob.created_at
+
+
+def test_batch_uses_fixed_statement_count(db_session):
+    results = [_result(f"Lead{i}", "X", f"Co{i % 10}", f"https://linkedin.com/in/{i}") for i in range(300)]
+    with count_statements(db_session.get_bind()) as statements:
+        statuses = add_scraped_contacts(db_session, results)
+    assert statuses == ["added"] * 300
+    # URL, name and company lookups, then one insert each for companies and contacts
+    assert len(statements) == 5
+
+
+def test_rows_inserted_since_the_lookup_are_duplicates(db_session, monkeypatch):
+    lookup = ingest._company_ids
+    raced = []
+
+    def lookup_then_race(db, keys):
+        ids = lookup(db, keys)
+        if raced:
+            return ids
+        raced.append(True)
+        # Another request imports the same people and company meanwhile
+        with Session(db.get_bind()) as other:
+            newco = Company(company_name="NewCo")
+            other.add_all([
+                newco,
+                Contact(first_name="Gil", last_name="Po", company=newco),
+                Contact(first_name="Someone", last_name="Else", linkedin_url="https://linkedin.com/in/hal"),
+            ])
+            other.commit()
+        return ids
+
+    monkeypatch.setattr(ingest, "_company_ids", lookup_then_race)
+    statuses = add_scraped_contacts(db_session, [
+        _result("Gil", "Po", "NewCo"),
+        _result("Hal", "Oz", "NewCo", "https://linkedin.com/in/hal"),
+        _result("Ivy", "Tan", "NewCo"),
+    ])
+    db_session.commit()
+
+    assert statuses == ["duplicate", "duplicate", "added"]
+    ivy = db_session.query(Contact).filter_by(first_name="Ivy").one()
+    assert ivy.company.company_name == "NewCo"
+    assert db_session.query(Company).filter_by(company_name="NewCo").count() == 1
@@ -0,0 +1,60 @@
+import asyncio
+import random
+import time
+
+import httpx
+import pytest
+
+from benchmarks import load
+
+
+def test_next_page_follows_the_infinite_scroll_row():
+    page = httpx.Response(200, text='<tr hx-get="/leads?q=steel&amp;cursor=abc" hx-trigger="revealed" hx-swap="outerHTML">')
+    assert load._next_page(page) == "/leads?q=steel&cursor=abc"
+    assert load._next_page(httpx.Response(200, text="<tr></tr>")) is None
+    assert load._next_page(None) is None
+
+
+def test_recorder_reports_percentiles_and_errors_per_route():
+    recorder = load._Recorder()
+    for status in [200] * 99 + [500]:
+        recorder.record("GET /leads", time.perf_counter(), httpx.Response(status))
+    recorder.record("GET /", time.perf_counter(), None)
+    summary = recorder.summary(seconds=10)
+    assert summary["total"]["requests"] == 101
+    assert summary["total"]["errors"] == 2
+    leads = summary["routes"]["GET /leads"]
+    assert leads["requests"] == 100 and leads["errors"] == 1 and leads["rps"] == 10.0
+    assert leads["p50"] <= leads["p95"] <= leads["p99"] <= leads["max"]
+
+
+def test_login_retries_after_a_429_from_busy_hashing(monkeypatch):
+    answers = iter([429, 429, 303])
+    transport = httpx.MockTransport(lambda request: httpx.Response(next(answers), headers={"Retry-After": "0"}))
+    monkeypatch.setattr(random.Random, "uniform", lambda self, a, b: 0)
+
+    async def log_in():
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await load._User(client, recorder, random.Random(0), 1).login("rep@example.com", "pw")
+
+    recorder = load._Recorder()
+    asyncio.run(log_in())
+    assert len(recorder.latencies["POST /login"]) == 3
+
+
+def test_url_runs_only_read_only_profiles_without_allow_writes(monkeypatch):
+    assert load.READ_ONLY_PROFILES == ["browsing"]
+    remote = ["--url", "https://staging.example.com", "--email", "rep@example.com", "--password", "pw"]
+    with pytest.raises(SystemExit):
+        load.main(remote)  # the default profile moves cards and creates proposals
+
+    driven = []
+
+    async def fake_drive(base_url, accounts, profile, *args):
+        driven.append(profile)
+        return {}
+
+    monkeypatch.setattr(load, "drive", fake_drive)
+    load.main(remote + ["--profile", "browsing"])
+    load.main(remote + ["--allow-writes"])
+    assert driven == ["browsing", "mixed"]
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app import app
+from auth import SESSION_COOKIE, CurrentUser, create_session_cookie, user_cache
+from database.cache import query_cache
+from database.db import Base, build_async_engine, get_async_db, get_db
+from database.loading import StatementBudgetExceeded, statement_budget
+from database.models import (
+    Company, Contact, Meeting, NurtureEnrollment, NurtureSequence, Proposal, User,
+)
+
+ROWS = 25
+
+# Fixed per-page budgets: these must not grow with the number of rows shown.
+PAGE_BUDGETS = {
+    "/": 6,
+    "/leads": 6,
+    "/leads/trash": 4,
+    "/pipeline": 9,
+    "/scheduler": 6,
+    "/proposals": 4,
+    "/nurture": 5,
+}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # A file database so the sync and async engines share it
+    url = f"sqlite:///{tmp_path / 'loading.db'}"
+    engine = create_engine(url)
+    async_engine = build_async_engine(url)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    with Session() as db:
+        user = User(email="rep@example.com", full_name="Rep", password_hash="x")
+        sequence = NurtureSequence(name="Welcome", steps=[{"day_offset": 0, "subject": "Hi", "body_template": "Hi"}])
+        db.add_all([user, sequence])
+        now = datetime.utcnow()
+        for i in range(ROWS):
+            company = Company(company_name=f"Company {i}")
+            contact = Contact(first_name=f"Lead{i}", company=company, lead_status="New",
+                              deleted_at=now if i % 5 == 0 else None)
+            db.add_all([
+                contact,
+                Meeting(contact=contact, title="Intro", meeting_time=now + timedelta(days=i - 5)),
+                Proposal(contact=contact, products=[], pricing=1000.0),
+                NurtureEnrollment(contact=contact, sequence=sequence),
+            ])
+        db.commit()
+        user_id = user.id
+
+    def _get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def _get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_async_db] = _get_async_db
+    query_cache.clear()
+    engine.user_id = user_id
+    engine.async_engine = async_engine
+    yield engine
+    app.dependency_overrides.clear()
+    query_cache.clear()
+
+
+@pytest.fixture
+def client(engine):
+    # Seed the user cache so the auth middleware doesn't look in the app database
+    user_cache.put(CurrentUser(id=engine.user_id, email="rep@example.com", full_name="Rep"))
+    client = TestClient(app)
+    client.cookies.set(SESSION_COOKIE, create_session_cookie(engine.user_id))
+    yield client
+    user_cache.clear()
+
+
+@pytest.mark.parametrize("path", sorted(PAGE_BUDGETS))
+def test_list_pages_render_within_statement_budget(engine, client, path):
+    client.get(path)  # warm the per-engine FTS probe so only the page is counted
+    query_cache.clear()
+    with statement_budget(engine, engine.async_engine, limit=PAGE_BUDGETS[path]):
+        response = client.get(path)
+    assert response.status_code == 200
+
+
+def test_budget_reports_lazy_loads(engine, client):
+    with pytest.raises(StatementBudgetExceeded, match="budget is 1"):
+        with statement_budget(engine, limit=1):
+            client.get("/proposals")
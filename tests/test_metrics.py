@@ -0,0 +1,89 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from starlette.requests import Request
+
+import metrics
+from app import _metrics_scraper, app
+from config import settings
+from scraper import search_engine
+from scraper.base import BaseScraper
+
+
+def _value(name, **labels):
+    return metrics.REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def test_metrics_requires_a_token_or_session(client, monkeypatch):
+    assert client.get("/metrics", follow_redirects=False).status_code == 303
+
+    monkeypatch.setattr(settings, "metrics_token", "s3cret")
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"},
+                      follow_redirects=False).status_code == 303
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert "mastersales_scraper_results_held" in response.text
+
+    # Behind the deploy nginx every request is from localhost: not enough alone
+    local = Request({"type": "http", "headers": [], "client": ("127.0.0.1", 50000)})
+    assert not _metrics_scraper(local)
+    monkeypatch.setattr(settings, "metrics_allow_localhost", True)
+    assert _metrics_scraper(local)
+
+
+def test_requests_are_counted_per_route_template(client):
+    labels = {"method": "GET", "route": "/login", "status": "200"}
+    before = _value("mastersales_http_requests_total", **labels)
+    client.get("/login")
+    assert _value("mastersales_http_requests_total", **labels) == before + 1
+    assert _value("mastersales_http_request_duration_seconds_count", method="GET", route="/login") > 0
+
+
+def test_pool_connects_and_checkouts_are_observed(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    pool = engine.pool
+    metrics.instrument_engine(engine, "test")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert _value("mastersales_db_pool_checked_out", engine="test") == 1
+    assert _value("mastersales_db_pool_connect_seconds_count", engine="test") == 1
+    assert _value("mastersales_db_pool_checkout_seconds_count", engine="test") == 1
+    assert "connect" not in vars(pool)  # the live pool isn't patched
+
+    # Still counted on the new pool after dispose()
+    engine.dispose()
+    with engine.connect():
+        assert _value("mastersales_db_pool_checked_out", engine="test") == 1
+    assert _value("mastersales_db_pool_checkout_seconds_count", engine="test") == 2
+
+
+class _Found(BaseScraper):
+    name, slug = "Found", "metrics_found"
+
+    def scrape(self, config):
+        return self.generate_demo_results(config)
+
+    def generate_demo_results(self, config):
+        return [{"first_name": "A", "last_name": "B", "job_title": None, "company_name": "C",
+                 "company_domain": None, "linkedin_url": None, "location_city": None,
+                 "location_state": None, "location_country": None, "source_url": None,
+                 "source_name": "Found"}]
+
+
+class _Broken(_Found):
+    name, slug = "Broken", "metrics_broken"
+
+    def scrape(self, config):
+        raise RuntimeError("site changed")
+
+
+def test_scrape_counts_results_and_failures(monkeypatch):
+    monkeypatch.setattr(search_engine, "SCRAPERS", {"metrics_found": _Found, "metrics_broken": _Broken})
+    search_engine.run_scrape(sources=["metrics_found", "metrics_broken"], keywords=["steel"])
+    assert _value("mastersales_scraper_results_total", source="metrics_found") == 1
+    assert _value("mastersales_scraper_failures_total", source="metrics_broken") == 1
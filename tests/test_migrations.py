@@ -0,0 +1,56 @@
+from sqlalchemy import create_engine, inspect, text
+
+from database.db import Base
+from database import migrations
+
+
+def _legacy_engine(tmp_path):
+    """A database as created by the first release: no soft delete, no indexes."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE companies (id INTEGER PRIMARY KEY, company_name VARCHAR(255))"))
+        conn.execute(text(
+            "CREATE TABLE contacts (id INTEGER PRIMARY KEY, first_name VARCHAR(100), "
+            "last_name VARCHAR(100), job_title VARCHAR(255), email_work VARCHAR(255), "
+            "lead_source VARCHAR(100), notes TEXT, linkedin_url VARCHAR(500), deal_value FLOAT, "
+            "location_state VARCHAR(50), location_country VARCHAR(10), lead_status VARCHAR(50), created_at DATETIME, "
+            "updated_at DATETIME, company_id INTEGER)"))
+        conn.execute(text("CREATE UNIQUE INDEX ix_contacts_linkedin_url ON contacts (linkedin_url)"))
+    return engine
+
+
+def test_upgrade_migrates_legacy_schema(tmp_path):
+    engine = _legacy_engine(tmp_path)
+    Base.metadata.create_all(engine)
+    applied = migrations.upgrade(engine)
+
+    assert applied == [m[0] for m in migrations.MIGRATIONS]
+    inspector = inspect(engine)
+    columns = {c["name"] for c in inspector.get_columns("contacts")}
+    assert {"deleted_at", "source_url"} <= columns
+    index_names = {i["name"] for i in inspector.get_indexes("contacts")}
+    assert "ix_contacts_linkedin_url" not in index_names
+    assert "ix_contacts_active_status_updated" in index_names
+    assert "ix_meetings_status_time" in {i["name"] for i in inspector.get_indexes("meetings")}
+
+
+def test_upgrade_records_version_and_is_idempotent(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    assert not migrations.is_current(engine)
+    Base.metadata.create_all(engine)
+    migrations.upgrade(engine)
+
+    assert migrations.is_current(engine)
+    assert migrations.upgrade(engine) == []
+
+
+def test_active_contacts_query_uses_partial_index(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plan.db'}")
+    Base.metadata.create_all(engine)
+    migrations.upgrade(engine)
+    with engine.connect() as conn:
+        plan = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM contacts "
+            "WHERE deleted_at IS NULL AND lead_status = 'New' ORDER BY updated_at DESC"
+        )).fetchall()
+    assert any("ix_contacts_active_status_updated" in row[-1] for row in plan)
@@ -0,0 +1,75 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import Session
+
+from database.db import Base
+from database.models import Contact
+from database.pagination import decode_cursor, encode_cursor, keyset_page
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        base = datetime(2026, 1, 1)
+        for i in range(23):
+            # Groups of three share a timestamp so the id tiebreaker matters
+            session.add(Contact(first_name=f"C{i}", lead_status="New",
+                                lead_score=None if i % 4 == 0 else i,
+                                created_at=base + timedelta(days=i // 3)))
+        session.commit()
+        yield session
+
+
+def _all_pages(session, keys, page_size):
+    seen, cursor = [], ""
+    while True:
+        items, cursor = keyset_page(session.query(Contact), keys, cursor, page_size)
+        seen.extend(c.id for c in items)
+        if not cursor:
+            return seen
+
+
+def test_pages_cover_every_row_once_in_order(db_session):
+    keys = [(Contact.created_at, True), (Contact.id, True)]
+    ids = _all_pages(db_session, keys, page_size=5)
+    expected = [c.id for c in db_session.query(Contact)
+                .order_by(Contact.created_at.desc(), Contact.id.desc())]
+    assert ids == expected
+
+
+def test_mixed_directions_and_coalesced_nulls(db_session):
+    score = func.coalesce(Contact.lead_score, -1)
+    keys = [(score, False), (Contact.id, True)]
+    ids = _all_pages(db_session, keys, page_size=4)
+    expected = [c.id for c in db_session.query(Contact).order_by(score.asc(), Contact.id.desc())]
+    assert ids == expected
+
+
+def test_last_page_has_no_cursor(db_session):
+    items, cursor = keyset_page(db_session.query(Contact), [(Contact.id, False)], "", 50)
+    assert len(items) == 23
+    assert cursor is None
+
+
+def test_cursor_round_trips_datetimes():
+    values = [datetime(2026, 3, 1, 9, 30, 15, 123), 42, "x", 1.5]
+    assert decode_cursor(encode_cursor(values)) == values
+
+
+def test_malformed_cursor_restarts_from_first_page(db_session):
+    assert decode_cursor("not-a-cursor!") is None
+    # Well-formed base64 JSON that isn't a cursor we made
+    for payload in ([{"x": 1}], [{"dt": "nope"}], [{"dt": 5}], {"a": 1}):
+        token = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+        assert decode_cursor(token) is None
+    assert decode_cursor(encode_cursor([1, 2]), 1) is None
+    items, _ = keyset_page(db_session.query(Contact), [(Contact.id, False)], "garbage", 5)
+    assert [c.id for c in items] == [1, 2, 3, 4, 5]
+    items, _ = keyset_page(db_session.query(Contact), [(Contact.id, False)], encode_cursor([3, 4]), 5)
+    assert [c.id for c in items] == [1, 2, 3, 4, 5]
@@ -0,0 +1,72 @@
+import asyncio
+import json
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+from starlette.concurrency import run_in_threadpool
+
+from database import profiling
+from database.profiling import RequestProfile, normalize_sql, profile_request
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    profiling.install(engine, slow_query_ms=0)
+    return engine
+
+
+def _query(engine, sql="SELECT 1"):
+    with engine.connect() as conn:
+        conn.execute(text(sql))
+
+
+def test_normalize_sql_collapses_literals_and_in_lists():
+    sql = """SELECT * FROM contacts
+             WHERE id IN (?, ?, ?) AND lead_status = 'New' AND deal_value > 1500.5 LIMIT ?"""
+    assert normalize_sql(sql) == (
+        "SELECT * FROM contacts WHERE id IN (...) AND lead_status = ? AND deal_value > ? LIMIT ?"
+    )
+    assert normalize_sql("SELECT t1.x FROM t1 WHERE y = %(y_1)s") == "SELECT t1.x FROM t1 WHERE y = ?"
+
+
+def test_profile_keeps_the_slowest_statements():
+    profile = RequestProfile(top=2)
+    for ms, sql in [(1.0, "SELECT a"), (5.0, "SELECT b"), (3.0, "SELECT c")]:
+        profile.record(ms, sql)
+    assert profile.statements == 3
+    assert profile.db_ms == 9.0
+    assert profile.slowest == [(5.0, "SELECT b"), (3.0, "SELECT c")]
+    assert profile.server_timing(12.0) == (
+        'db;dur=9.0;desc="3 queries", sql-1;dur=5.0;desc="SELECT b", '
+        'sql-2;dur=3.0;desc="SELECT c", app;dur=12.0'
+    )
+
+
+def test_profile_follows_the_request_into_worker_threads(engine):
+    async def handle():
+        with profile_request("/pipeline") as profile:
+            await run_in_threadpool(_query, engine)
+            await run_in_threadpool(_query, engine)
+        return profile
+
+    assert asyncio.run(handle()).statements == 2
+    _query(engine)  # outside a request: not attributed to anything
+
+
+def test_slow_statements_are_logged_as_json(engine, caplog):
+    with caplog.at_level(logging.WARNING, logger="mastersales.sql.slow"):
+        with profile_request("/leads"):
+            _query(engine, "SELECT 42")
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["event"] == "slow_query"
+    assert record["sql"] == "SELECT ?"
+    assert record["path"] == "/leads"
+
+
+def test_failed_statement_does_not_skew_timings(engine):
+    with pytest.raises(Exception):
+        _query(engine, "SELECT * FROM missing_table")
+    with engine.connect() as conn:
+        assert conn.info.get("profiling_started") == []
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from database.db import Base
+from database import migrations, search
+from database.models import Company, Contact
+
+
+@pytest.fixture
+def db_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    Base.metadata.create_all(engine)
+    migrations.upgrade(engine)
+    with Session(engine) as session:
+        steel = Company(company_name="WA Steel Fabricators")
+        marine = Company(company_name="NZ Marine Engineering")
+        session.add_all([steel, marine])
+        session.flush()
+        session.add_all([
+            Contact(first_name="Mark", last_name="Thompson", job_title="Operations Manager",
+                    company_id=steel.id, lead_status="New"),
+            Contact(first_name="Aroha", last_name="Ngata", job_title="Workshop Manager",
+                    notes="Met Mark at the trade show", company_id=marine.id, lead_status="New"),
+        ])
+        session.commit()
+        yield session
+
+
+def _names(session, q):
+    query = search.match_contacts(session.query(Contact), q).order_by(search.rank())
+    return [c.first_name for c in query.all()]
+
+
+def test_prefix_match_across_contact_and_company(db_session):
+    assert _names(db_session, "thom") == ["Mark"]
+    assert _names(db_session, "marine eng") == ["Aroha"]
+
+
+def test_name_hit_ranks_above_notes_hit(db_session):
+    assert _names(db_session, "mark") == ["Mark", "Aroha"]
+
+
+def test_triggers_follow_updates_and_deletes(db_session):
+    company = db_session.query(Company).filter_by(company_name="WA Steel Fabricators").one()
+    company.company_name = "Perth Galvanising"
+    mark = db_session.query(Contact).filter_by(first_name="Mark").one()
+    mark.job_title = "Plant Director"
+    db_session.commit()
+    assert _names(db_session, "galvan") == ["Mark"]
+    assert _names(db_session, "director") == ["Mark"]
+
+    db_session.delete(mark)
+    db_session.commit()
+    assert _names(db_session, "thompson") == []
+
+
+def test_rebuild_repopulates_index(db_session):
+    with db_session.get_bind().begin() as conn:
+        assert search.rebuild_index(conn) == 2
+
+
+def test_build_match_strips_query_syntax():
+    assert search.build_match('mark" OR NEAR(') == '"mark"* "OR"* "NEAR"*'
+    assert search.build_match("  ") == ""
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from config import settings
+from database.db import Base
+from database.models import AppSetting
+from scraper import sessions
+
+STATE = {"cookies": [{"name": "li_at", "value": "token", "domain": ".linkedin.com"}], "origins": []}
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setattr(settings, "secret_key", "test-secret")  # the default one saves nothing
+    # One shared connection: LinkedIn reaches the store from worker threads
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(sessions, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+def test_saved_state_round_trips_encrypted(store):
+    assert sessions.load("linkedin", "rep@example.com") is None
+    sessions.save("linkedin", "rep@example.com", STATE, time.time())
+
+    assert sessions.load("linkedin", "Rep@Example.com ")[0] == STATE
+    assert sessions.load("linkedin", "other@example.com") is None
+    with store() as db:
+        (row,) = db.query(AppSetting).all()
+    assert "rep@example.com" not in row.key and "li_at" not in row.value
+
+    sessions.clear("linkedin", "rep@example.com")
+    assert sessions.load("linkedin", "rep@example.com") is None
+
+
+def test_tampered_foreign_or_stale_states_are_ignored(store, monkeypatch):
+    sessions.save("linkedin", "rep@example.com", STATE, time.time())
+    with store() as db:
+        row = db.query(AppSetting).one()
+        token = row.value
+        row.value = token[:-4] + ("AAAA" if token[-4:] != "AAAA" else "BBBB")
+        db.commit()
+    assert sessions.load("linkedin", "rep@example.com") is None
+
+    sessions.save("linkedin", "rep@example.com", STATE, time.time())
+    monkeypatch.setattr(settings, "secret_key", "another-secret")
+    assert sessions.load("linkedin", "rep@example.com") is None
+
+
+def test_max_age_counts_from_the_login_not_the_last_save(store, monkeypatch):
+    monkeypatch.setattr(settings, "scrape_session_max_age", 3600)
+    logged_in_at = time.time() - 3000
+    sessions.save("linkedin", "rep@example.com", STATE, logged_in_at)
+    assert sessions.load("linkedin", "rep@example.com") == (STATE, logged_in_at)
+
+    # Re-saved on a later run, with the original login time: still expires on schedule
+    sessions.save("linkedin", "rep@example.com", STATE, logged_in_at - 1000)
+    assert sessions.load("linkedin", "rep@example.com") is None
+
+    monkeypatch.setattr(settings, "scrape_session_max_age", 0)
+    assert sessions.load("linkedin", "rep@example.com") == (STATE, logged_in_at - 1000)
+
+
+def test_nothing_is_saved_under_the_default_secret_key(store, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "secret_key", type(settings).model_fields["secret_key"].default)
+    sessions.save("linkedin", "rep@example.com", STATE, time.time())
+    assert "SECRET_KEY is still the default" in caplog.text
+    with store() as db:
+        assert db.query(AppSetting).count() == 0
+    assert sessions.load("linkedin", "rep@example.com") is None
+
+
+@pytest.mark.parametrize("payload", [
+    STATE,                                       # the format before login times were kept
+    {"state": STATE},
+    {"state": STATE, "logged_in_at": None},
+    [STATE],
+])
+def test_payloads_without_a_login_time_are_forgotten(store, payload):
+    token = sessions._fernet().encrypt(json.dumps(payload).encode()).decode()
+    with store() as db:
+        db.add(AppSetting(key=sessions._key("linkedin", "rep@example.com"), value=token))
+        db.commit()
+
+    assert sessions.load("linkedin", "rep@example.com") is None
+    with store() as db:
+        assert db.query(AppSetting).count() == 0
+
+
+class FakePage:
+    def __init__(self, lands_on):
+        self.url = "about:blank"
+        self.lands_on = lands_on
+
+    async def goto(self, url, **kwargs):
+        self.url = self.lands_on
+
+
+@pytest.mark.parametrize("lands_on, valid", [
+    ("https://www.linkedin.com/feed/", True),
+    ("https://www.linkedin.com/login?session_redirect=%2Ffeed%2F", False),
+    ("https://www.linkedin.com/checkpoint/challenge/feed", False),
+])
+def test_linkedin_reuses_a_session_only_while_the_feed_loads(store, lands_on, valid):
+    from scraper.linkedin import LinkedInScraper
+
+    sessions.save("linkedin", "rep@example.com", STATE, time.time())
+    scraper = LinkedInScraper(email="rep@example.com", password="secret")
+    scraper.page = FakePage(lands_on)
+
+    assert asyncio.run(scraper._resume_session()) is valid
+    assert (sessions.load("linkedin", "rep@example.com") is not None) is valid
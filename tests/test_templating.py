@@ -0,0 +1,27 @@
+import shutil
+
+from jinja2 import Environment, FileSystemLoader
+
+import templating
+
+
+def test_cache_keys_ignore_the_project_path():
+    cache = templating._BytecodeCache("unused", "templates")
+    assert cache.get_cache_key("base.html", "/home/dev/mastersales/templates/base.html") == \
+        cache.get_cache_key("base.html", "/var/task/templates/base.html")
+    other = templating._BytecodeCache("unused", "proposals/templates")
+    assert cache.get_cache_key("base.html") != other.get_cache_key("base.html")
+
+
+def test_cache_built_in_one_checkout_serves_another(monkeypatch, tmp_path):
+    monkeypatch.setattr(templating, "_cache_dir", tmp_path / "cache")
+    (tmp_path / "cache").mkdir()
+    templating._environment("templates", autoescape=True).get_template("base.html")
+
+    shutil.copytree(templating._ROOT / "templates", tmp_path / "deployed")
+    cache = templating._BytecodeCache(str(tmp_path / "cache"), "templates")
+    written = []
+    monkeypatch.setattr(cache, "dump_bytecode", written.append)
+    env = Environment(loader=FileSystemLoader(str(tmp_path / "deployed")), autoescape=True, bytecode_cache=cache)
+    env.get_template("base.html")
+    assert written == []  # loaded from the cache, not recompiled